@@ -1,12 +1,29 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Header
 from typing import List, Optional
 from pydantic import BaseModel
 from ..services.game_service import game_service
 from ..services.card_service import card_service
 from ..services.video_cache import video_cache
+from ..services.ai_service import ai_service
+from ..services.prompt_bank_service import prompt_bank_service
+from ..services.round_plan_service import round_plan_service
+from ..services.resilience_service import resilience_service
 from ..services.content_pipeline_service import content_pipeline_service
 from ..services.nanobanana_service import nanobanana_service
 from ..services.gemini_tts_service import gemini_tts_service
+from ..services.speculative_media_service import speculative_media_service
+from ..services.speculative_video_service import speculative_video_service
+from ..services.job_queue_service import job_queue_service
+from ..services.media_worker_pool import media_worker_pool
+from ..services.narration_index_service import narration_index_service
+from ..services.storage_index_service import storage_index_service
+from ..services.media_bus_service import media_bus_service
+from ..services.supabase_http import supabase_http
+from ..services.counter_service import counter_service
+from ..services.feed_index_service import feed_index_service
+from ..services.trending_service import trending_service
+from ..services import providers
+from ..services.content_jobs import CONTENT_BATCH_JOB, CONTENT_ROUND_JOB
 from ..models.card import BlackCard, WhiteCard
 
 router = APIRouter(prefix="/api", tags=["api"])
@@ -113,7 +130,22 @@ async def get_stats():
         "total_games": len(game_service.games),
         "total_players": len(game_service.players),
         "active_games": len([g for g in game_service.games.values() if g.state == "playing"]),
-        "video_cache": video_cache.get_stats()
+        "video_cache": video_cache.get_stats(),
+        "llm": ai_service.get_stats(),
+        "prompt_bank": prompt_bank_service.get_stats(),
+        "round_plans": round_plan_service.get_stats(),
+        "circuit_breakers": resilience_service.get_stats(),
+        "speculative_media": speculative_media_service.get_stats(),
+        "speculative_video": speculative_video_service.get_stats(),
+        "media_workers": media_worker_pool.get_stats(),
+        "narration_index": narration_index_service.get_stats(),
+        "storage_index": storage_index_service.get_stats(),
+        "media_bus": media_bus_service.get_stats(),
+        "supabase_http": supabase_http.get_stats(),
+        "counters": counter_service.get_stats(),
+        "feed_index": feed_index_service.get_stats(),
+        "trending": trending_service.get_stats(),
+        "providers": providers.get_stats()
     }
 
 
@@ -158,52 +190,76 @@ async def generate_social_content(request: GenerateContentRequest):
         raise HTTPException(status_code=500, detail=f"Content generation failed: {str(e)}")
 
 
-@router.post("/content/round")
-async def generate_round_content(request: GenerateRoundContentRequest):
+@router.post("/content/round", status_code=202)
+async def generate_round_content(
+    request: GenerateRoundContentRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
     """
-    Generate content for a full game round:
+    Queue content generation for a full game round:
     1. Generate images for all submissions in parallel
     2. Select winner
     3. Generate video for winner
     4. Generate narration
+    
+    Returns a job id immediately; poll GET /api/jobs/{job_id} or subscribe
+    over Socket.IO ('subscribe_job') for progress and the result.
     """
     try:
-        result = await content_pipeline_service.generate_content_for_round(
-            request.black_card,
-            request.submissions,
-            request.narration_style
+        job = await job_queue_service.enqueue(
+            CONTENT_ROUND_JOB,
+            {
+                "black_card": request.black_card,
+                "submissions": request.submissions,
+                "narration_style": request.narration_style
+            },
+            idempotency_key=idempotency_key
         )
-        return result
+        return job_queue_service.public_view(job)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Round content generation failed: {str(e)}")
 
 
-@router.post("/content/batch")
-async def generate_batch_content(request: BatchContentRequest):
+@router.post("/content/batch", status_code=202)
+async def generate_batch_content(
+    request: BatchContentRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
     """
-    Generate content for multiple card combinations in parallel
+    Queue content generation for multiple card combinations
     Useful for batch content creation
+    
+    Returns a job id immediately; poll GET /api/jobs/{job_id} or subscribe
+    over Socket.IO ('subscribe_job') for progress and the result.
     """
     try:
         combinations = [
             {"black_card": combo.black_card, "white_cards": combo.white_cards}
             for combo in request.combinations
         ]
-        results = await content_pipeline_service.generate_batch_content(
-            combinations,
-            request.narration_style
+        job = await job_queue_service.enqueue(
+            CONTENT_BATCH_JOB,
+            {"combinations": combinations, "narration_style": request.narration_style},
+            idempotency_key=idempotency_key
         )
-        return {"results": results}
+        return job_queue_service.public_view(job)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch content generation failed: {str(e)}")
 
 
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get status, progress and result of a background job"""
+    job = await job_queue_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_queue_service.public_view(job)
+
+
 @router.post("/images/generate")
 async def generate_image(request: GenerateContentRequest):
     """Generate a single image using Nanobanana"""
     try:
-        from ..services.ai_service import ai_service
-        
         # Generate prompt
         prompt = await ai_service.generate_video_prompt(
             request.black_card,
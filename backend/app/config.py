@@ -12,12 +12,24 @@ class Settings(BaseSettings):
     PORT: int = Field(default=8000, env="PORT")  # Railway sets PORT env var
     DEBUG: bool = Field(default=False, env="DEBUG")
     SECRET_KEY: str = Field(default="dev-secret-key-change-in-production", env="SECRET_KEY")
+
+    # Logging (queued to a writer thread; see app/logging_config.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # json or text
+    LOG_SAMPLE_EVERY: int = 100  # Keep 1 in N info/debug lines from engineio/socketio/access logs
+    SOCKET_PACKET_LOGGING: bool = False  # Log every Socket.IO/Engine.IO packet (very noisy)
     
     # Supabase Configuration
     SUPABASE_URL: str = ""
     SUPABASE_KEY: str = ""
     SUPABASE_BUCKET: str = "videos"
     SUPABASE_WINNING_BUCKET: str = "winning-videos"
+    SUPABASE_HTTP_TIMEOUT: float = 10.0  # Seconds per REST/storage call
+    SUPABASE_HTTP_UPLOAD_TIMEOUT: float = 60.0  # Uploads/downloads of media files
+    SUPABASE_HTTP_RETRIES: int = 2
+    SUPABASE_HTTP_MAX_CONNECTIONS: int = 50
+    SUPABASE_HTTP_MAX_KEEPALIVE: int = 20
+    COUNTER_FLUSH_INTERVAL: float = 2.0  # Seconds between bulk like/view counter writes
     
     
     # AI Services (Gemini API used for images, videos, and text)
@@ -26,13 +38,124 @@ class Settings(BaseSettings):
     USE_VEO3_FAST: bool = True
     VIDEO_DURATION: int = 4  # Duration in seconds (4-8)
     VIDEO_PLACEHOLDER_URL: str = "https://via.placeholder.com/640x480/FF6B6B/FFFFFF?text=Video+Generation+Failed"
+
+    # Providers (fakes for offline development and load tests; see app/services/providers.py)
+    AI_PROVIDER: str = "gemini"  # "gemini" or "fake" (deterministic text/image/TTS/Veo stand-ins)
+    STORAGE_PROVIDER: str = "supabase"  # "supabase" or "local" (filesystem storage + JSON tables)
+    LOCAL_STORAGE_PATH: str = "data/local_supabase"
+    FAKE_SEED: int = 0  # Fake responses are a pure function of (seed, prompt)
+    FAKE_LATENCY_SCALE: float = 1.0  # Multiplier on the fakes' realistic latencies (0 = instant)
+    FAKE_FAILURE_RATE: float = 0.0  # Probability a fake call raises
+    FAKE_FAILURE_ENDPOINTS: str = ""  # Comma-separated: text,image,tts,video (empty = all)
+
+    # Video URL cache (LRU + TTL in memory, optional SQLite tier)
+    VIDEO_CACHE_TTL_SECONDS: int = 86400  # 24 hours
+    VIDEO_CACHE_MAX_ENTRIES: int = 10000
+    VIDEO_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    VIDEO_CACHE_DISK_PATH: str = "data/video_cache.sqlite3"  # Empty = memory only
+    CACHE_SWEEP_INTERVAL: int = 60  # Seconds between expiry sweeps
+    
+    # LLM response cache (generate_text / generate_video_prompt)
+    LLM_CACHE_TTL_SECONDS: int = 7 * 86400
+    LLM_CACHE_MAX_ENTRIES: int = 5000
+    LLM_CACHE_MAX_BYTES: int = 8 * 1024 * 1024
+    LLM_CACHE_DISK_PATH: str = "data/llm_cache.sqlite3"  # Empty = memory only
+    LLM_CACHE_BYPASS: bool = False  # Always call the model (fresh responses every time)
+    
+    # Prompt bank (precomputed prompts, built by build_prompt_bank.py)
+    PROMPT_BANK_PATH: str = "data/prompt_bank.json"  # Empty = disabled
+    PROMPT_BANK_LIVE_MAX_ENTRIES: int = 5000  # Prompts banked at runtime by round plans (LRU)
+    PROMPT_BANK_LIVE_TTL_SECONDS: int = 3600
     
+    # Round plans (one structured LLM call for AI card choices, one for judging)
+    ROUND_PLAN_ENABLED: bool = True
+    
+    # Provider resilience (circuit breakers, timeouts, hedged text calls)
+    CIRCUIT_FAILURE_THRESHOLD: int = 5  # Consecutive failures that open a breaker
+    CIRCUIT_RESET_SECONDS: float = 30.0  # Open time before a half-open probe
+    TEXT_CALL_TIMEOUT: float = 20.0
+    IMAGE_CALL_TIMEOUT: float = 60.0
+    TTS_CALL_TIMEOUT: float = 45.0
+    HEDGE_PERCENTILE: float = 95.0  # Hedge text calls slower than this latency percentile
+    HEDGE_MIN_DELAY: float = 0.5
+    HEDGE_MIN_SAMPLES: int = 20  # Latency samples needed before hedging starts
+
+    # Speculative media (image + narration start as soon as a submission arrives)
+    SPECULATIVE_MEDIA_ENABLED: bool = True
+    SPECULATIVE_MEDIA_MAX_PER_ROUND: int = 8  # Max media jobs started per round
+    SPECULATIVE_MEDIA_CONCURRENCY: int = 16  # Max media jobs running at once
+
+    # Speculative winner video (Veo starts for likely winners during judging)
+    SPECULATIVE_VIDEO_ENABLED: bool = False
+    SPECULATIVE_VIDEO_TOP_K: int = 1  # Candidates warmed per round (human czar)
+    SPECULATIVE_VIDEO_MAX_JOBS_PER_GAME: int = 10  # Cost budget in Veo jobs
+    SPECULATIVE_VIDEO_PARK_LOSERS: bool = True  # Cache loser videos instead of cancelling
+
+    # Content pipeline stage limits (0 = unlimited), shared by all pipeline runs
+    PIPELINE_PROMPT_CONCURRENCY: int = 8
+    PIPELINE_PROMPT_RPM: int = 60
+    PIPELINE_IMAGE_CONCURRENCY: int = 4
+    PIPELINE_IMAGE_RPM: int = 10
+    PIPELINE_NARRATION_CONCURRENCY: int = 4
+    PIPELINE_NARRATION_RPM: int = 10
+    PIPELINE_VIDEO_CONCURRENCY: int = 2
+    PIPELINE_VIDEO_RPM: int = 2
+
+    # Background job queue (batch content generation)
+    JOB_QUEUE_DB_PATH: str = "data/jobs.sqlite3"
+    JOB_WORKERS: int = 2  # In-process workers (0 when running run_worker.py separately)
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BASE_DELAY: int = 10  # seconds, doubled per attempt
+    JOB_LEASE_SECONDS: int = 600  # Job is re-queued if its worker goes silent this long
+    JOB_POLL_INTERVAL: float = 2.0
+
+    # Media worker processes (image/audio encoding off the event loop)
+    MEDIA_WORKER_PROCESSES: int = 2  # 0 = use a thread instead of processes
+    MEDIA_WORKER_QUEUE_SIZE: int = 32  # Max jobs queued/running before callers wait
+
+    # Generated images
+    IMAGE_PASSTHROUGH_TYPES: str = "image/png,image/jpeg,image/webp"  # Uploaded as-is
+    IMAGE_TRANSCODE_WEBP: bool = False  # Re-encode to WebP + upload a <id>_preview.webp
+
+    # Narration audio (compressed with ffmpeg; falls back to WAV if unavailable)
+    NARRATION_AUDIO_FORMAT: str = "mp3"  # mp3 or opus
+    NARRATION_AUDIO_BITRATE: str = "48k"
+    NARRATION_INDEX_DB_PATH: str = "data/narrations.sqlite3"  # Persistent script -> audio index
+    NARRATION_MEMORY_MAX_ENTRIES: int = 2000  # Recent artifacts kept in memory in front of the index
+
+    # Storage existence index (avoids listing whole buckets)
+    STORAGE_INDEX_REFRESH_SECONDS: int = 60  # Incremental key refresh (0 = disabled)
+    STORAGE_INDEX_PAGE_SIZE: int = 100
+    STORAGE_INDEX_NEGATIVE_TTL: float = 5.0  # Seconds a "missing" answer is reused
+    STORAGE_INDEX_RECONCILE_SECONDS: int = 3600  # Full re-list that drops deleted objects (0 = never)
+
+    # Media readiness bus (generators publish, waiters wake immediately)
+    MEDIA_BUS_DB_PATH: str = "data/media_events.sqlite3"  # Cross-worker event log
+    MEDIA_BUS_POLL_INTERVAL: float = 0.5  # Seconds between reads of other workers' events
+
+    # Public feed index (feed videos, built from the storage index)
+    FEED_INDEX_BUCKET: str = "videos"
+    FEED_INDEX_CACHE_PATH: str = "data/feed_index.json"  # Empty = memory only
+
+    # Trending ranking (decayed score = sum of weight * 0.5^(age / half-life))
+    TRENDING_HALF_LIFE_HOURS: float = 24.0
+    TRENDING_VIEW_WEIGHT: float = 0.1
+    TRENDING_LIKE_WEIGHT: float = 1.0
+    TRENDING_COMMENT_WEIGHT: float = 2.0
+    TRENDING_TOP_K: int = 100
+    TRENDING_CANDIDATES: int = 1000  # Most recent videos scored by the bulk recompute
+    TRENDING_RECOMPUTE_SECONDS: int = 300
+    TRENDING_CACHE_SECONDS: int = 10  # Top-K list rebuild interval
+    TRENDING_LIVE_EVENTS_MAX: int = 50000  # Interactions kept for re-applying while recomputes fail
+
     # Game Configuration
     MAX_PLAYERS: int = 8
     MIN_PLAYERS: int = 3
     CARDS_PER_HAND: int = 5
     POINTS_TO_WIN: int = 7
     ROUND_TIMEOUT: int = 120  # seconds
+    AI_CZAR_DELAY_SECONDS: float = 30.0  # AI czar waits for media + human viewing before announcing
+    ROUND_ADVANCE_DELAY_SECONDS: float = 5.0  # Pause on the winner before the next round starts
     
     # CORS - Allow Railway frontend and localhost
     CORS_ORIGINS: str = Field(
@@ -0,0 +1,141 @@
+"""
+Logging
+Structured, non-blocking logging for the backend. Records are handed to a
+queue on the calling thread (no I/O on the event loop) and formatted/written
+by a listener thread. Output is one JSON object per line by default.
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+from .config import settings
+
+
+# Loggers that emit per-packet / per-request lines under load
+NOISY_LOGGERS = ("engineio.server", "socketio.server", "uvicorn.access")
+
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, msg, extra fields, exc"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep 1 of every `every` records below WARNING; warnings and errors always pass"""
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(1, every)
+        self._seen = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.every == 1:
+            return True
+        with self._lock:
+            self._seen += 1
+            keep = self._seen % self.every == 1
+        if keep:
+            record.sampled = self.every
+        return keep
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that renders message and traceback up front, on the caller's thread"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Like the base class, but keeps the traceback in exc_text (not folded
+        # into msg) so the JSON formatter can put it in its own field
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = logging.Formatter().formatException(record.exc_info)
+        record = copy.copy(record)
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        record.exc_text = exc_text
+        return record
+
+
+def setup_logging(
+    level: Optional[str] = None,
+    fmt: Optional[str] = None,
+    sample_every: Optional[int] = None
+):
+    """
+    Route all logging through a queue to a background writer thread
+
+    Safe to call more than once (later calls are ignored).
+
+    Args:
+        level: Root level (default LOG_LEVEL)
+        fmt: "json" or "text" (default LOG_FORMAT)
+        sample_every: Keep 1 in N info/debug records from NOISY_LOGGERS
+            (default LOG_SAMPLE_EVERY; 1 = keep all)
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    if (fmt or settings.LOG_FORMAT) == "json":
+        formatter: logging.Formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_QueueHandler(log_queue))
+    root.setLevel((level or settings.LOG_LEVEL).upper())
+
+    # Let uvicorn's loggers propagate to the queue instead of writing directly
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+
+    sampler = SamplingFilter(settings.LOG_SAMPLE_EVERY if sample_every is None else sample_every)
+    for name in NOISY_LOGGERS:
+        noisy = logging.getLogger(name)
+        for old in [f for f in noisy.filters if isinstance(f, SamplingFilter)]:
+            noisy.removeFilter(old)
+        noisy.addFilter(sampler)
+
+
+def stop_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,17 +1,32 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 import socketio
 from .config import settings
-from .websocket import register_socket_events
+from .logging_config import setup_logging, stop_logging
+
+setup_logging()
+
+from .websocket import register_socket_events, InstrumentedAsyncServer
 from .api import routes
-from .routes import feed
+from .routes import feed, local_storage
+from .services.job_queue_service import job_queue_service
+from .services.media_worker_pool import media_worker_pool
+from .services.storage_index_service import storage_index_service
+from .services.supabase_http import supabase_http
+from .services.counter_service import counter_service
+from .services.trending_service import trending_service
+from .services.video_cache import video_cache
+from .services.ai_service import ai_service
+from .services.game_service import game_service
+from .services.metrics import metrics
 
 # Create Socket.IO server
-sio = socketio.AsyncServer(
+sio = InstrumentedAsyncServer(
     async_mode='asgi',
     cors_allowed_origins='*',  # Allow all origins for now
-    logger=True,
-    engineio_logger=True
+    logger=settings.SOCKET_PACKET_LOGGING,
+    engineio_logger=settings.SOCKET_PACKET_LOGGING
 )
 
 # Register socket events
@@ -31,11 +46,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 # Include REST API routes
 app.include_router(routes.router)
 app.include_router(feed.router)
+if settings.STORAGE_PROVIDER == "local":
+    # Public object URLs for the filesystem-backed storage
+    app.include_router(local_storage.router)
 
 # Combine FastAPI and Socket.IO
 socket_app = socketio.ASGIApp(
@@ -44,6 +63,100 @@ socket_app = socketio.ASGIApp(
     socketio_path='/socket.io'
 )
 
+@app.on_event("startup")
+async def start_job_workers():
+    """Start background workers that drain the job queue"""
+    await job_queue_service.start(settings.JOB_WORKERS)
+
+
+@app.on_event("startup")
+async def start_media_workers():
+    """Spawn media worker processes before the first round needs them"""
+    await media_worker_pool.start()
+
+
+@app.on_event("startup")
+async def start_storage_index():
+    """Keep the storage key index fresh for O(1) existence checks"""
+    storage_index_service.start()
+
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    """Stop job workers; unfinished jobs resume after restart"""
+    await job_queue_service.stop()
+
+
+@app.on_event("shutdown")
+async def stop_media_workers():
+    """Stop media worker processes"""
+    media_worker_pool.shutdown()
+
+
+@app.on_event("shutdown")
+async def stop_storage_index():
+    """Stop the storage index refresh"""
+    await storage_index_service.stop()
+
+
+@app.on_event("startup")
+async def start_trending():
+    """Recompute trending scores in the background"""
+    trending_service.start()
+
+
+@app.on_event("shutdown")
+async def stop_trending():
+    """Stop the trending recompute"""
+    await trending_service.stop()
+
+
+@app.on_event("startup")
+async def start_cache_sweeper():
+    """Expire cache entries in the background"""
+    video_cache.start()
+
+
+@app.on_event("shutdown")
+async def stop_cache_sweeper():
+    """Stop the cache sweeper"""
+    await video_cache.stop()
+
+
+@app.on_event("startup")
+async def start_llm_cache_sweeper():
+    """Expire cached LLM responses in the background"""
+    ai_service.start()
+
+
+@app.on_event("shutdown")
+async def stop_llm_cache_sweeper():
+    """Stop the LLM response cache sweeper"""
+    await ai_service.stop()
+
+
+@app.on_event("startup")
+async def start_counter_flush():
+    """Flush coalesced like/view counters in the background"""
+    counter_service.start()
+
+
+@app.on_event("shutdown")
+async def stop_counter_flush():
+    """Write pending counters before connections close"""
+    await counter_service.stop()
+
+
+@app.on_event("shutdown")
+async def close_supabase_http():
+    """Close pooled Supabase connections"""
+    await supabase_http.close()
+
+@app.on_event("shutdown")
+async def flush_logs():
+    """Write queued log records before exit"""
+    stop_logging()
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -59,6 +172,19 @@ async def health():
     return {"status": "healthy"}
 
 
+metrics.gauge("games", "Games in memory", fn=lambda: len(game_service.games))
+metrics.gauge("players", "Players in memory", fn=lambda: len(game_service.players))
+metrics.gauge("socket_connections", "Connected Socket.IO clients", fn=lambda: len(sio.environ))
+metrics.gauge("llm_cache_entries", "Cached LLM responses in memory", fn=lambda: len(ai_service.response_cache))
+metrics.gauge("video_cache_entries", "Cached video URLs in memory", fn=lambda: len(video_cache.cache))
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text-format metrics"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
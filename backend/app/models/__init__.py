@@ -1,6 +1,7 @@
 from .card import Card, BlackCard, WhiteCard
 from .player import Player, AIPlayer
 from .game import Game, GameState, Round, Submission
+from .round_plan import BotPlay, SubmissionPrompt, JudgingPlan
 
 __all__ = [
     "Card",
@@ -12,4 +13,7 @@ __all__ = [
     "GameState",
     "Round",
     "Submission",
+    "BotPlay",
+    "SubmissionPrompt",
+    "JudgingPlan",
 ]
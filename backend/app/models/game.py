@@ -16,10 +16,13 @@ class GameState(str, Enum):
 class Submission(BaseModel):
     player_id: str
     card_ids: List[str]
+    combo_key: Optional[str] = None  # Combination key shared by all cache layers
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     image_url: Optional[str] = None
     audio_url: Optional[str] = None
+    audio_duration: Optional[float] = None  # Narration length in seconds
     video_url: Optional[str] = None
+    video_id: Optional[str] = None  # Storage UUID of the submission video (see media bus)
 
 
 class Round(BaseModel):
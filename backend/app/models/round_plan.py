@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class BotPlay(BaseModel):
+    """One AI player's card choice from a deal plan"""
+    player_id: str
+    cards: List[int] = Field(..., description="1-based positions in the player's hand")
+    prompt: Optional[str] = Field(default=None, description="Video prompt for the completed card")
+    safe_prompt: Optional[str] = Field(default=None, description="Moderated video prompt")
+
+
+class SubmissionPrompt(BaseModel):
+    """Video prompts for one submission from a judging plan"""
+    submission: int = Field(..., description="1-based submission number")
+    prompt: str = Field(..., min_length=1)
+    safe_prompt: str = Field(..., min_length=1)
+
+
+class JudgingPlan(BaseModel):
+    """Validated result of a judging plan call"""
+    ranking: Optional[List[int]] = Field(default=None, description="0-based submission indices, funniest first")
+    prompts: List[SubmissionPrompt] = Field(default_factory=list)
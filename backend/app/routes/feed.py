@@ -1,8 +1,14 @@
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
+import logging
+import hashlib
+from fastapi import APIRouter, HTTPException, Query, Header, Response
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from ..services.supabase_service import supabase_service
 from ..services.feed_service import feed_service
+from ..services.feed_index_service import feed_index_service
+from ..config import settings
+
+logger = logging.getLogger(__name__)
 
 
 router = APIRouter(prefix="/api/feed", tags=["feed"])
@@ -20,6 +26,12 @@ class CommentRequest(BaseModel):
     text: str
 
 
+class HydrateRequest(BaseModel):
+    video_ids: List[str] = Field(..., max_length=100)
+    user_id: Optional[str] = None
+    comments_limit: int = Field(3, ge=0, le=20)
+
+
 class VideoResponse(BaseModel):
     id: str
     black_card_text: str
@@ -34,45 +46,50 @@ class VideoResponse(BaseModel):
 
 @router.get("/videos")
 async def get_videos_feed(
+    response: Response,
     limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
+    seed: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None)
 ):
-    """Get video feed (TikTok/Reel style) - All videos from storage bucket (randomized)"""
+    """
+    Get video feed (TikTok/Reel style) - shuffled per session, served from the feed index
+    
+    The first request starts a session (random or given seed); pass the
+    X-Next-Cursor response header back as `cursor` for the next page.
+    """
+    try:
+        videos, next_cursor = await feed_index_service.page(limit, cursor, seed, offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Error fetching videos from feed index: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    etag = '"' + hashlib.sha1("|".join(v['id'] for v in videos).encode()).hexdigest() + '"'
+    headers = {
+        "ETag": etag,
+        # Cursor pages always hold the same items; a fresh session is reshuffled
+        "Cache-Control": "private, max-age=60" if cursor or seed is not None else "private, no-cache"
+    }
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return videos
+
+
+@router.post("/hydrate")
+async def hydrate_feed_items(request: HydrateRequest):
+    """Metadata, counts, like state and first comments for a page of feed videos in one call"""
     try:
-        import random
-        
-        # List all files from videos storage bucket
-        result = supabase_service.client.storage.from_('videos').list()
-        
-        # Convert to video objects with public URLs
-        videos = []
-        for file in result:
-            if file.get('name') and file['name'].endswith('.mp4'):
-                video_url = supabase_service.client.storage.from_('videos').get_public_url(file['name'])
-                # Remove trailing ?
-                if video_url.endswith('?'):
-                    video_url = video_url[:-1]
-                
-                videos.append({
-                    'id': file['name'].replace('.mp4', ''),
-                    'video_url': video_url,
-                    'black_card_text': 'Generated Content',
-                    'white_card_texts': [],
-                    'winner_name': 'Player',
-                    'created_at': file.get('created_at', ''),
-                    'likes': 0,
-                    'views': 0
-                })
-        
-        # Shuffle videos randomly
-        random.shuffle(videos)
-        
-        # Apply pagination
-        start = offset
-        end = offset + limit
-        return videos[start:end]
+        return await feed_service.hydrate(request.video_ids, request.user_id, request.comments_limit)
     except Exception as e:
-        print(f"❌ Error fetching videos from storage: {e}")
+        logger.error("Error hydrating feed items: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -94,13 +111,16 @@ async def get_video(video_id: str):
 async def like_video(request: LikeRequest):
     """Like or unlike a video"""
     try:
-        liked = await supabase_service.like_video(request.video_id, request.user_id)
-        likes_count = await supabase_service.get_video_likes(request.video_id)
+        result = await supabase_service.toggle_like(request.video_id, request.user_id)
+        if not result:
+            raise HTTPException(status_code=500, detail="Failed to update like")
         return {
             "success": True,
-            "liked": liked,
-            "likes_count": likes_count
+            "liked": result["liked"],
+            "likes_count": result["likes_count"]
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -135,10 +155,11 @@ async def get_comments(video_id: str, limit: int = Query(50, ge=1, le=100)):
 
 
 @router.get("/trending")
-async def get_trending_videos(limit: int = Query(10, ge=1, le=20)):
-    """Get trending videos (most liked/viewed)"""
+async def get_trending_videos(response: Response, limit: int = Query(10, ge=1, le=20)):
+    """Get trending videos (time-decayed likes/views/comments)"""
     try:
         videos = await feed_service.get_trending(limit=limit)
+        response.headers["Cache-Control"] = f"public, max-age={settings.TRENDING_CACHE_SECONDS}"
         return videos
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -148,8 +169,8 @@ async def get_trending_videos(limit: int = Query(10, ge=1, le=20)):
 async def increment_video_view(video_id: str):
     """Increment video view count"""
     try:
-        # For storage-only videos, just return success without incrementing
-        # (no database record exists)
-        return {"success": True}
+        # Coalesced and flushed in bulk; storage-only videos without a
+        # database row are simply not matched by the flush
+        return {"success": await feed_service.increment_views(video_id)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+from ..services.local_supabase import local_supabase
+
+
+# Mounted only with STORAGE_PROVIDER=local; mirrors Supabase's public object URLs
+router = APIRouter(prefix="/storage/v1/object/public", tags=["local-storage"])
+
+
+@router.get("/{bucket}/{path:path}")
+async def get_public_object(bucket: str, path: str):
+    """Serve an object from the local storage directory"""
+    file_path = local_supabase.object_path(bucket, path)
+    if file_path is None or not file_path.is_file():
+        raise HTTPException(status_code=404, detail="Object not found")
+    return FileResponse(file_path)
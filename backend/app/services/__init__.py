@@ -5,8 +5,24 @@ from .ai_service import AIService
 from .veo_service import VeoService
 from .nanobanana_service import NanobananaService
 from .gemini_tts_service import GeminiTTSService
+from .narration_index_service import NarrationIndexService
+from .prompt_bank_service import PromptBankService
+from .round_plan_service import RoundPlanService
+from .resilience_service import ResilienceService
 from .content_pipeline_service import ContentPipelineService
 from .feed_service import FeedService
+from .counter_service import CounterService
+from .feed_index_service import FeedIndexService
+from .trending_service import TrendingService
+from .dataloader import DataLoader
+from .metrics import MetricsRegistry
+from .combination_key import combination_key
+from .storage_index_service import StorageIndexService
+from .media_bus_service import MediaBusService
+from .speculative_media_service import SpeculativeMediaService
+from .speculative_video_service import SpeculativeVideoService
+from .fake_providers import FakeProviders
+from .local_supabase import LocalSupabase
 
 __all__ = [
     "CardService", 
@@ -16,6 +32,22 @@ __all__ = [
     "VeoService",
     "NanobananaService",
     "GeminiTTSService",
+    "NarrationIndexService",
+    "PromptBankService",
+    "RoundPlanService",
+    "ResilienceService",
     "ContentPipelineService",
-    "FeedService"
+    "FeedService",
+    "CounterService",
+    "FeedIndexService",
+    "TrendingService",
+    "DataLoader",
+    "MetricsRegistry",
+    "combination_key",
+    "StorageIndexService",
+    "MediaBusService",
+    "SpeculativeMediaService",
+    "SpeculativeVideoService",
+    "FakeProviders",
+    "LocalSupabase"
 ]
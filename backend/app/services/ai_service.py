@@ -1,11 +1,19 @@
 """
 AI Service for card selection and video generation
 """
+import logging
 import random
 import asyncio
-from typing import List, Optional
-import google.generativeai as genai
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Optional
 from ..config import settings
+from . import providers
+from .ttl_cache import TTLCache
+from .resilience_service import resilience_service
+
+logger = logging.getLogger(__name__)
 
 
 class AIService:
@@ -16,6 +24,23 @@ class AIService:
         "sarcastic", "punny", "dark_humor", "innocent"
     ]
     
+    PERSONALITY_INSTRUCTIONS = {
+        "absurd": "Choose the most absurd, unexpected, and hilarious combinations. Be weird and random.",
+        "edgy": "Choose the darkest, most controversial, and edgy combinations. Push boundaries.",
+        "wholesome": "Choose the most wholesome, heartwarming, and funny combinations. Keep it sweet.",
+        "chaotic": "Choose the most chaotic, nonsensical, and unpredictable combinations. Embrace chaos.",
+        "sarcastic": "Choose the most sarcastic, ironic, and deadpan combinations. Be cynical.",
+        "punny": "Choose combinations that create puns, wordplay, or clever references.",
+        "dark_humor": "Choose combinations with dark, morbid humor. Be twisted but funny.",
+        "innocent": "Choose combinations that sound innocent but have double meanings."
+    }
+    
+    JUDGING_CRITERIA = {
+        "absurd": "most absurd, unexpected, and hilarious",
+        "edgy": "darkest, most controversial, and edgy",
+        "wholesome": "most wholesome, heartwarming, and funny"
+    }
+    
     def __init__(self):
         """Initialize AI service with Gemini"""
         self.system_prompt =  """
@@ -26,22 +51,114 @@ class AIService:
         Description:
 
         """
-        if settings.GEMINI_API_KEY:
-            genai.configure(api_key=settings.GEMINI_API_KEY)
-            self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+        self.model_name = 'gemini-2.0-flash-exp'
+        self.model = providers.text_model(self.model_name)
+        
+        # Prompt/response cache: identical prompts to the same model return the same text
+        self.response_cache = TTLCache(
+            "llm_responses",
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            max_bytes=settings.LLM_CACHE_MAX_BYTES,
+            default_ttl=settings.LLM_CACHE_TTL_SECONDS,
+            disk_path=settings.LLM_CACHE_DISK_PATH or None
+        )
+        # response key -> generation shared by concurrent callers
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.stats = {"calls": 0, "cache_hits": 0, "bypassed": 0, "coalesced": 0}
+    
+    def response_key(self, prompt: str, generation_config: Optional[dict] = None) -> str:
+        """Cache key for a (model, prompt, generation config) triple"""
+        config = json.dumps(generation_config or {}, sort_keys=True)
+        digest = hashlib.sha256(f"{self.model_name}\0{config}\0{prompt}".encode()).hexdigest()
+        return f"llm:{digest[:32]}"
+    
+    async def _generate_cached(
+        self,
+        prompt: str,
+        generation_config: Optional[dict] = None,
+        fresh: bool = False
+    ) -> str:
+        """
+        Call the model through the response cache
+        
+        Args:
+            prompt: Full prompt text
+            generation_config: Optional Gemini generation config
+            fresh: Skip the cache lookup (the new response still replaces the
+                cached one), for callers that want variety
+        
+        Returns:
+            Response text
+        """
+        key = self.response_key(prompt, generation_config)
+        
+        if fresh or settings.LLM_CACHE_BYPASS:
+            self.stats["bypassed"] += 1
         else:
-            self.model = None
+            cached = await self.response_cache.aget(key)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                return cached
+            if key in self._in_flight:
+                self.stats["coalesced"] += 1
+                return await asyncio.shield(self._in_flight[key])
+        
+        future = asyncio.ensure_future(self._call_model(prompt, generation_config))
+        self._in_flight[key] = future
+        try:
+            text = await asyncio.shield(future)
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+        
+        self.response_cache.set(key, text)
+        return text
+    
+    async def _call_model(self, prompt: str, generation_config: Optional[dict] = None) -> str:
+        """Uncached model call behind the text breaker (timeout + hedging)"""
+        self.stats["calls"] += 1
+        kwargs = {"generation_config": generation_config} if generation_config else {}
+        # Async SDK call: a timed-out or losing hedge is really cancelled
+        # (a to_thread call would keep running and holding a thread)
+        response = await resilience_service.call(
+            "gemini_text",
+            lambda: self.model.generate_content_async(prompt, **kwargs),
+            timeout=settings.TEXT_CALL_TIMEOUT,
+            hedge=True
+        )
+        return response.text
+    
+    def start(self):
+        """Start the response cache expiry sweeper"""
+        self.response_cache.start_sweeper(settings.CACHE_SWEEP_INTERVAL)
+    
+    async def stop(self):
+        """Stop the response cache sweeper"""
+        await self.response_cache.stop_sweeper()
+    
+    def get_stats(self) -> dict:
+        """Get LLM call and response cache statistics"""
+        return {**self.stats, "response_cache": self.response_cache.get_stats()}
     
     def get_random_personality(self) -> str:
         """Get a random AI personality for variety"""
         return random.choice(self.PERSONALITIES)
     
-    async def generate_text(self, prompt: str) -> str:
+    def personality_instruction(self, personality: str) -> str:
+        """Card selection instruction for a personality"""
+        return self.PERSONALITY_INSTRUCTIONS.get(personality, self.PERSONALITY_INSTRUCTIONS['absurd'])
+    
+    def judging_criteria(self, personality: str) -> str:
+        """Judging criteria for a personality"""
+        return self.JUDGING_CRITERIA.get(personality, self.JUDGING_CRITERIA['absurd'])
+    
+    async def generate_text(self, prompt: str, fresh: bool = False) -> str:
         """
         Generate text using Gemini
         
         Args:
             prompt: The text generation prompt
+            fresh: Bypass the response cache for a new variation
             
         Returns:
             Generated text
@@ -50,15 +167,43 @@ class AIService:
             raise Exception("Gemini API not configured")
         
         try:
-            response = await asyncio.to_thread(
-                self.model.generate_content,
-                prompt
-            )
-            return response.text
+            return await self._generate_cached(prompt, fresh=fresh)
         except Exception as e:
-            print(f"❌ Gemini text generation error: {e}")
+            logger.error("Gemini text generation error: %s", e)
             raise
     
+    async def generate_json(self, prompt: str, cache: bool = True) -> Any:
+        """
+        Generate a JSON response using Gemini's JSON mode
+        
+        Args:
+            prompt: Prompt describing the expected JSON
+            cache: Use the response cache (off for one-off prompts, which
+                would only take space in both cache tiers)
+            
+        Returns:
+            Parsed JSON value
+            
+        Raises:
+            ValueError: If the response is not valid JSON (it is not cached)
+        """
+        if not self.model:
+            raise Exception("Gemini API not configured")
+        
+        generation_config = {"response_mime_type": "application/json"}
+        if cache:
+            text = await self._generate_cached(prompt, generation_config)
+        else:
+            self.stats["bypassed"] += 1
+            text = await self._call_model(prompt, generation_config)
+        match = re.search(r"[\[{].*[\]}]", text, re.DOTALL)
+        try:
+            return json.loads(match.group(0) if match else text)
+        except ValueError:
+            if cache:
+                self.response_cache.delete(self.response_key(prompt, generation_config))
+            raise ValueError(f"Invalid JSON from Gemini: {text[:100]}")
+    
     async def select_cards(
         self, 
         black_card_text: str, 
@@ -89,17 +234,6 @@ class AIService:
                 # Create prompt for Gemini
                 cards_text = "\n".join([f"{i+1}. {card['text']}" for i, card in enumerate(available_cards)])
                 
-                personality_instructions = {
-                    "absurd": "Choose the most absurd, unexpected, and hilarious combinations. Be weird and random.",
-                    "edgy": "Choose the darkest, most controversial, and edgy combinations. Push boundaries.",
-                    "wholesome": "Choose the most wholesome, heartwarming, and funny combinations. Keep it sweet.",
-                    "chaotic": "Choose the most chaotic, nonsensical, and unpredictable combinations. Embrace chaos.",
-                    "sarcastic": "Choose the most sarcastic, ironic, and deadpan combinations. Be cynical.",
-                    "punny": "Choose combinations that create puns, wordplay, or clever references.",
-                    "dark_humor": "Choose combinations with dark, morbid humor. Be twisted but funny.",
-                    "innocent": "Choose combinations that sound innocent but have double meanings."
-                }
-                
                 prompt = f"""You are playing Cards Against Humanity. Select the {pick_count} funniest white card(s) to complete this black card.
 
 Black Card: "{black_card_text}"
@@ -107,22 +241,17 @@ Black Card: "{black_card_text}"
 Available White Cards:
 {cards_text}
 
-Personality: {personality_instructions.get(personality, personality_instructions['absurd'])}
+Personality: {self.personality_instruction(personality)}
 
 Respond with ONLY the numbers of the cards you select (e.g., "3, 7, 12" or just "5" if picking one card).
 Choose cards that create the funniest, most creative combination."""
 
-                response = await asyncio.to_thread(
-                    self.model.generate_content,
-                    prompt
-                )
+                response_text = (await self._call_model(prompt)).strip()
                 
                 # Parse response to get card numbers
                 selected_numbers = []
-                response_text = response.text.strip()
                 
                 # Extract numbers from response
-                import re
                 numbers = re.findall(r'\d+', response_text)
                 selected_numbers = [int(n) for n in numbers[:pick_count]]
                 
@@ -134,16 +263,16 @@ Choose cards that create the funniest, most creative combination."""
                 
                 # If we got valid selections, return them
                 if len(selected_ids) == pick_count:
-                    print(f"🤖 AI selected cards: {selected_ids}")
+                    logger.info("AI selected cards: %s", selected_ids)
                     return selected_ids
                 else:
-                    print(f"⚠️  AI selection incomplete, falling back to random")
+                    logger.warning("AI selection incomplete, falling back to random")
                     
             except Exception as e:
-                print(f"❌ Gemini card selection error: {e}")
+                logger.error("Gemini card selection error: %s", e)
         
         # Fallback to random selection
-        print(f"🎲 Using random card selection")
+        logger.info("Using random card selection")
         selected = random.sample(available_cards, pick_count)
         return [card['id'] for card in selected]
     
@@ -176,12 +305,6 @@ Choose cards that create the funniest, most creative combination."""
                     cards_text = ", ".join(sub.get('cards', []))
                     submissions_text += f"{i+1}. {cards_text}\n"
                 
-                personality_criteria = {
-                    "absurd": "most absurd, unexpected, and hilarious",
-                    "edgy": "darkest, most controversial, and edgy",
-                    "wholesome": "most wholesome, heartwarming, and funny"
-                }
-                
                 prompt = f"""You are judging Cards Against Humanity submissions. Pick the winner.
 
 Black Card: "{black_card_text}"
@@ -189,38 +312,35 @@ Black Card: "{black_card_text}"
 Submissions:
 {submissions_text}
 
-Criteria: Choose the {personality_criteria.get(personality, personality_criteria['absurd'])} combination.
+Criteria: Choose the {self.judging_criteria(personality)} combination.
 
 Respond with ONLY the number of the winning submission (e.g., "2" or "5"). No explanation needed."""
 
-                response = await asyncio.to_thread(
-                    self.model.generate_content,
-                    prompt
-                )
+                response_text = await self._call_model(prompt)
                 
                 # Parse response to get winner number
-                import re
-                numbers = re.findall(r'\d+', response.text.strip())
+                numbers = re.findall(r'\d+', response_text.strip())
                 if numbers:
                     winner_num = int(numbers[0])
                     if 1 <= winner_num <= len(submissions):
                         winner_index = winner_num - 1
-                        print(f"🏆 AI judge selected winner: submission {winner_num}")
+                        logger.info("AI judge selected winner: submission %s", winner_num)
                         return winner_index
                 
-                print(f"⚠️  AI judging failed, using random")
+                logger.warning("AI judging failed, using random")
                 
             except Exception as e:
-                print(f"❌ Gemini judging error: {e}")
+                logger.error("Gemini judging error: %s", e)
         
         # Fallback to random selection
-        print(f"🎲 Using random winner selection")
+        logger.info("Using random winner selection")
         return random.randint(0, len(submissions) - 1)
     
     async def generate_video_prompt(
         self,
         black_card: str,
-        white_cards: List[str]
+        white_cards: List[str],
+        fresh: bool = False
     ) -> str:
         """
         Generate a video prompt from the card combination
@@ -228,6 +348,7 @@ Respond with ONLY the number of the winning submission (e.g., "2" or "5"). No ex
         Args:
             black_card: The black card text
             white_cards: List of white card texts
+            fresh: Bypass the response cache for a new variation
         
         Returns:
             Video generation prompt
@@ -242,12 +363,9 @@ Respond with ONLY the number of the winning submission (e.g., "2" or "5"). No ex
             try:
                 prompt = f"""You will receive a short description of a scenario from the game Cards Against Humanity. Your task is to interpret this scenario and generate a humorous, absurd, and visually engaging video that captures the comedic tone and timing of the scene. Use cinematic creativity, playful exaggeration, and expressive character actions to bring the humor to life. Always speak and act the description. Description: {result}"""
 
-                response = await asyncio.to_thread(
-                    self.model.generate_content,
-                    self.system_prompt + prompt
-                )
+                response_text = await self._generate_cached(self.system_prompt + prompt, fresh=fresh)
                 
-                generated = response.text.strip()
+                generated = response_text.strip()
                 # Limit to 50 words for faster generation
                 words = generated.split()
                 if len(words) > 50:
@@ -255,7 +373,7 @@ Respond with ONLY the number of the winning submission (e.g., "2" or "5"). No ex
                 
                 return generated
             except Exception as e:
-                print(f"Gemini prompt generation failed: {e}")
+                logger.info("Gemini prompt generation failed: %s", e)
                 # Fallback to simple prompt
                 return f"A humorous scene: {result[:100]}"
         
@@ -1,26 +1,26 @@
 """
 Card Generator Service - Uses AI to generate new black and white cards
 """
+import logging
 import random
 import asyncio
 import re
 from typing import List, Dict, Optional
 import google.generativeai as genai
-from ..config import settings
+from . import providers
 from ..models.card import BlackCard, WhiteCard
 
+logger = logging.getLogger(__name__)
+
 
 class CardGeneratorService:
     """Service for generating new Cards Against Humanity style cards using AI"""
     
     def __init__(self):
         """Initialize card generator with Gemini"""
-        if settings.GEMINI_API_KEY:
-            genai.configure(api_key=settings.GEMINI_API_KEY)
-            self.model = genai.GenerativeModel('gemini-pro')
-        else:
-            self.model = None
-            print("⚠️  Warning: Gemini API not configured. Card generation will not work.")
+        self.model = providers.text_model('gemini-pro')
+        if not self.model:
+            logger.warning("Warning: Gemini API not configured. Card generation will not work.")
     
     def _get_next_card_id(self, card_type: str, existing_cards: List[str]) -> str:
         """
@@ -164,12 +164,12 @@ Generate {count} cards NOW (one per line):"""
                     pack=pack
                 )
                 cards.append(card)
-                print(f"✅ Generated black card: {text[:50]}...")
+                logger.info("Generated black card: %s...", text[:50])
             
             return cards
             
         except Exception as e:
-            print(f"❌ Error generating black cards: {e}")
+            logger.error("Error generating black cards: %s", e)
             raise
     
     async def generate_white_cards(
@@ -286,12 +286,12 @@ Generate {count} NEW white cards (one per line, just the text):"""
                     pack=pack
                 )
                 cards.append(card)
-                print(f"✅ Generated white card: {text}")
+                logger.info("Generated white card: %s", text)
             
             return cards
             
         except Exception as e:
-            print(f"❌ Error generating white cards: {e}")
+            logger.error("Error generating white cards: %s", e)
             raise
     
     async def generate_card_pack(
@@ -319,8 +319,8 @@ Generate {count} NEW white cards (one per line, just the text):"""
         Returns:
             Dictionary with 'black_cards' and 'white_cards' lists
         """
-        print(f"🎲 Generating card pack '{pack_name}'...")
-        print(f"   Black cards: {black_count}, White cards: {white_count}")
+        logger.info("Generating card pack '%s'...", pack_name)
+        logger.info("Black cards: %s, White cards: %s", black_count, white_count)
         
         # Generate black cards
         black_cards = await self.generate_black_cards(
@@ -356,7 +356,7 @@ Generate {count} NEW white cards (one per line, just the text):"""
             )
             white_cards.extend(nsfw_cards)
         
-        print(f"✅ Generated pack '{pack_name}': {len(black_cards)} black, {len(white_cards)} white cards")
+        logger.info("Generated pack '%s': %s black, %s white cards", pack_name, len(black_cards), len(white_cards))
         
         return {
             "black_cards": black_cards,
@@ -1,3 +1,4 @@
+import logging
 import json
 import random
 from typing import List, Dict, Optional
@@ -5,6 +6,8 @@ from pathlib import Path
 from ..models.card import Card, BlackCard, WhiteCard
 from ..config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class CardService:
     """Service for managing card decks"""
@@ -13,7 +16,7 @@ class CardService:
         self.cards_file = Path(__file__).parent.parent.parent / cards_file
         self.black_cards: Dict[str, BlackCard] = {}
         self.white_cards: Dict[str, WhiteCard] = {}
-        self.use_supabase = use_supabase and settings.SUPABASE_URL
+        self.use_supabase = use_supabase and settings.SUPABASE_URL and settings.STORAGE_PROVIDER != "local"
         self.load_cards()
     
     def load_cards(self):
@@ -23,8 +26,8 @@ class CardService:
                 self.load_cards_from_supabase()
                 return
             except Exception as e:
-                print(f"⚠️  Failed to load from Supabase: {e}")
-                print("⚠️  Falling back to JSON...")
+                logger.warning("Failed to load from Supabase: %s", e)
+                logger.warning("Falling back to JSON...")
         
         # Fallback to JSON
         try:
@@ -41,9 +44,10 @@ class CardService:
                 card = WhiteCard(**card_data)
                 self.white_cards[card.id] = card
             
-            print(f"✅ Loaded {len(self.black_cards)} black cards and {len(self.white_cards)} white cards from JSON")
+            logger.info("Loaded %s black cards and %s white cards from JSON",
+                        len(self.black_cards), len(self.white_cards))
         except Exception as e:
-            print(f"❌ Error loading cards: {e}")
+            logger.error("Error loading cards: %s", e)
             raise
     
     def load_cards_from_supabase(self):
@@ -74,7 +78,8 @@ class CardService:
             )
             self.white_cards[card.id] = card
         
-        print(f"✅ Loaded {len(self.black_cards)} black cards and {len(self.white_cards)} white cards from Supabase")
+        logger.info("Loaded %s black cards and %s white cards from Supabase",
+                    len(self.black_cards), len(self.white_cards))
     
     async def load_cards_from_mongodb(self, db):
         """Load cards from MongoDB (async)"""
@@ -95,9 +100,10 @@ class CardService:
                 card = WhiteCard(**card_data)
                 self.white_cards[card.id] = card
             
-            print(f"✅ Loaded {len(self.black_cards)} black cards and {len(self.white_cards)} white cards from MongoDB")
+            logger.info("Loaded %s black cards and %s white cards from MongoDB",
+                        len(self.black_cards), len(self.white_cards))
         except Exception as e:
-            print(f"❌ Error loading cards from MongoDB: {e}")
+            logger.error("Error loading cards from MongoDB: %s", e)
             # Fallback to JSON
             self.load_cards()
     
@@ -0,0 +1,63 @@
+"""
+Combination Key
+One compact 128-bit key per (black card, white cards) combination, shared by
+every cache layer. Uses card IDs when available and normalized text
+otherwise; hashed with xxh3-128 when the xxhash package is installed,
+blake2b-128 from the standard library otherwise.
+"""
+import hashlib
+import re
+from typing import Iterable, Optional
+
+try:
+    import xxhash
+
+    def _hash128(data: bytes) -> str:
+        return xxhash.xxh3_128_hexdigest(data)
+
+    HASH_BACKEND = "xxh3_128"
+except ImportError:
+    def _hash128(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    HASH_BACKEND = "blake2b_128"
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_card_text(text: str) -> str:
+    """Case- and whitespace-insensitive form of a card's text"""
+    return _WHITESPACE.sub(" ", text).strip().casefold()
+
+
+def combination_key(
+    black: Optional[str] = None,
+    whites: Optional[Iterable[str]] = None,
+    black_id: Optional[str] = None,
+    white_ids: Optional[Iterable[str]] = None
+) -> str:
+    """
+    Key for a card combination (32 hex chars)
+
+    White cards are order-insensitive, matching how combinations have always
+    been cached.
+
+    Args:
+        black: Black card text (used when black_id is not given)
+        whites: White card texts (used when white_ids are not given)
+        black_id: Black card ID
+        white_ids: White card IDs
+
+    Returns:
+        Hex key, prefixed by its source ('i' for IDs, 't' for text) so the
+        two forms can never collide
+    """
+    if black_id is not None and white_ids is not None:
+        source = "i"
+        parts = [black_id, *sorted(white_ids)]
+    else:
+        source = "t"
+        parts = [normalize_card_text(black or ""), *sorted(normalize_card_text(w) for w in whites or ())]
+
+    return source + _hash128("\x1f".join(parts).encode())
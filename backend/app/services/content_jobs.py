@@ -0,0 +1,43 @@
+"""
+Content Jobs
+Job queue handlers for the long-running content pipeline endpoints
+"""
+from typing import Any, Callable, Dict
+from .content_pipeline_service import content_pipeline_service
+from .job_queue_service import job_queue_service
+
+
+CONTENT_BATCH_JOB = "content.batch"
+CONTENT_ROUND_JOB = "content.round"
+
+
+async def run_batch_job(payload: Dict[str, Any], report_progress: Callable) -> Dict:
+    """Generate content for every combination in the payload"""
+    total = len(payload['combinations'])
+    done = 0
+
+    async def on_item_done(index: int, result):
+        nonlocal done
+        done += 1
+        await report_progress(done / total if total else 1.0, f"Finished {done}/{total} combinations")
+
+    results = await content_pipeline_service.generate_batch_content(
+        payload['combinations'],
+        payload.get('narration_style', 'humorous'),
+        on_item_done=on_item_done
+    )
+    return {"results": results}
+
+
+async def run_round_job(payload: Dict[str, Any], report_progress: Callable) -> Dict:
+    """Generate content for a full game round"""
+    await report_progress(0.0, "Generating round content")
+    return await content_pipeline_service.generate_content_for_round(
+        payload['black_card'],
+        payload['submissions'],
+        payload.get('narration_style', 'humorous')
+    )
+
+
+job_queue_service.register_handler(CONTENT_BATCH_JOB, run_batch_job)
+job_queue_service.register_handler(CONTENT_ROUND_JOB, run_round_job)
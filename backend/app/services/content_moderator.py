@@ -2,16 +2,32 @@
 Content Moderation Service
 Uses Gemini to sanitize content before image/video generation
 """
-import google.generativeai as genai
+import logging
 from ..config import settings
+from . import providers
+from .content_sanitizer import content_sanitizer
+from .resilience_service import resilience_service
+
+logger = logging.getLogger(__name__)
 
 
 class ContentModerator:
     """Moderate and sanitize content before generation"""
     
     def __init__(self):
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+        self.model = providers.text_model('gemini-2.0-flash-exp')
+    
+    async def _generate(self, instruction: str) -> str:
+        """Async moderation call behind its breaker (timeout + hedging, both cancellable)"""
+        if self.model is None:
+            raise RuntimeError("No Gemini API key configured")
+        response = await resilience_service.call(
+            "gemini_moderation",
+            lambda: self.model.generate_content_async(instruction),
+            timeout=settings.TEXT_CALL_TIMEOUT,
+            hedge=True
+        )
+        return response.text
     
     async def sanitize_prompt(self, prompt: str) -> str:
         """
@@ -38,16 +54,15 @@ Original prompt: {prompt}
 
 Return ONLY the sanitized prompt, nothing else."""
 
-            response = self.model.generate_content(sanitize_instruction)
-            sanitized = response.text.strip()
+            sanitized = (await self._generate(sanitize_instruction)).strip()
             
-            print(f"🛡️ Moderated: '{prompt[:50]}...' → '{sanitized[:50]}...'")
+            logger.info("Moderated: '%s...' → '%s...'", prompt[:50], sanitized[:50])
             return sanitized
             
         except Exception as e:
-            print(f"❌ Moderation error: {e}")
-            # Fallback: return original if moderation fails
-            return prompt
+            logger.error("Moderation error: %s", e)
+            # Fallback: rule-based sanitizer if moderation fails
+            return content_sanitizer.sanitize(prompt)
     
     async def is_safe(self, text: str) -> bool:
         """
@@ -62,13 +77,12 @@ Answer only YES or NO.
 
 Text: {text}"""
 
-            response = self.model.generate_content(check_instruction)
-            result = response.text.strip().upper()
+            result = (await self._generate(check_instruction)).strip().upper()
             
             return "YES" in result
             
         except Exception as e:
-            print(f"❌ Safety check error: {e}")
+            logger.error("Safety check error: %s", e)
             return True  # Default to safe if check fails
 
 
@@ -6,13 +6,18 @@ Orchestrates the full content creation workflow:
 3. Generate video with Veo3
 4. Add TTS narration
 """
+import logging
 import asyncio
-from typing import List, Optional, Dict
+from typing import Awaitable, Callable, List, Optional, Dict
+from ..config import settings
 from .nanobanana_service import nanobanana_service
 from .gemini_tts_service import gemini_tts_service
 from .veo_service import veo_service
 from .ai_service import ai_service
 from .feed_service import feed_service
+from .pipeline_dag import PipelineDAG, Stage, StageLimit
+
+logger = logging.getLogger(__name__)
 
 
 class ContentPipelineService:
@@ -20,7 +25,13 @@ class ContentPipelineService:
     
     def __init__(self):
         """Initialize content pipeline service"""
-        pass
+        # Shared by every pipeline run so concurrent jobs respect API quotas together
+        self.stage_limits = {
+            'prompt': StageLimit(settings.PIPELINE_PROMPT_CONCURRENCY, settings.PIPELINE_PROMPT_RPM),
+            'image': StageLimit(settings.PIPELINE_IMAGE_CONCURRENCY, settings.PIPELINE_IMAGE_RPM),
+            'narration': StageLimit(settings.PIPELINE_NARRATION_CONCURRENCY, settings.PIPELINE_NARRATION_RPM),
+            'video': StageLimit(settings.PIPELINE_VIDEO_CONCURRENCY, settings.PIPELINE_VIDEO_RPM),
+        }
     
     async def generate_content_for_round(
         self,
@@ -39,10 +50,10 @@ class ContentPipelineService:
         Returns:
             Dict with winner info, images, video, and audio
         """
-        print("🎬 Starting content generation pipeline...")
+        logger.info("Starting content generation pipeline...")
         
         # Step 1: Select winning submission first (AI judge)
-        print("\n🏆 Step 1: Selecting winning submission...")
+        logger.info("Step 1: Selecting winning submission...")
         winner_index = await self._select_winner(
             black_card_text,
             submissions,
@@ -51,11 +62,11 @@ class ContentPipelineService:
         
         winner_submission = submissions[winner_index]
         
-        print(f"✅ Winner: {winner_submission.get('player_id', 'Unknown')}")
-        print(f"   Cards: {winner_submission['cards']}")
+        logger.info("Winner: %s", winner_submission.get('player_id', 'Unknown'))
+        logger.info("Winning cards: %s", winner_submission['cards'])
         
         # Step 2: Generate images + narration in parallel
-        print("\n⚡ Step 2: Generating images + narration in parallel...")
+        logger.info("Step 2: Generating images + narration in parallel...")
         
         # Create parallel tasks
         image_task = self._generate_images_for_submissions(black_card_text, submissions)
@@ -70,11 +81,12 @@ class ContentPipelineService:
         
         winner_image = image_results[winner_index]
         
-        # Step 3: Generate video for winning combination
-        print("\n🎥 Step 3: Generating video with Veo3...")
+        # Step 3: Generate video for winning combination (reusing its image prompt)
+        logger.info("Step 3: Generating video with Veo3...")
         video_url = await self._generate_video_for_winner(
             black_card_text,
-            winner_submission['cards']
+            winner_submission['cards'],
+            prompt=winner_image.get('prompt')
         )
         
         # Compile final result
@@ -91,14 +103,15 @@ class ContentPipelineService:
             'black_card': black_card_text
         }
         
-        print("\n✅ Content generation pipeline complete!")
-        print(f"   - Images generated: {sum(1 for img in image_results if img.get('image_url'))}/{len(image_results)}")
-        print(f"   - Video URL: {video_url or 'Failed'}")
-        print(f"   - Audio URL: {narration.get('audio_url') or 'Failed'}")
+        logger.info("Content generation pipeline complete")
+        logger.info("Images generated: %s/%s",
+                    sum(1 for img in image_results if img.get('image_url')), len(image_results))
+        logger.info("Video URL: %s", video_url or 'Failed')
+        logger.info("Audio URL: %s", narration.get('audio_url') or 'Failed')
         
         # Add to public feed
         if video_url:
-            print("\n📱 Adding to TikTok-like feed...")
+            logger.info("Adding to TikTok-like feed...")
             feed_content = {
                 'black_card': black_card_text,
                 'white_cards': winner_submission['cards'],
@@ -110,7 +123,7 @@ class ContentPipelineService:
             feed_id = await feed_service.add_to_feed(feed_content)
             if feed_id:
                 result['feed_id'] = feed_id
-                print(f"✅ Added to feed: {feed_id}")
+                logger.info("Added to feed: %s", feed_id)
         
         return result
     
@@ -153,9 +166,13 @@ class ContentPipelineService:
     async def _generate_video_for_winner(
         self,
         black_card_text: str,
-        white_cards: List[str]
+        white_cards: List[str],
+        prompt: Optional[str] = None
     ) -> Optional[str]:
         """Generate video for the winning combination"""
+        if prompt:
+            return await veo_service.generate_video(prompt)
+        
         video_url = await veo_service.generate_video_for_cards(
             black_card_text,
             white_cards,
@@ -172,7 +189,7 @@ class ContentPipelineService:
     ) -> Dict:
         """
         Generate complete social media content (TikTok/Reels ready)
-        Sequential generation: image -> narration -> video
+        Stages run as a DAG: prompt -> (image, video), narration in parallel
         
         Args:
             black_card_text: The black card text
@@ -180,76 +197,113 @@ class ContentPipelineService:
             narration_style: Style for narration
         
         Returns:
-            Dict with all content URLs and metadata
+            Dict with all content URLs, metadata and per-stage timings
         """
-        print("🎬 Generating social media content...")
-        
-        # Step 1: Generate image
-        print("📸 Step 1: Generating image...")
-        prompt = await ai_service.generate_video_prompt(black_card_text, white_cards)
-        image_url = await nanobanana_service.generate_image(prompt, aspect_ratio="9:16")
+        logger.info("Generating social media content...")
         
-        # Step 2: Generate narration
-        print("🎙️  Step 2: Generating narration...")
-        narration = await gemini_tts_service.generate_narrated_script(
-            black_card_text,
-            white_cards,
-            style=narration_style
-        )
+        artifacts, timings = await self._social_content_dag(narration_style).run({
+            'black_card': black_card_text,
+            'white_cards': white_cards
+        })
         
-        # Step 3: Generate video
-        print("🎥 Step 3: Generating video...")
-        video_url = await veo_service.generate_video_for_cards(
-            black_card_text,
-            white_cards,
-            prompt_generator=ai_service.generate_video_prompt
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Stage timings: %s", ", ".join(
+                f"{name}={t['duration']}s" for name, t in timings.items()
+            ))
         
         return {
-            'image_url': image_url,
-            'video_url': video_url,
-            'narration': narration,
+            'image_url': artifacts['image'],
+            'video_url': artifacts['video'],
+            'narration': artifacts['narration'],
+            'prompt': artifacts['prompt'],
             'black_card': black_card_text,
             'white_cards': white_cards,
             'format': '9:16',  # Vertical for TikTok/Reels
-            'ready_for_social': True
+            'ready_for_social': True,
+            'timings': timings
         }
     
+    def _social_content_dag(self, narration_style: str) -> PipelineDAG:
+        """Build the stage graph for one piece of social media content"""
+        
+        async def prompt_stage(a):
+            return await ai_service.generate_video_prompt(a['black_card'], a['white_cards'])
+        
+        async def image_stage(a):
+            return await nanobanana_service.generate_image(a['prompt'], aspect_ratio="9:16")
+        
+        async def narration_stage(a):
+            return await gemini_tts_service.generate_narrated_script(
+                a['black_card'],
+                a['white_cards'],
+                style=narration_style
+            )
+        
+        async def video_stage(a):
+            return await veo_service.generate_video(a['prompt'])
+        
+        return PipelineDAG([
+            Stage('prompt', prompt_stage, limit=self.stage_limits['prompt']),
+            Stage('image', image_stage, depends_on=['prompt'], limit=self.stage_limits['image']),
+            Stage('narration', narration_stage, limit=self.stage_limits['narration']),
+            Stage('video', video_stage, depends_on=['prompt'], limit=self.stage_limits['video']),
+        ])
+    
     async def generate_batch_content(
         self,
         card_combinations: List[Dict],  # List of {black_card, white_cards}
-        narration_style: str = "humorous"
+        narration_style: str = "humorous",
+        on_item_done: Optional[Callable[[int, Optional[Dict]], Awaitable[None]]] = None
     ) -> List[Dict]:
         """
-        Generate content for multiple card combinations sequentially
+        Generate content for multiple card combinations concurrently
         Useful for batch content creation
         
+        Throughput is bounded by the shared per-stage limits, so the batch runs
+        as fast as the API quotas allow without exceeding them.
+        
         Args:
             card_combinations: List of card combinations
             narration_style: Style for narration
+            on_item_done: Optional coroutine called with (index, result) as each finishes
         
         Returns:
-            List of content results
+            List of content results (None for failed combinations)
+        
+        Raises:
+            Whatever on_item_done raises (e.g. JobLeaseLost); the remaining
+            combinations are cancelled first
         """
-        print(f"🎬 Generating content for {len(card_combinations)} combinations...")
+        logger.info("Generating content for %s combinations...", len(card_combinations))
         
-        # Generate content sequentially to avoid rate limits
-        results = []
-        for i, combo in enumerate(card_combinations):
-            print(f"\n📦 Processing combination {i+1}/{len(card_combinations)}...")
+        async def process(i: int, combo: Dict) -> Optional[Dict]:
+            logger.info("Processing combination %s/%s...", i+1, len(card_combinations))
             try:
                 result = await self.generate_social_media_content(
                     combo['black_card'],
                     combo['white_cards'],
                     narration_style
                 )
-                results.append(result)
             except Exception as e:
-                print(f"❌ Content {i+1} generation failed: {e}")
-                results.append(None)
+                logger.error("Content %s generation failed: %s", i+1, e)
+                result = None
+            
+            if on_item_done:
+                await on_item_done(i, result)
+            return result
+        
+        tasks = [asyncio.create_task(process(i, combo)) for i, combo in enumerate(card_combinations)]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            # e.g. the job's lease was lost in on_item_done: stop the other items too
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
         
         successful = sum(1 for r in results if r is not None)
-        print(f"\n✅ Generated {successful}/{len(card_combinations)} content pieces successfully")
+        logger.info("Generated %s/%s content pieces successfully", successful, len(card_combinations))
         
         return results
 
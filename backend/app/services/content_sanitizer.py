@@ -3,9 +3,12 @@ Content Sanitization Service
 Uses LLM to convert NSFW/inappropriate content to safe, funny alternatives for video generation
 """
 
+import logging
 from typing import Dict, List, Tuple
 import re
 
+logger = logging.getLogger(__name__)
+
 
 class ContentSanitizer:
     """Sanitizes content for safe video generation while keeping it funny"""
@@ -129,7 +132,7 @@ Return ONLY the sanitized text, nothing else."""
             return sanitized.strip().strip('"').strip("'")
             
         except Exception as e:
-            print(f"⚠️  LLM sanitization failed, using rule-based: {e}")
+            logger.warning("LLM sanitization failed, using rule-based: %s", e)
             # Fallback to rule-based sanitization
             return self.sanitize(text)
     
@@ -180,11 +183,11 @@ Return ONLY a JSON array of sanitized cards in the same order, nothing else. Exa
             sanitized_black = sanitized_cards[0]
             sanitized_whites = sanitized_cards[1:]
             
-            print(f"✅ Batch sanitized {len(cards_list)} cards in single LLM call")
+            logger.info("Batch sanitized %s cards in single LLM call", len(cards_list))
             return sanitized_black, sanitized_whites
             
         except Exception as e:
-            print(f"⚠️  LLM batch sanitization failed, using rule-based: {e}")
+            logger.warning("LLM batch sanitization failed, using rule-based: %s", e)
             # Fallback to rule-based sanitization
             return self.sanitize_cards(black_card, white_cards)
     
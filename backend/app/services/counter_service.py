@@ -0,0 +1,130 @@
+"""
+Counter Service
+Write-behind aggregator for feed counters: like/view increments are coalesced
+per video in memory and flushed to Postgres in one bulk RPC per window, so a
+viral video costs one UPDATE per flush instead of one per view
+"""
+import logging
+import asyncio
+import time
+import uuid
+from typing import Dict, Optional
+from ..config import settings
+from .supabase_http import supabase_http
+
+logger = logging.getLogger(__name__)
+
+
+class CounterService:
+    """Coalesces video counter deltas and flushes them periodically"""
+
+    FIELDS = ("likes", "views")
+
+    def __init__(self):
+        """Initialize counter service"""
+        self.flush_interval = settings.COUNTER_FLUSH_INTERVAL
+        # video_id -> {"likes": delta, "views": delta}
+        self.pending: Dict[str, Dict[str, int]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        # Epoch time up to which every increment is in the database
+        self.flushed_through = 0.0
+
+        self.stats = {"increments": 0, "flushes": 0, "rows_written": 0, "flush_errors": 0}
+
+    def incr(self, video_id: str, field: str, amount: int = 1) -> bool:
+        """
+        Record a counter change (applied on the next flush)
+
+        Args:
+            video_id: Video UUID
+            field: 'likes' or 'views'
+            amount: Delta (negative to decrement)
+
+        Returns:
+            False if the increment was rejected (unknown field or non-UUID id)
+        """
+        if field not in self.FIELDS:
+            return False
+        try:
+            uuid.UUID(video_id)
+        except ValueError:
+            return False
+
+        deltas = self.pending.setdefault(video_id, {name: 0 for name in self.FIELDS})
+        deltas[field] += amount
+        self.stats["increments"] += 1
+        return True
+
+    def pending_delta(self, video_id: str, field: str) -> int:
+        """Unflushed delta for a video, for read-your-writes counts"""
+        return self.pending.get(video_id, {}).get(field, 0)
+
+    async def flush(self) -> int:
+        """
+        Write all pending deltas in one bulk RPC
+
+        Returns:
+            Number of videos updated
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            taken_at = time.time()
+            if not self.pending:
+                self.flushed_through = taken_at
+                return 0
+
+            batch, self.pending = self.pending, {}
+            rows = [
+                {"id": video_id, **deltas}
+                for video_id, deltas in batch.items()
+                if any(deltas.values())
+            ]
+            if not rows:
+                self.flushed_through = taken_at
+                return 0
+
+            try:
+                await supabase_http.rpc("apply_video_counters", {"deltas": rows})
+            except Exception as e:
+                # Merge back so the deltas go out with the next flush
+                for video_id, deltas in batch.items():
+                    merged = self.pending.setdefault(video_id, {name: 0 for name in self.FIELDS})
+                    for name, value in deltas.items():
+                        merged[name] += value
+                self.stats["flush_errors"] += 1
+                logger.warning("Counter flush failed (%s videos), will retry: %s", len(rows), e)
+                return 0
+
+            self.flushed_through = taken_at
+            self.stats["flushes"] += 1
+            self.stats["rows_written"] += len(rows)
+            return len(rows)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self):
+        """Start the periodic flush"""
+        if self._flush_task is None and self.flush_interval > 0:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Stop the periodic flush and write whatever is pending"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush()
+
+    def get_stats(self) -> dict:
+        """Get counter aggregation statistics"""
+        return {**self.stats, "pending_videos": len(self.pending)}
+
+
+# Singleton instance
+counter_service = CounterService()
@@ -0,0 +1,60 @@
+"""
+DataLoader
+Per-request batching helper: load(key) calls made in the same event-loop
+tick are coalesced into one batch call (e.g. a single `id=in.(...)` query),
+and repeated keys are served from the request's cache
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List
+
+
+BatchFunction = Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+
+
+class DataLoader:
+    """Batches and de-duplicates loads for the lifetime of one request"""
+
+    def __init__(self, batch_fn: BatchFunction):
+        """
+        Args:
+            batch_fn: Coroutine taking a list of keys and returning a dict of
+                key -> value (missing keys resolve to None)
+        """
+        self.batch_fn = batch_fn
+        self.batches = 0
+        self._cache: Dict[Hashable, asyncio.Future] = {}
+        self._queue: List[Hashable] = []
+
+    def load(self, key: Hashable) -> Awaitable[Any]:
+        """Schedule a key for the next batch and return its future"""
+        if key in self._cache:
+            return self._cache[key]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._cache[key] = future
+        self._queue.append(key)
+
+        if len(self._queue) == 1:
+            # Let every load() issued this tick join the batch before dispatching
+            loop.call_soon(lambda: asyncio.ensure_future(self._dispatch()))
+        return future
+
+    async def load_many(self, keys: Iterable[Hashable]) -> List[Any]:
+        """Load several keys in one batch"""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    async def _dispatch(self):
+        keys, self._queue = self._queue, []
+        self.batches += 1
+        try:
+            results = await self.batch_fn(keys)
+        except Exception as e:
+            for key in keys:
+                if not self._cache[key].done():
+                    self._cache[key].set_exception(e)
+            return
+
+        for key in keys:
+            if not self._cache[key].done():
+                self._cache[key].set_result(results.get(key))
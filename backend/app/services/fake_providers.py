@@ -0,0 +1,367 @@
+"""
+Fake Providers
+Deterministic in-process stand-ins for the Gemini text models, the
+google.genai client (image, TTS, Veo) and their latencies. Responses are a
+pure function of (FAKE_SEED, prompt), payloads have realistic sizes (PNG
+images, 24 kHz PCM narration, multi-MB videos), latencies follow per-endpoint
+log-normal distributions and failures can be injected per endpoint.
+Selected with AI_PROVIDER=fake (see providers.py).
+"""
+import asyncio
+import hashlib
+import io
+import json
+import math
+import random
+import re
+import struct
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from ..config import settings
+
+
+class FakeProviderError(Exception):
+    """Injected provider failure"""
+
+
+# endpoint -> (median seconds, log-normal sigma), roughly the live services'
+LATENCIES: Dict[str, Tuple[float, float]] = {
+    "text": (0.9, 0.5),
+    "image": (6.0, 0.35),
+    "tts": (2.5, 0.4),
+    "video": (45.0, 0.25),
+}
+
+IMAGE_SIZE = (576, 1024)  # 9:16; noise PNG of ~1.7 MB, like a real render
+IMAGE_VARIANTS = 8
+PCM_RATE = 24000  # Hz, 16-bit mono, like Gemini TTS
+VIDEO_BYTES_PER_SECOND = 1_200_000
+
+WORDS = (
+    "a giant rubber duck", "an overly dramatic llama", "a confused astronaut", "grandma on rollerblades",
+    "a tiny opera singer", "a haunted vending machine", "three raccoons in a trench coat",
+    "a disco ball", "slow motion", "a marching band", "an exploding cake", "a very serious penguin",
+)
+ACTIONS = (
+    "bursts through the door", "sings at the top of its lungs", "slips on a banana peel",
+    "stares directly into the camera", "dances wildly", "faints dramatically", "takes a bow",
+)
+
+
+def _digest(*parts: str) -> int:
+    raw = hashlib.blake2b("\0".join(parts).encode(), digest_size=8).digest()
+    return int.from_bytes(raw, "big")
+
+
+class FakeProviders:
+    """Shared state of all fakes: seeded randomness, latency, failures and stats"""
+
+    def __init__(self):
+        """Initialize fakes from settings"""
+        self.seed = settings.FAKE_SEED
+        self.latency_scale = settings.FAKE_LATENCY_SCALE
+        endpoints = [e.strip() for e in settings.FAKE_FAILURE_ENDPOINTS.split(",") if e.strip()]
+        self.failure_rates: Dict[str, float] = {
+            endpoint: settings.FAKE_FAILURE_RATE for endpoint in (endpoints or LATENCIES)
+        }
+        self._rngs: Dict[str, random.Random] = {}
+        self._lock = threading.Lock()
+        self._images: Dict[int, bytes] = {}
+        self.stats = {
+            endpoint: {"calls": 0, "failures": 0, "bytes": 0, "seconds": 0.0}
+            for endpoint in LATENCIES
+        }
+
+    def rng(self, *parts: str) -> random.Random:
+        """Generator determined by the seed and the request (same prompt -> same output)"""
+        return random.Random(_digest(str(self.seed), *parts))
+
+    def set_failure_rate(self, rate: float, endpoint: Optional[str] = None):
+        """Inject failures: probability a call raises FakeProviderError (None = all endpoints)"""
+        for name in ([endpoint] if endpoint else LATENCIES):
+            self.failure_rates[name] = rate
+
+    def call(self, endpoint: str, produce: Callable[[], object]):
+        """
+        Simulate one blocking provider call (run it off the event loop)
+
+        Sleeps for a sampled latency, then raises an injected failure or
+        returns produce(). Latency and failure draws come from a per-endpoint
+        generator, so a given sequence of calls replays identically.
+        """
+        latency, fail, stats = self._draw(endpoint)
+        if latency > 0:
+            time.sleep(latency)
+        return self._finish(endpoint, fail, stats, produce)
+
+    async def acall(self, endpoint: str, produce: Callable[[], object]):
+        """call() for async SDK methods: the latency is cancellable"""
+        latency, fail, stats = self._draw(endpoint)
+        if latency > 0:
+            await asyncio.sleep(latency)
+        return self._finish(endpoint, fail, stats, produce)
+
+    def _draw(self, endpoint: str):
+        with self._lock:
+            rng = self._rngs.setdefault(endpoint, self.rng("calls", endpoint))
+            median, sigma = LATENCIES[endpoint]
+            latency = median * math.exp(sigma * rng.gauss(0, 1)) * self.latency_scale
+            fail = rng.random() < self.failure_rates.get(endpoint, 0.0)
+            stats = self.stats[endpoint]
+            stats["calls"] += 1
+            stats["seconds"] += latency
+            if fail:
+                stats["failures"] += 1
+        return latency, fail, stats
+
+    def _finish(self, endpoint: str, fail: bool, stats: dict, produce: Callable[[], object]):
+        if fail:
+            raise FakeProviderError(f"Injected {endpoint} failure")
+
+        result = produce()
+        with self._lock:
+            stats["bytes"] += _payload_size(result)
+        return result
+
+    # Payloads
+
+    def image(self, prompt: str) -> bytes:
+        """PNG of realistic size; a few cached variants keep CPU cost flat"""
+        variant = _digest(str(self.seed), prompt) % IMAGE_VARIANTS
+        if variant not in self._images:
+            from PIL import Image
+            width, height = IMAGE_SIZE
+            pixels = self.rng("image", str(variant)).randbytes(width * height * 3)
+            buffer = io.BytesIO()
+            Image.frombytes("RGB", IMAGE_SIZE, pixels).save(buffer, format="PNG", compress_level=1)
+            self._images[variant] = buffer.getvalue()
+        return self._images[variant]
+
+    def speech(self, text: str) -> bytes:
+        """Raw 24 kHz 16-bit mono PCM, about 2.5 words per second"""
+        seconds = 0.5 + len(text.split()) / 2.5
+        pitch = 180 + self.rng("tts", text).randrange(120)
+        period = [
+            int(3000 * math.sin(2 * math.pi * pitch * i / PCM_RATE))
+            for i in range(PCM_RATE // pitch)
+        ]
+        samples = int(seconds * PCM_RATE)
+        cycle = struct.pack(f"<{len(period)}h", *period)
+        return (cycle * (samples // len(period) + 1))[:samples * 2]
+
+    def video(self, prompt: str) -> bytes:
+        """MP4-looking bytes at a typical Veo bitrate"""
+        size = VIDEO_BYTES_PER_SECOND * settings.VIDEO_DURATION
+        header = b"\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00mp42isom"
+        return header + self.rng("video", prompt).randbytes(size - len(header))
+
+    def text(self, prompt: str) -> str:
+        """Plausible, parseable answer for each prompt the backend sends"""
+        rng = self.rng("text", prompt)
+        for marker, respond in TEXT_RESPONDERS:
+            if marker in prompt:
+                return respond(prompt, rng)
+        return _scene(prompt, rng)
+
+    def get_stats(self) -> dict:
+        """Calls, injected failures, payload bytes and simulated seconds per endpoint"""
+        return {
+            endpoint: {**stats, "seconds": round(stats["seconds"], 2),
+                       "failure_rate": self.failure_rates.get(endpoint, 0.0)}
+            for endpoint, stats in self.stats.items()
+        }
+
+
+def _payload_size(result) -> int:
+    if isinstance(result, (bytes, bytearray)):
+        return len(result)
+    if isinstance(result, str):
+        return len(result.encode())
+    return 0
+
+
+# Text responders (marker found in the prompt -> answer in the expected format)
+
+def _numbered(prompt: str, after: str) -> List[str]:
+    section = prompt.split(after, 1)[-1]
+    return re.findall(r"^\s*(\d+)\. ", section, re.MULTILINE)
+
+
+def _scene(prompt: str, rng: random.Random) -> str:
+    description = prompt.rsplit("Description:", 1)[-1].strip().splitlines()[0] if "Description:" in prompt else ""
+    subject, other = rng.sample(WORDS, 2)
+    scene = f"Cinematic wide shot: {subject} {rng.choice(ACTIONS)} while {other} {rng.choice(ACTIONS)}."
+    if description:
+        scene += f" Everyone shouts: \"{description[:120]}\""
+    return scene
+
+
+def _select_cards(prompt: str, rng: random.Random) -> str:
+    count = len(_numbered(prompt, "Available White Cards:")) or 1
+    pick = int((re.search(r"Select the (\d+)", prompt) or [None, 1])[1])
+    return ", ".join(str(n) for n in rng.sample(range(1, count + 1), min(pick, count)))
+
+
+def _judge(prompt: str, rng: random.Random) -> str:
+    count = len(_numbered(prompt, "Submissions:")) or 1
+    return str(rng.randint(1, count))
+
+
+def _deal_plan(prompt: str, rng: random.Random) -> str:
+    pick = int((re.search(r"picks (\d+) white card", prompt) or [None, 1])[1])
+    plays = []
+    for player_id, hand in re.findall(r"^Player (\S+)\n.*?\nHand:\n((?:\d+\..*\n?)+)", prompt, re.MULTILINE):
+        count = len(re.findall(r"^\d+\.", hand, re.MULTILINE))
+        scene = _scene(prompt + player_id, rng)
+        plays.append({
+            "player_id": player_id,
+            "cards": rng.sample(range(1, count + 1), min(pick, count)),
+            "prompt": scene,
+            "safe_prompt": scene
+        })
+    return json.dumps({"plays": plays})
+
+
+def _judging_plan(prompt: str, rng: random.Random) -> str:
+    count = len(_numbered(prompt, "Submissions:"))
+    ranking = list(range(1, count + 1))
+    rng.shuffle(ranking)
+    wanted = re.search(r"for submissions ([\d, ]+), write", prompt)
+    prompts = []
+    for number in (wanted[1].split(",") if wanted else []):
+        scene = _scene(prompt + number, rng)
+        prompts.append({"submission": int(number), "prompt": scene, "safe_prompt": scene})
+    return json.dumps({"ranking": ranking, "prompts": prompts})
+
+
+def _prompt_batch(prompt: str, rng: random.Random) -> str:
+    items = []
+    for number in _numbered(prompt, "Scenarios:"):
+        scene = _scene(prompt + number, rng)
+        items.append({"n": int(number), "prompt": scene, "safe_prompt": scene})
+    return json.dumps(items)
+
+
+def _sanitize(prompt: str, rng: random.Random) -> str:
+    original = prompt.split("Original prompt:", 1)[-1]
+    return original.split("\n\nReturn ONLY", 1)[0].strip()
+
+
+def _black_cards(prompt: str, rng: random.Random) -> str:
+    count = int((re.search(r"Generate (\d+) NEW black", prompt) or [None, 5])[1])
+    return "\n".join(f"Nobody expected {rng.choice(WORDS)} to bring _ | 1" for _ in range(count))
+
+
+def _white_cards(prompt: str, rng: random.Random) -> str:
+    count = int((re.search(r"Generate (\d+) NEW white", prompt) or [None, 5])[1])
+    return "\n".join(f"{rng.choice(WORDS).capitalize()} {rng.choice(ACTIONS)}" for _ in range(count))
+
+
+TEXT_RESPONDERS: List[Tuple[str, Callable[[str, random.Random], str]]] = [
+    ('{"plays"', _deal_plan),
+    ('{"ranking"', _judging_plan),
+    ("one object per scenario", _prompt_batch),
+    ("funniest white card(s) to complete", _select_cards),
+    ("Pick the winner", _judge),
+    ("Return ONLY the sanitized prompt", _sanitize),
+    ("Answer only YES or NO", lambda prompt, rng: "YES"),
+    ("NEW black cards", _black_cards),
+    ("NEW white cards", _white_cards),
+]
+
+
+# Client-shaped wrappers
+
+class _InlineData:
+    def __init__(self, data: bytes, mime_type: str):
+        self.data = data
+        self.mime_type = mime_type
+
+
+class _Part:
+    def __init__(self, text: Optional[str] = None, inline_data: Optional[_InlineData] = None):
+        self.text = text
+        self.inline_data = inline_data
+
+
+class _Response:
+    """Shape of a GenerateContentResponse: .text and .candidates[0].content.parts"""
+
+    def __init__(self, parts: List[_Part]):
+        content = type("Content", (), {"parts": parts})()
+        self.candidates = [type("Candidate", (), {"content": content})()]
+        self.text = "".join(part.text for part in parts if part.text) or None
+
+
+class FakeTextModel:
+    """Stand-in for google.generativeai.GenerativeModel"""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def generate_content(self, prompt, generation_config=None, **kwargs) -> _Response:
+        text = fake_providers.call("text", lambda: fake_providers.text(str(prompt)))
+        return _Response([_Part(text=text)])
+
+    async def generate_content_async(self, prompt, generation_config=None, **kwargs) -> _Response:
+        text = await fake_providers.acall("text", lambda: fake_providers.text(str(prompt)))
+        return _Response([_Part(text=text)])
+
+
+class _FakeVideo:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.data)
+
+
+class _FakeOperation:
+    """Finished long-running operation (the latency is spent in generate_videos)"""
+
+    def __init__(self, video: _FakeVideo):
+        self.done = True
+        self.name = f"operations/fake-{id(self):x}"
+        generated = type("GeneratedVideo", (), {"video": video})()
+        self.response = type("Response", (), {"generated_videos": [generated]})()
+
+
+class _FakeModels:
+    def generate_content(self, model: str, contents, config=None, **kwargs) -> _Response:
+        prompt = contents if isinstance(contents, str) else " ".join(str(c) for c in contents)
+        if "tts" in model:
+            data = fake_providers.call("tts", lambda: fake_providers.speech(prompt))
+            return _Response([_Part(inline_data=_InlineData(data, f"audio/L16;codec=pcm;rate={PCM_RATE}"))])
+        if "image" in model:
+            data = fake_providers.call("image", lambda: fake_providers.image(prompt))
+            return _Response([_Part(inline_data=_InlineData(data, "image/png"))])
+        return FakeTextModel(model).generate_content(prompt)
+
+    def generate_videos(self, model: str, prompt: str, **kwargs) -> _FakeOperation:
+        data = fake_providers.call("video", lambda: fake_providers.video(prompt))
+        return _FakeOperation(_FakeVideo(data))
+
+
+class _FakeOperations:
+    def get(self, operation):
+        return operation
+
+
+class _FakeFiles:
+    def download(self, file=None, **kwargs):
+        return file.data if file is not None else b""
+
+
+class FakeGenAIClient:
+    """Stand-in for google.genai.Client (models, operations, files)"""
+
+    def __init__(self):
+        self.models = _FakeModels()
+        self.operations = _FakeOperations()
+        self.files = _FakeFiles()
+
+
+# Singleton instance
+fake_providers = FakeProviders()
@@ -0,0 +1,242 @@
+"""
+Feed Index Service
+In-memory (optionally persisted) list of feed videos, built from the storage
+index's keys for the feed bucket, so uploads show up as soon as they are
+registered and deleted objects drop out when the storage index reconciles.
+Pages are served with a per-session seeded shuffle and stable cursors, so
+pages never overlap or repeat.
+"""
+import logging
+import asyncio
+import base64
+import json
+import os
+import random
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from ..config import settings
+from .supabase_http import supabase_http
+from .storage_index_service import storage_index_service
+
+logger = logging.getLogger(__name__)
+
+# Recent index versions kept so open sessions keep paging the list they started on
+MAX_SNAPSHOTS = 8
+
+
+_MASK64 = (1 << 64) - 1
+# Feistel rounds per position (four mix the bits of small domains well)
+FEISTEL_ROUNDS = 4
+
+
+def _mix(seed: int, round_number: int, value: int) -> int:
+    """splitmix64-style hash used as the Feistel round function"""
+    z = (seed * 0x9E3779B97F4A7C15 + round_number * 0xD1B54A32D192ED03 + value) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+def _shuffled_position(seed: int, size: int, position: int) -> int:
+    """
+    Seeded bijection on range(size), computed one position at a time
+
+    A balanced Feistel network permutes the smallest even-bit power-of-two
+    domain covering size (under 4x size); results outside range(size) are
+    fed back through until they land inside (cycle walking), which keeps it
+    a permutation of range(size). A page costs O(limit), not O(size).
+    """
+    if size <= 1:
+        return position
+    half = ((size - 1).bit_length() + 1) // 2
+    mask = (1 << half) - 1
+
+    value = position
+    while True:
+        left, right = value >> half, value & mask
+        for round_number in range(FEISTEL_ROUNDS):
+            left, right = right, left ^ (_mix(seed, round_number, right) & mask)
+        value = (left << half) | right
+        if value < size:
+            return value
+
+
+class FeedIndexService:
+    """Feed video list with seeded, cursor-paginated shuffles"""
+
+    def __init__(self):
+        """Initialize feed index service"""
+        self.bucket = settings.FEED_INDEX_BUCKET
+
+        cache_path = settings.FEED_INDEX_CACHE_PATH
+        if cache_path and not Path(cache_path).is_absolute():
+            # Relative to the backend directory, like data/cards.json
+            cache_path = str(Path(__file__).parent.parent.parent / cache_path)
+        self.cache_path = cache_path
+
+        # Oldest first; rebuilt (never mutated) when the storage index changes
+        self.items: List[Dict] = []
+        # Storage index version self.items was built from (0 = cache file)
+        self.version = 0
+        # version -> items, for cursors of sessions started on older versions
+        self.snapshots: "OrderedDict[int, List[Dict]]" = OrderedDict()
+        self.ids: set = set()
+
+        self._load()
+
+    # Persistence
+
+    def _load(self):
+        """Warm the index from the local cache file, if any"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path) as f:
+                self.items = json.load(f)
+            self.snapshots[0] = self.items
+            self.ids = {item['id'] for item in self.items}
+            logger.info("Loaded %s feed items from %s", len(self.items), self.cache_path)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring feed index cache: %s", e)
+            self.items = []
+
+    def _save(self, items: List[Dict]):
+        if not self.cache_path:
+            return
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(items, f)
+        os.replace(tmp_path, self.cache_path)
+
+    # Building from the storage index
+
+    def _to_item(self, name: str, created_at: str) -> Dict:
+        return {
+            'id': name[:-len('.mp4')],
+            'video_url': supabase_http.public_url(self.bucket, name),
+            'black_card_text': 'Generated Content',
+            'white_card_texts': [],
+            'winner_name': 'Player',
+            'created_at': created_at,
+            'likes': 0,
+            'views': 0
+        }
+
+    async def sync(self) -> bool:
+        """
+        Rebuild the item list if the storage index changed since the last build
+
+        Returns:
+            True if the list was rebuilt
+        """
+        if self.bucket not in storage_index_service.listed and not self.items:
+            # Nothing listed yet (refresh disabled, or first request): list on demand
+            await storage_index_service.refresh(self.bucket)
+
+        version = storage_index_service.versions.get(self.bucket, 0)
+        if self.bucket not in storage_index_service.listed or version == self.version:
+            return False
+
+        known = storage_index_service.known.get(self.bucket, {})
+        videos = sorted(
+            (created_at, name) for name, created_at in known.items() if name.endswith('.mp4')
+        )
+        items = [self._to_item(name, created_at) for created_at, name in videos]
+
+        self.items, self.version = items, version
+        self.ids = {item['id'] for item in items}
+        self.snapshots[version] = items
+        while len(self.snapshots) > MAX_SNAPSHOTS:
+            self.snapshots.popitem(last=False)
+
+        await asyncio.to_thread(self._save, items)
+        logger.info("Feed index rebuilt: %s videos (storage index v%s)", len(items), version)
+        return True
+
+    def contains(self, video_id: str) -> bool:
+        """Whether a video is in the feed (uploads count before the next rebuild)"""
+        return (
+            video_id in self.ids
+            or f"{video_id}.mp4" in storage_index_service.known.get(self.bucket, {})
+        )
+
+    # Pagination
+
+    @staticmethod
+    def encode_cursor(seed: int, version: int, position: int) -> str:
+        raw = json.dumps([seed, version, position], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[int, int, int]:
+        """Raises ValueError on a malformed cursor"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            seed, version, position = json.loads(base64.urlsafe_b64decode(padded))
+            return int(seed), int(version), int(position)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    async def page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        seed: Optional[int] = None,
+        offset: int = 0
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Get one page of the shuffled feed
+
+        A new session (no cursor) fixes a seed and the current index version;
+        the returned cursor carries both, so later pages come from the same
+        shuffle of the same list and never overlap. Videos added or deleted
+        meanwhile show up in the session's next fresh start (a session whose
+        version has aged out of the snapshots continues on the current list).
+
+        Args:
+            limit: Page size
+            cursor: Cursor from the previous page's response
+            seed: Shuffle seed for a new session (random if omitted)
+            offset: Start position for a new session (legacy pagination)
+
+        Returns:
+            Tuple of (items, next cursor or None at the end)
+        """
+        await self.sync()
+
+        if cursor:
+            seed, version, position = self.decode_cursor(cursor)
+            items = self.snapshots.get(version)
+            if items is None:
+                version, items = self.version, self.items
+        else:
+            seed = seed if seed is not None else random.getrandbits(32)
+            version, items = self.version, self.items
+            position = offset
+
+        size = len(items)
+        if position >= size:
+            return [], None
+
+        end = min(position + limit, size)
+        page_items = [items[_shuffled_position(seed, size, i)] for i in range(position, end)]
+
+        next_cursor = self.encode_cursor(seed, version, end) if end < size else None
+        return page_items, next_cursor
+
+    def get_stats(self) -> dict:
+        """Get feed index statistics"""
+        return {
+            "items": len(self.items),
+            "version": self.version,
+            "snapshots": len(self.snapshots),
+            "persisted": bool(self.cache_path)
+        }
+
+
+# Singleton instance
+feed_index_service = FeedIndexService()
@@ -2,9 +2,16 @@
 Feed Service - TikTok-like content feed
 Manages generated content for public viewing
 """
+import logging
+import uuid
 from typing import List, Dict, Optional
 from datetime import datetime
-from .supabase_service import supabase_service
+from .supabase_http import supabase_http
+from .counter_service import counter_service
+from .trending_service import trending_service
+from .dataloader import DataLoader
+
+logger = logging.getLogger(__name__)
 
 
 class FeedService:
@@ -33,93 +40,113 @@ class FeedService:
         """
         try:
             # Query Supabase for videos
-            response = supabase_service.client.table('videos').select(
-                '*'
-            ).order(
-                sort_by, desc=True
-            ).range(
-                offset, offset + limit - 1
-            ).execute()
-            
-            if response.data:
-                return response.data
-            return []
+            return await supabase_http.select(
+                'videos', order=f"{sort_by}.desc", limit=limit, offset=offset
+            )
             
         except Exception as e:
-            print(f"❌ Error fetching feed: {e}")
+            logger.error("Error fetching feed: %s", e)
             return []
     
     async def get_trending(self, limit: int = 10) -> List[Dict]:
-        """Get trending content (most liked/viewed)"""
-        try:
-            response = supabase_service.client.table('videos').select(
-                '*'
-            ).order(
-                'likes', desc=True
-            ).limit(limit).execute()
-            
-            if response.data:
-                return response.data
-            return []
-            
-        except Exception as e:
-            print(f"❌ Error fetching trending: {e}")
-            return []
+        """Get trending content (time-decayed likes/views/comments, served from memory)"""
+        return trending_service.get_top(limit)
     
     async def get_video_by_id(self, video_id: str) -> Optional[Dict]:
         """Get single video by ID"""
         try:
-            response = supabase_service.client.table('videos').select(
-                '*'
-            ).eq('id', video_id).single().execute()
-            
-            return response.data if response.data else None
+            rows = await supabase_http.select('videos', {'id': f"eq.{video_id}"}, limit=1)
+            return rows[0] if rows else None
             
         except Exception as e:
-            print(f"❌ Error fetching video: {e}")
+            logger.error("Error fetching video: %s", e)
             return None
     
     async def like_video(self, video_id: str) -> bool:
-        """Increment video likes"""
-        try:
-            # Get current likes
-            video = await self.get_video_by_id(video_id)
-            if not video:
-                return False
-            
-            current_likes = video.get('likes', 0)
-            
-            # Update likes
-            response = supabase_service.client.table('videos').update({
-                'likes': current_likes + 1
-            }).eq('id', video_id).execute()
-            
-            return bool(response.data)
-            
-        except Exception as e:
-            print(f"❌ Error liking video: {e}")
-            return False
+        """Increment video likes (write-behind, flushed in bulk)"""
+        trending_service.record(video_id, 'like', buffered=True)
+        return counter_service.incr(video_id, 'likes')
     
     async def increment_views(self, video_id: str) -> bool:
-        """Increment video views"""
-        try:
-            # Get current views
-            video = await self.get_video_by_id(video_id)
-            if not video:
-                return False
-            
-            current_views = video.get('views', 0)
-            
-            # Update views
-            response = supabase_service.client.table('videos').update({
-                'views': current_views + 1
-            }).eq('id', video_id).execute()
-            
-            return bool(response.data)
-            
-        except Exception as e:
-            print(f"❌ Error incrementing views: {e}")
-            return False
+        """Increment video views (write-behind, flushed in bulk)"""
+        trending_service.record(video_id, 'view', buffered=True)
+        return counter_service.incr(video_id, 'views')
+    
+    async def hydrate(
+        self,
+        video_ids: List[str],
+        user_id: Optional[str] = None,
+        comments_limit: int = 3
+    ) -> List[Dict]:
+        """
+        Load everything a page of feed cards needs in a constant number of queries
+        
+        One query fetches the videos with their first comments embedded
+        (PostgREST applies the embedded limit per video); one more fetches
+        the user's likes for the page. Both go through per-request
+        dataloaders, so ids are batched into `in.(...)` filters and
+        duplicates are fetched once.
+        
+        Args:
+            video_ids: Video IDs on the page (order is preserved)
+            user_id: Viewer, for 'liked_by_me' (optional)
+            comments_limit: Comments to include per video
+        
+        Returns:
+            One dict per requested ID with 'video' (None for storage-only
+            videos), counts, 'liked_by_me' and 'comments'
+        """
+        async def load_videos(ids: List[str]) -> Dict[str, Dict]:
+            rows = await supabase_http.select(
+                'videos',
+                {
+                    'id': f"in.({','.join(ids)})",
+                    'comments.order': 'created_at.asc',
+                    'comments.limit': str(comments_limit)
+                },
+                columns='*,comments(id,user_id,user_name,text,created_at)'
+            )
+            return {str(row['id']): row for row in rows}
+        
+        async def load_liked(ids: List[str]) -> Dict[str, bool]:
+            rows = await supabase_http.select(
+                'likes',
+                {'user_id': f"eq.{user_id}", 'video_id': f"in.({','.join(ids)})"},
+                columns='video_id'
+            )
+            return {str(row['video_id']): True for row in rows}
+        
+        videos = DataLoader(load_videos)
+        liked = DataLoader(load_liked)
+        
+        # Storage-only feed items aren't UUIDs/table rows; don't let them break the in.() filter
+        valid_ids = []
+        for video_id in video_ids:
+            try:
+                uuid.UUID(video_id)
+                valid_ids.append(video_id)
+            except ValueError:
+                pass
+        
+        rows = dict(zip(valid_ids, await videos.load_many(valid_ids)))
+        liked_ids = dict(zip(valid_ids, await liked.load_many(valid_ids))) if user_id else {}
+        
+        items = []
+        for video_id in video_ids:
+            row = rows.get(video_id) or {}
+            likes = row.get('likes_count') or 0
+            views = row.get('views_count') or 0
+            items.append({
+                'id': video_id,
+                'video': {k: v for k, v in row.items() if k != 'comments'} if row else None,
+                # Include increments still waiting in the write-behind buffer
+                'likes_count': max(likes + counter_service.pending_delta(video_id, 'likes'), 0),
+                'views_count': views + counter_service.pending_delta(video_id, 'views'),
+                'comments_count': row.get('comments_count') or 0,
+                'liked_by_me': bool(liked_ids.get(video_id)),
+                'comments': row.get('comments') or []
+            })
+        return items
     
     async def add_to_feed(self, content: Dict) -> Optional[str]:
         """
@@ -145,20 +172,16 @@ class FeedService:
                 'created_at': datetime.utcnow().isoformat()
             }
             
-            response = supabase_service.client.table('videos').insert(
-                feed_item
-            ).execute()
+            rows = await supabase_http.insert('videos', feed_item)
             
-            if response.data:
-                print(f"✅ Added to feed: {response.data[0].get('id')}")
-                return response.data[0].get('id')
+            if rows:
+                logger.info("Added to feed: %s", rows[0].get('id'))
+                return rows[0].get('id')
             
             return None
             
         except Exception as e:
-            print(f"❌ Error adding to feed: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error adding to feed: %s", e)
             return None
 
 
@@ -1,10 +1,14 @@
+import logging
 from typing import Dict, List, Optional
 from datetime import datetime
 from ..models.game import Game, GameState, Round, Submission
 from ..models.player import Player, AIPlayer, PlayerType
 from .card_service import card_service
+from .combination_key import combination_key
 import random
 
+logger = logging.getLogger(__name__)
+
 
 class GameService:
     """Service for managing game state and logic"""
@@ -136,7 +140,11 @@ class GameService:
             return False
         
         # Create submission
-        submission = Submission(player_id=player_id, card_ids=card_ids)
+        submission = Submission(
+            player_id=player_id,
+            card_ids=card_ids,
+            combo_key=combination_key(black_id=game.current_round.black_card_id, white_ids=card_ids)
+        )
         game.current_round.submissions.append(submission)
         
         # Remove cards from hand
@@ -151,7 +159,37 @@ class GameService:
         
         game.updated_at = datetime.utcnow()
         return True
-    
+
+    def withdraw_submission(self, game_id: str, player_id: str) -> bool:
+        """Withdraw a player's submission while the round is still open"""
+        game = self.get_game(game_id)
+        player = self.get_player(player_id)
+
+        if not game or not player or not game.current_round:
+            return False
+
+        # Submissions are locked once judging starts
+        if game.state != GameState.PLAYING:
+            return False
+
+        submission = next(
+            (sub for sub in game.current_round.submissions if sub.player_id == player_id),
+            None
+        )
+        if not submission:
+            return False
+
+        game.current_round.submissions.remove(submission)
+
+        # Return cards to hand
+        for card_id in submission.card_ids:
+            if card_id in game.white_discard:
+                game.white_discard.remove(card_id)
+            player.hand.append(card_id)
+
+        game.updated_at = datetime.utcnow()
+        return True
+
     def select_winner(self, game_id: str, czar_id: str, winning_submission_index: int) -> bool:
         """Czar selects the winning submission"""
         game = self.get_game(game_id)
@@ -301,6 +339,7 @@ class GameService:
                         ],
                         "image_url": str(sub.image_url) if hasattr(sub, 'image_url') and sub.image_url else None,
                         "audio_url": str(sub.audio_url) if hasattr(sub, 'audio_url') and sub.audio_url else None,
+                        "audio_duration": sub.audio_duration,
                         "video_url": str(sub.video_url) if hasattr(sub, 'video_url') and sub.video_url else None
                     }
                     for sub in game.current_round.submissions
@@ -330,7 +369,7 @@ class GameService:
         try:
             json.dumps(result)
         except Exception as e:
-            print(f"❌ Game state not JSON serializable: {e}")
+            logger.error("Game state not JSON serializable: %s", e)
             return {}
         
         return result
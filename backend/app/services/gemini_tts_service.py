@@ -2,14 +2,21 @@
 Gemini Text-to-Speech Service
 Generates humorous narration for card combinations
 """
+import logging
 import asyncio
-import uuid
-import os
-import wave
-from typing import Optional
-from google import genai
+import hashlib
+from typing import Dict, Optional
 from google.genai import types
 from ..config import settings
+from . import providers
+from .metrics import metrics
+from .ttl_cache import TTLCache
+from ..workers.media import encode_audio
+from .media_worker_pool import media_worker_pool
+from .narration_index_service import narration_index_service
+from .resilience_service import resilience_service, CircuitOpenError
+
+logger = logging.getLogger(__name__)
 
 
 class GeminiTTSService:
@@ -17,14 +24,24 @@ class GeminiTTSService:
     
     def __init__(self):
         """Initialize Gemini TTS service"""
-        pass
+        self.model = "gemini-2.5-flash-preview-tts"
+        self.audio_format = settings.NARRATION_AUDIO_FORMAT
+        self.audio_bitrate = settings.NARRATION_AUDIO_BITRATE
+        
+        # narration key -> artifact dict (content-addressed, never changes);
+        # LRU-bounded, misses fall through to the narration index
+        self._artifacts = TTLCache(
+            "narrations",
+            max_entries=settings.NARRATION_MEMORY_MAX_ENTRIES,
+            max_bytes=0,
+            default_ttl=None
+        )
+        # narration key -> generation shared by concurrent callers
+        self._in_flight: Dict[str, asyncio.Future] = {}
     
     def _get_client(self):
-        """Get or create GenAI client with fresh API key"""
-        api_key = settings.GEMINI_API_KEY
-        if api_key:
-            os.environ['GOOGLE_API_KEY'] = api_key
-        return genai.Client(api_key=api_key)
+        """GenAI client (fresh API key each time, or the fake provider)"""
+        return providers.genai_client()
     
     async def generate_narration_script(
         self,
@@ -48,121 +65,179 @@ class GeminiTTSService:
         for white_card in white_cards:
             result = result.replace('_', white_card, 1)
         
-        print(f"📝 Narration script: {result}")
+        logger.debug("Narration script: %s", result)
         return result
     
-    def _save_wave_file(self, filename: str, pcm: bytes, channels: int = 1, rate: int = 24000, sample_width: int = 2):
-        """Save PCM audio data as WAV file"""
-        with wave.open(filename, "wb") as wf:
-            wf.setnchannels(channels)
-            wf.setsampwidth(sample_width)
-            wf.setframerate(rate)
-            wf.writeframes(pcm)
+    STYLE_INSTRUCTIONS = {
+        "humorous": "Say this in a fun, humorous way with good comedic timing",
+        "dramatic": "Say this in an over-the-top dramatic, movie-trailer way",
+        "sarcastic": "Say this in a dry, sarcastic, deadpan way"
+    }
     
-    async def generate_speech(
+    def narration_key(self, text: str, voice: str, style: str) -> str:
+        """Content address for a narration: identical (script, voice, style, model) share one artifact"""
+        digest = hashlib.sha256(f"{self.model}\0{voice}\0{style}\0{text}".encode()).hexdigest()
+        return digest[:32]
+    
+    @metrics.timed("tts.synthesize")
+    async def synthesize(
         self,
         text: str,
-        voice: str = "Kore"  # Cheerful voice, good for humor
-    ) -> Optional[str]:
+        voice: str = "Kore",  # Cheerful voice, good for humor
+        style: str = "humorous"
+    ) -> Optional[dict]:
         """
-        Generate speech audio from text using Gemini TTS
+        Generate (or reuse) compressed narration audio for a script
+        
+        Identical (script, voice, style) combinations are synthesized and
+        uploaded once and recorded in the persistent narration index, so
+        repeat plays (even across restarts) skip TTS; concurrent requests
+        for the same narration share a single generation.
         
         Args:
             text: Text to convert to speech
             voice: Voice name to use (Kore, Puck, Charon, Aoede)
+            style: Narration style (humorous, dramatic, sarcastic)
         
         Returns:
-            Audio file URL or None if generation fails
+            Dict with 'audio_url', 'content_type' and 'duration_seconds',
+            or None if generation fails
         """
-        if not settings.GEMINI_API_KEY:
-            print("⚠️  No Gemini API key configured")
+        key = self.narration_key(text, voice, style)
+        
+        artifact = self._artifacts.get(key)
+        if artifact:
+            logger.info("Reusing narration %s", key)
+            return artifact
+        
+        if key not in self._in_flight:
+            self._in_flight[key] = asyncio.ensure_future(self._lookup_or_synthesize(key, text, voice, style))
+        
+        try:
+            artifact = await asyncio.shield(self._in_flight[key])
+        finally:
+            if key in self._in_flight and self._in_flight[key].done():
+                del self._in_flight[key]
+        
+        if artifact:
+            self._artifacts.set(key, artifact)
+        return artifact
+    
+    async def _lookup_or_synthesize(self, key: str, text: str, voice: str, style: str) -> Optional[dict]:
+        """Check the persistent narration index before calling TTS"""
+        artifact = await narration_index_service.get(key)
+        if artifact:
+            logger.info("Narration %s found in index", key)
+            return artifact
+        
+        artifact = await self._synthesize(key, text, voice, style)
+        if artifact:
+            await narration_index_service.put(key, text, voice, style, self.model, artifact)
+        return artifact
+    
+    async def _synthesize(self, key: str, text: str, voice: str, style: str) -> Optional[dict]:
+        """Call Gemini TTS, compress the PCM off the event loop and upload it"""
+        if not providers.ai_configured():
+            logger.warning("No Gemini API key configured")
             return None
         
         try:
             client = self._get_client()
             
-            print(f"🎙️  Generating speech with Gemini TTS")
-            print(f"📝 Text: {text[:100]}...")
-            print(f"🎤 Voice: {voice}")
+            logger.info("Generating speech with Gemini TTS")
+            logger.debug("Text: %s...", text[:100])
+            logger.debug("Voice: %s", voice)
             
-            # Generate speech using Gemini TTS with humorous tone
+            instruction = self.STYLE_INSTRUCTIONS.get(style, self.STYLE_INSTRUCTIONS["humorous"])
+            
+            # Generate speech using Gemini TTS in the requested style
             loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: client.models.generate_content(
-                    model="gemini-2.5-flash-preview-tts",
-                    contents=f"Say this in a fun, humorous way with good comedic timing: {text}",
-                    config=types.GenerateContentConfig(
-                        response_modalities=["AUDIO"],
-                        speech_config=types.SpeechConfig(
-                            voice_config=types.VoiceConfig(
-                                prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                                    voice_name=voice
+            response = await resilience_service.call(
+                "gemini_tts",
+                lambda: loop.run_in_executor(
+                    None,
+                    lambda: client.models.generate_content(
+                        model=self.model,
+                        contents=f"{instruction}: {text}",
+                        config=types.GenerateContentConfig(
+                            response_modalities=["AUDIO"],
+                            speech_config=types.SpeechConfig(
+                                voice_config=types.VoiceConfig(
+                                    prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                                        voice_name=voice
+                                    )
                                 )
                             )
                         )
                     )
-                )
+                ),
+                timeout=settings.TTS_CALL_TIMEOUT
             )
             
-            # Extract audio data from response
+            # Extract audio data from response (raw 24 kHz 16-bit mono PCM)
             audio_data = response.candidates[0].content.parts[0].inline_data.data
             
-            # Save audio to temp file
-            audio_id = str(uuid.uuid4())
-            temp_path = f"/tmp/{audio_id}.wav"
-            
-            # Save as WAV file
-            self._save_wave_file(temp_path, audio_data)
-            
-            print(f"✅ Audio generated: {temp_path}")
+            # Compress in the media worker pool (off the event loop)
+            encoded = await media_worker_pool.run(
+                encode_audio, audio_data, self.audio_format, self.audio_bitrate
+            )
             
-            # Upload to Supabase
-            audio_url = await self._upload_to_supabase(temp_path)
+            logger.info("Audio generated: %s.%s (%s → %s bytes, %.1fs)",
+                        key, encoded['extension'], len(audio_data), len(encoded['data']), encoded['duration_seconds'])
             
-            # Clean up temp file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+            # Upload to Supabase under its content address
+            audio_url = await self._upload_to_supabase(
+                encoded['data'],
+                f"{key}.{encoded['extension']}",
+                encoded['content_type']
+            )
+            if not audio_url:
+                return None
             
-            return audio_url
+            return {
+                'audio_url': audio_url,
+                'content_type': encoded['content_type'],
+                'duration_seconds': round(encoded['duration_seconds'], 2)
+            }
                 
+        except CircuitOpenError as e:
+            logger.info("Skipping narration: %s", e)
+            return None
         except Exception as e:
-            print(f"❌ Gemini TTS error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Gemini TTS error: %s", e)
             return None
     
-    async def _upload_to_supabase(self, audio_path: str) -> Optional[str]:
-        """Upload audio file to Supabase storage"""
+    async def generate_speech(
+        self,
+        text: str,
+        voice: str = "Kore",  # Cheerful voice, good for humor
+        style: str = "humorous"
+    ) -> Optional[str]:
+        """
+        Generate speech audio from text using Gemini TTS
+        
+        Args:
+            text: Text to convert to speech
+            voice: Voice name to use (Kore, Puck, Charon, Aoede)
+            style: Narration style
+        
+        Returns:
+            Audio file URL or None if generation fails
+        """
+        artifact = await self.synthesize(text, voice, style)
+        return artifact['audio_url'] if artifact else None
+    
+    async def _upload_to_supabase(self, audio_data: bytes, file_name: str, content_type: str = "audio/wav") -> Optional[str]:
+        """Upload encoded audio bytes to Supabase storage"""
+        from ..services.supabase_http import supabase_http
+        
         try:
-            from ..services.supabase_service import supabase_service
-            
-            with open(audio_path, 'rb') as f:
-                audio_data = f.read()
-            
-            # Upload to Supabase audio bucket
-            audio_id = os.path.basename(audio_path)
-            file_path = audio_id
-            
-            try:
-                result = supabase_service.client.storage.from_('audio').upload(
-                    file_path,
-                    audio_data,
-                    file_options={"content-type": "audio/wav"}
-                )
-                print(f"📤 Audio upload result: {result}")
-            except Exception as upload_error:
-                print(f"⚠️  Audio upload exception: {upload_error}")
-                # File might already exist, try to get URL anyway
-                pass
-            
-            # Always try to get public URL
-            public_url = supabase_service.client.storage.from_('audio').get_public_url(file_path)
-            print(f"✅ Audio URL from Supabase: {public_url}")
+            # Content-addressed: same name means same audio, so overwrite is safe
+            public_url = await supabase_http.upload('audio', file_name, audio_data, content_type, upsert=True)
+            logger.info("Audio URL from Supabase: %s", public_url)
             return public_url
-                
         except Exception as e:
-            print(f"⚠️  Supabase upload error: {e}")
+            logger.warning("Supabase upload error: %s", e)
             return None
     
     async def generate_narrated_script(
@@ -180,17 +255,20 @@ class GeminiTTSService:
             style: Narration style
         
         Returns:
-            Dict with 'script' and 'audio_url' keys
+            Dict with 'script', 'audio_url', 'content_type' and
+            'duration_seconds' keys (audio fields None on failure)
         """
         # Generate script
         script = await self.generate_narration_script(black_card_text, white_cards, style)
         
-        # Generate audio
-        audio_url = await self.generate_speech(script)
+        # Generate audio (reused if this exact narration already exists)
+        artifact = await self.synthesize(script, style=style)
         
         return {
             'script': script,
-            'audio_url': audio_url
+            'audio_url': artifact['audio_url'] if artifact else None,
+            'content_type': artifact['content_type'] if artifact else None,
+            'duration_seconds': artifact['duration_seconds'] if artifact else None
         }
 
 
@@ -0,0 +1,423 @@
+"""
+Job Queue Service
+Durable SQLite-backed queue for long-running background work (batch content
+generation). Jobs survive client disconnects and server restarts; workers
+drain the queue with retries, idempotency keys and progress events.
+"""
+import logging
+import asyncio
+import contextlib
+import json
+import os
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+JobHandler = Callable[[Dict[str, Any], Callable[[float, str], Awaitable[None]]], Awaitable[Any]]
+JobListener = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class JobLeaseLost(Exception):
+    """The job's lease expired and another worker took it over"""
+
+
+class JobQueueService:
+    """SQLite job queue with in-process async workers"""
+
+    STATUSES = ("queued", "running", "succeeded", "failed")
+
+    def __init__(self, db_path: Optional[str] = None):
+        """Initialize job queue service"""
+        db_path = Path(db_path or settings.JOB_QUEUE_DB_PATH)
+        if not db_path.is_absolute():
+            # Relative to the backend directory, like data/cards.json
+            db_path = Path(__file__).parent.parent.parent / db_path
+        self.db_path = str(db_path)
+        self.max_attempts = settings.JOB_MAX_ATTEMPTS
+        self.lease_seconds = settings.JOB_LEASE_SECONDS
+        self.poll_interval = settings.JOB_POLL_INTERVAL
+
+        self.handlers: Dict[str, JobHandler] = {}
+        self.listeners: List[JobListener] = []
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        # job_id -> updated_at last delivered to listeners, for watched jobs
+        self.watched: Dict[str, float] = {}
+        self._relay: Optional[asyncio.Task] = None
+
+        self._init_db()
+
+    # Storage
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Short-lived autocommit connection (safe to use from worker threads)"""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        """Create the jobs table if needed"""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    idempotency_key TEXT UNIQUE,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    progress REAL NOT NULL DEFAULT 0,
+                    message TEXT,
+                    result TEXT,
+                    error TEXT,
+                    run_after REAL NOT NULL,
+                    locked_by TEXT,
+                    locked_until REAL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_run_after ON jobs(status, run_after)")
+
+    def _row_to_job(self, row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job['payload'] = json.loads(job['payload'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def _insert(self, kind: str, payload: Dict, idempotency_key: Optional[str]) -> Dict[str, Any]:
+        now = time.time()
+        job_id = str(uuid.uuid4())
+
+        with self._connect() as conn:
+            if idempotency_key:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE idempotency_key = ?", (idempotency_key,)
+                ).fetchone()
+                if row:
+                    return self._row_to_job(row)
+
+            try:
+                conn.execute(
+                    """INSERT INTO jobs (id, kind, payload, status, idempotency_key, max_attempts,
+                                         run_after, created_at, updated_at)
+                       VALUES (?, ?, ?, 'queued', ?, ?, ?, ?, ?)""",
+                    (job_id, kind, json.dumps(payload), idempotency_key,
+                     self.max_attempts, now, now, now)
+                )
+            except sqlite3.IntegrityError:
+                # Lost a race with another request using the same key
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE idempotency_key = ?", (idempotency_key,)
+                ).fetchone()
+                return self._row_to_job(row)
+
+            return self._row_to_job(
+                conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            )
+
+    def _claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the next runnable job (or one whose lease expired)
+
+        The job's locked_by is set to a fresh lease token; later updates only
+        apply while the worker still holds it.
+        """
+        now = time.time()
+        lease = f"{self.worker_id}:{uuid.uuid4().hex[:8]}"
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Expired leases on the last attempt: the worker died running
+                # the job (OOM, crash) - don't hand it to the next victim
+                conn.execute(
+                    """UPDATE jobs SET status = 'failed', locked_by = NULL, locked_until = NULL,
+                                       error = 'Worker lost while running the job', updated_at = ?
+                       WHERE status = 'running' AND locked_until < ? AND attempts >= max_attempts""",
+                    (now, now)
+                )
+                row = conn.execute(
+                    """SELECT id FROM jobs
+                       WHERE (status = 'queued' AND run_after <= ?)
+                          OR (status = 'running' AND locked_until < ? AND attempts < max_attempts)
+                       ORDER BY created_at
+                       LIMIT 1""",
+                    (now, now)
+                ).fetchone()
+
+                if not row:
+                    conn.execute("COMMIT")
+                    return None
+
+                conn.execute(
+                    """UPDATE jobs SET status = 'running', attempts = attempts + 1,
+                                       locked_by = ?, locked_until = ?, updated_at = ?
+                       WHERE id = ?""",
+                    (lease, now + self.lease_seconds, now, row['id'])
+                )
+                job = conn.execute("SELECT * FROM jobs WHERE id = ?", (row['id'],)).fetchone()
+                conn.execute("COMMIT")
+                return self._row_to_job(job)
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _update(self, job_id: str, lease: str, **fields) -> Optional[Dict[str, Any]]:
+        """Update a job held under `lease` (None if the lease was lost)"""
+        fields['updated_at'] = time.time()
+        if 'result' in fields:
+            fields['result'] = json.dumps(fields['result'], default=str)
+
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            changed = conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND locked_by = ?",
+                (*fields.values(), job_id, lease)
+            ).rowcount
+            if not changed:
+                return None
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def _get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def _get_many(self, job_ids: List[str]) -> List[Dict[str, Any]]:
+        placeholders = ", ".join("?" for _ in job_ids)
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT * FROM jobs WHERE id IN ({placeholders})", job_ids).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    # Public API
+
+    def register_handler(self, kind: str, handler: JobHandler):
+        """Register the coroutine that runs jobs of a given kind"""
+        self.handlers[kind] = handler
+
+    def add_listener(self, listener: JobListener):
+        """Register a coroutine called with the job on every status/progress change"""
+        self.listeners.append(listener)
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Add a job to the queue
+
+        Args:
+            kind: Registered job kind (e.g. 'content.batch')
+            payload: JSON-serializable job input
+            idempotency_key: Optional key; re-submitting it returns the existing job
+
+        Returns:
+            The job record
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        job = await asyncio.to_thread(self._insert, kind, payload, idempotency_key)
+        if self._wakeup:
+            self._wakeup.set()
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job record by ID"""
+        return await asyncio.to_thread(self._get, job_id)
+
+    def watch(self, job: Dict[str, Any]):
+        """
+        Relay a job's changes to listeners even when another process runs it
+
+        Worker processes (run_worker.py) can't call this process's listeners,
+        so watched jobs are re-read every JOB_POLL_INTERVAL and changes are
+        delivered until the job succeeds or fails.
+        """
+        if job['status'] in ('succeeded', 'failed'):
+            return
+        self.watched[job['id']] = max(self.watched.get(job['id'], 0.0), job['updated_at'])
+        if self._relay is None:
+            self._relay = asyncio.create_task(self._relay_loop())
+
+    async def _relay_loop(self):
+        try:
+            while self.watched:
+                await asyncio.sleep(self.poll_interval)
+                try:
+                    jobs = await asyncio.to_thread(self._get_many, list(self.watched))
+                except sqlite3.Error as e:
+                    logger.warning("Job relay read failed: %s", e)
+                    continue
+
+                for job in jobs:
+                    if job['updated_at'] > self.watched.get(job['id'], float('inf')):
+                        await self._notify(job)
+                for job_id in set(self.watched) - {job['id'] for job in jobs}:
+                    del self.watched[job_id]
+        finally:
+            self._relay = None
+
+    def public_view(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Job fields safe to return to clients"""
+        return {
+            'job_id': job['id'],
+            'kind': job['kind'],
+            'status': job['status'],
+            'progress': job['progress'],
+            'message': job['message'],
+            'attempts': job['attempts'],
+            'result': job['result'],
+            'error': job['error'],
+            'created_at': job['created_at'],
+            'updated_at': job['updated_at']
+        }
+
+    # Workers
+
+    async def start(self, worker_count: int):
+        """Start in-process worker tasks"""
+        if self._workers or worker_count <= 0:
+            return
+
+        self._wakeup = asyncio.Event()
+        self._workers = [
+            asyncio.create_task(self._worker_loop(i)) for i in range(worker_count)
+        ]
+        logger.info("Started %s job workers (%s)", worker_count, self.worker_id)
+
+    async def stop(self):
+        """Stop worker tasks; running jobs are re-queued when their lease expires"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _worker_loop(self, index: int):
+        while True:
+            try:
+                job = await asyncio.to_thread(self._claim)
+            except Exception as e:
+                logger.error("Job worker %s failed to claim a job: %s", index, e)
+                job = None
+
+            if not job:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._run(job)
+
+    async def _run(self, job: Dict[str, Any]):
+        job_id = job['id']
+        lease = job['locked_by']
+        handler = self.handlers.get(job['kind'])
+        await self._notify(job)
+
+        if not handler:
+            await self._finish(job, status='failed', error=f"No handler for job kind {job['kind']}")
+            return
+
+        async def report_progress(progress: float, message: str = ""):
+            updated = await asyncio.to_thread(
+                self._update, job_id, lease,
+                progress=max(0.0, min(1.0, progress)),
+                message=message,
+                locked_until=time.time() + self.lease_seconds
+            )
+            if not updated:
+                raise JobLeaseLost(job_id)
+            await self._notify(updated)
+
+        work = asyncio.create_task(handler(job['payload'], report_progress))
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, lease, work))
+        try:
+            logger.info("Running job %s (%s, attempt %s)", job_id, job['kind'], job['attempts'])
+            result = await work
+            await self._finish(job, status='succeeded', progress=1.0, result=result, error=None)
+            logger.info("Job %s succeeded", job_id)
+
+        except JobLeaseLost:
+            # The new owner runs and finishes the job
+            logger.warning("Job %s lost its lease, abandoning this run", job_id)
+        except asyncio.CancelledError:
+            # The heartbeat only ends early when it cancelled the handler
+            if heartbeat.done():
+                logger.warning("Job %s lost its lease, abandoning this run", job_id)
+                return
+            raise
+        except Exception as e:
+            if job['attempts'] < job['max_attempts']:
+                delay = settings.JOB_RETRY_BASE_DELAY * (2 ** (job['attempts'] - 1))
+                logger.warning("Job %s failed (attempt %s), retrying in %ss: %s", job_id, job['attempts'], delay, e)
+                await self._finish(
+                    job, status='queued', error=str(e), run_after=time.time() + delay
+                )
+            else:
+                logger.error("Job %s failed permanently: %s", job_id, e)
+                await self._finish(job, status='failed', error=str(e))
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job_id: str, lease: str, work: asyncio.Task):
+        """Extend the lease while the handler runs; stop the handler if it was taken over"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                held = await asyncio.to_thread(
+                    self._update, job_id, lease, locked_until=time.time() + self.lease_seconds
+                )
+            except sqlite3.Error as e:
+                logger.warning("Job %s heartbeat failed: %s", job_id, e)
+                continue
+            if not held:
+                work.cancel()
+                return
+
+    async def _finish(self, job: Dict[str, Any], **fields):
+        fields.update(locked_by=None, locked_until=None)
+        updated = await asyncio.to_thread(self._update, job['id'], job['locked_by'], **fields)
+        if updated:
+            await self._notify(updated)
+        else:
+            logger.warning("Job %s lost its lease before finishing; result discarded", job['id'])
+
+    async def _notify(self, job: Dict[str, Any]):
+        if job['id'] in self.watched:
+            if job['status'] in ('succeeded', 'failed'):
+                del self.watched[job['id']]
+            else:
+                self.watched[job['id']] = job['updated_at']
+        for listener in self.listeners:
+            try:
+                await listener(self.public_view(job))
+            except Exception as e:
+                logger.warning("Job listener error: %s", e)
+
+
+# Singleton instance
+job_queue_service = JobQueueService()
@@ -0,0 +1,313 @@
+"""
+Local Supabase
+Filesystem-backed stand-in for the Supabase Storage and PostgREST APIs,
+served to supabase_http through an httpx MockTransport, so the backend runs
+without a Supabase project (STORAGE_PROVIDER=local).
+
+Objects live under <LOCAL_STORAGE_PATH>/buckets/<bucket>/<path>; table rows
+are kept in memory and written to <LOCAL_STORAGE_PATH>/tables/<table>.json.
+Supports the subset of PostgREST the backend uses (eq/neq/in/gt/gte/lt/lte/is
+filters, order, limit, offset, one-level embeds) and its RPC functions.
+"""
+import asyncio
+import json
+import mimetypes
+import os
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote
+import httpx
+from ..config import settings
+
+
+def _error(status: int, message: str) -> httpx.Response:
+    return httpx.Response(status, json={"statusCode": str(status), "error": message, "message": message})
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class LocalSupabase:
+    """Storage buckets on disk plus in-memory tables with JSON snapshots"""
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: Directory for buckets and table snapshots
+        """
+        path = Path(root)
+        if not path.is_absolute():
+            # Relative to the backend directory, like data/cards.json
+            path = Path(__file__).parent.parent.parent / path
+        self.root = path
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = asyncio.Lock()
+
+    # Storage
+
+    def object_path(self, bucket: str, key: str) -> Optional[Path]:
+        """Local file for an object (None if the key escapes its bucket)"""
+        bucket_dir = (self.root / "buckets" / bucket).resolve()
+        path = (bucket_dir / key).resolve()
+        return path if bucket_dir in path.parents else None
+
+    def _write(self, path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def _list(self, bucket: str, prefix: str, limit: int, offset: int, sort_by: Dict[str, str]) -> List[Dict]:
+        directory = self.object_path(bucket, prefix) if prefix else (self.root / "buckets" / bucket)
+        if directory is None or not directory.is_dir():
+            return []
+
+        entries = []
+        for entry in os.scandir(directory):
+            if not entry.is_file() or entry.name.startswith("."):
+                continue
+            stat = entry.stat()
+            created = datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat()
+            entries.append({
+                "name": entry.name,
+                "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"{bucket}/{prefix}{entry.name}")),
+                "created_at": created,
+                "updated_at": created,
+                "metadata": {
+                    "size": stat.st_size,
+                    "mimetype": mimetypes.guess_type(entry.name)[0] or "application/octet-stream"
+                }
+            })
+
+        column = sort_by.get("column", "name")
+        entries.sort(key=lambda e: e.get(column) or "", reverse=sort_by.get("order") == "desc")
+        return entries[offset:offset + limit]
+
+    async def _storage(self, request: httpx.Request, path: str) -> httpx.Response:
+        if path.startswith("object/list/"):
+            body = json.loads(await request.aread() or b"{}")
+            entries = await asyncio.to_thread(
+                self._list,
+                unquote(path[len("object/list/"):]),
+                body.get("prefix", ""),
+                int(body.get("limit", 100)),
+                int(body.get("offset", 0)),
+                body.get("sortBy") or {}
+            )
+            return httpx.Response(200, json=entries)
+
+        if path.startswith("object/public/"):
+            path = "object/" + path[len("object/public/"):]
+        if not path.startswith("object/"):
+            return _error(404, "not_found")
+
+        bucket, _, key = path[len("object/"):].partition("/")
+        file_path = self.object_path(unquote(bucket), unquote(key))
+        if file_path is None or not key:
+            return _error(400, "Invalid key")
+
+        if request.method in ("POST", "PUT"):
+            upsert = request.headers.get("x-upsert") == "true" or request.method == "PUT"
+            if not upsert and file_path.exists():
+                return _error(400, "Duplicate")
+            await asyncio.to_thread(self._write, file_path, await request.aread())
+            return httpx.Response(200, json={"Key": f"{unquote(bucket)}/{unquote(key)}"})
+
+        if not file_path.is_file():
+            return _error(404, "not_found") if request.method != "HEAD" else httpx.Response(404)
+
+        content_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+        if request.method == "HEAD":
+            return httpx.Response(200, headers={
+                "Content-Type": content_type,
+                "Content-Length": str(file_path.stat().st_size)
+            })
+        if request.method == "DELETE":
+            await asyncio.to_thread(file_path.unlink)
+            return httpx.Response(200, json={"message": "Successfully deleted"})
+        return httpx.Response(200, content=await asyncio.to_thread(file_path.read_bytes),
+                              headers={"Content-Type": content_type})
+
+    # PostgREST
+
+    def _table(self, name: str) -> List[Dict[str, Any]]:
+        if name not in self.tables:
+            snapshot = self.root / "tables" / f"{name}.json"
+            self.tables[name] = json.loads(snapshot.read_text()) if snapshot.exists() else []
+        return self.tables[name]
+
+    async def _save(self, name: str):
+        data = json.dumps(self.tables[name], default=str).encode()
+        await asyncio.to_thread(self._write, self.root / "tables" / f"{name}.json", data)
+
+    @staticmethod
+    def _matches(row: Dict[str, Any], column: str, condition: str) -> bool:
+        op, _, value = condition.partition(".")
+        actual = row.get(column)
+        if op == "is":
+            return actual is None if value == "null" else str(actual).lower() == value
+        if op == "in":
+            return str(actual) in {v.strip().strip('"') for v in value.strip("()").split(",")}
+        if op in ("eq", "neq"):
+            return (str(actual).lower() == value.lower() if isinstance(actual, bool)
+                    else str(actual) == value) == (op == "eq")
+        if actual is None:
+            return False
+        try:
+            actual, value = float(actual), float(value)
+        except (TypeError, ValueError):
+            actual = str(actual)
+        return {"gt": actual > value, "gte": actual >= value,
+                "lt": actual < value, "lte": actual <= value}.get(op, False)
+
+    def _filter(self, rows: List[Dict], params: Dict[str, str]) -> List[Dict]:
+        for column, condition in params.items():
+            if column in ("select", "order", "limit", "offset") or "." in column:
+                continue
+            rows = [row for row in rows if self._matches(row, column, condition)]
+        return rows
+
+    @staticmethod
+    def _order(rows: List[Dict], order: Optional[str]) -> List[Dict]:
+        for clause in reversed((order or "").split(",")):
+            if clause:
+                column, _, direction = clause.partition(".")
+                rows = sorted(rows, key=lambda r: (r.get(column) is None, r.get(column) or ""),
+                              reverse=direction.startswith("desc"))
+        return rows
+
+    def _select(self, table: str, params: Dict[str, str]) -> List[Dict]:
+        rows = self._order(self._filter(self._table(table), params), params.get("order"))
+        offset = int(params.get("offset", 0))
+        limit = int(params["limit"]) if "limit" in params else None
+        rows = rows[offset:offset + limit if limit is not None else None]
+
+        # Columns, with one-level embeds like "*,comments(id,text)"
+        columns, embeds, depth, current = [], {}, 0, ""
+        for char in params.get("select", "*") + ",":
+            if char == "," and depth == 0:
+                if "(" in current:
+                    name, _, inner = current.partition("(")
+                    embeds[name] = inner.rstrip(")").split(",")
+                elif current:
+                    columns.append(current)
+                current = ""
+                continue
+            depth += (char == "(") - (char == ")")
+            current += char
+
+        foreign_key = f"{table[:-1] if table.endswith('s') else table}_id"
+        result = []
+        for row in rows:
+            out = dict(row) if "*" in columns else {c: row.get(c) for c in columns}
+            for name, embed_columns in embeds.items():
+                children = [c for c in self._table(name) if str(c.get(foreign_key)) == str(row.get("id"))]
+                children = self._order(children, params.get(f"{name}.order"))
+                if f"{name}.limit" in params:
+                    children = children[:int(params[f"{name}.limit"])]
+                out[name] = [
+                    dict(c) if "*" in embed_columns else {k: c.get(k) for k in embed_columns}
+                    for c in children
+                ]
+            result.append(out)
+        return result
+
+    async def _rpc(self, function: str, args: Dict[str, Any]) -> httpx.Response:
+        videos = self._table("videos")
+        by_id = {str(v.get("id")): v for v in videos}
+
+        if function == "toggle_like":
+            video_id, user_id = str(args.get("p_video_id")), args.get("p_user_id")
+            likes = self._table("likes")
+            existing = [like for like in likes if str(like["video_id"]) == video_id and like["user_id"] == user_id]
+            video = by_id.get(video_id)
+            if existing:
+                likes.remove(existing[0])
+                if video:
+                    video["likes_count"] = max((video.get("likes_count") or 0) - 1, 0)
+            else:
+                likes.append({"id": str(uuid.uuid4()), "video_id": video_id, "user_id": user_id, "created_at": _now()})
+                if video:
+                    video["likes_count"] = (video.get("likes_count") or 0) + 1
+            await self._save("likes")
+            await self._save("videos")
+            return httpx.Response(200, json=[{
+                "is_liked": not existing,
+                "new_count": video.get("likes_count") if video else None
+            }])
+
+        if function == "increment_comments":
+            video = by_id.get(str(args.get("video_id")))
+            if video:
+                video["comments_count"] = (video.get("comments_count") or 0) + 1
+                await self._save("videos")
+            return httpx.Response(204)
+
+        if function == "apply_video_counters":
+            for delta in args.get("deltas") or []:
+                video = by_id.get(str(delta.get("id")))
+                if video:
+                    video["likes_count"] = max((video.get("likes_count") or 0) + (delta.get("likes") or 0), 0)
+                    video["views_count"] = (video.get("views_count") or 0) + (delta.get("views") or 0)
+            await self._save("videos")
+            return httpx.Response(204)
+
+        return _error(404, f"Could not find the function {function}")
+
+    async def _rest(self, request: httpx.Request, path: str) -> httpx.Response:
+        params = dict(request.url.params)
+        body = await request.aread()
+
+        async with self._lock:
+            if path.startswith("rpc/"):
+                return await self._rpc(path[len("rpc/"):], json.loads(body or b"{}"))
+
+            table = path
+            if request.method == "GET":
+                return httpx.Response(200, json=self._select(table, params))
+
+            if request.method == "POST":
+                new_rows = json.loads(body)
+                new_rows = new_rows if isinstance(new_rows, list) else [new_rows]
+                for row in new_rows:
+                    row.setdefault("id", str(uuid.uuid4()))
+                    row.setdefault("created_at", _now())
+                self._table(table).extend(new_rows)
+                await self._save(table)
+                return httpx.Response(201, json=new_rows)
+
+            matched = self._filter(self._table(table), params)
+            if request.method == "PATCH":
+                values = json.loads(body)
+                for row in matched:
+                    row.update(values)
+                await self._save(table)
+                return httpx.Response(200, json=matched)
+
+            if request.method == "DELETE":
+                ids = {id(row) for row in matched}
+                self.tables[table] = [row for row in self._table(table) if id(row) not in ids]
+                await self._save(table)
+                return httpx.Response(204)
+
+        return _error(405, "Method not allowed")
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        """Route one Supabase API request"""
+        path = request.url.path
+        if path.startswith("/storage/v1/"):
+            return await self._storage(request, path[len("/storage/v1/"):])
+        if path.startswith("/rest/v1/"):
+            return await self._rest(request, unquote(path[len("/rest/v1/"):]))
+        return _error(404, "not_found")
+
+    def transport(self) -> httpx.MockTransport:
+        """httpx transport answering Supabase requests from this store"""
+        return httpx.MockTransport(self.handle)
+
+
+# Singleton instance
+local_supabase = LocalSupabase(settings.LOCAL_STORAGE_PATH)
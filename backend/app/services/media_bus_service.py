@@ -0,0 +1,263 @@
+"""
+Media Bus Service
+Readiness notifications for generated media: generators publish when an
+artifact lands in storage, waiters wake up immediately instead of polling.
+Events are delivered in-process and, through a small SQLite log, to every
+worker process on the host.
+"""
+import logging
+import asyncio
+import contextlib
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Marks a failed artifact so waiters can stop early
+FAILED = ""
+
+
+class MediaBusService:
+    """Publish/await media readiness events"""
+
+    RETENTION_SECONDS = 3600
+    PRUNE_INTERVAL = 60.0  # Seconds between deletes of expired events
+    MAX_READY = 1000
+
+    def __init__(self, db_path: Optional[str] = None):
+        """Initialize media bus service"""
+        db_path = Path(db_path or settings.MEDIA_BUS_DB_PATH)
+        if not db_path.is_absolute():
+            # Relative to the backend directory, like data/cards.json
+            db_path = Path(__file__).parent.parent.parent / db_path
+        self.db_path = str(db_path)
+        self.poll_interval = settings.MEDIA_BUS_POLL_INTERVAL
+
+        # key -> url (FAILED for failures) of recently published artifacts
+        self.ready: Dict[str, str] = {}
+        self.waiters: Dict[str, List[asyncio.Future]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._last_event_id = 0
+        self._last_prune = 0.0
+        self._listener: Optional[asyncio.Task] = None
+
+        self.stats = {"published": 0, "delivered": 0, "fallback_hits": 0, "timeouts": 0}
+
+        self._init_db()
+
+    # Cross-process event log
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Short-lived autocommit connection (safe to use from worker threads)"""
+        conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        """Create the events table and skip events published before startup"""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS media_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self._last_event_id = conn.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM media_events"
+            ).fetchone()[0]
+        self._prune()
+
+    def _append(self, key: str, url: str):
+        """Write one event (blocking - never call on the event loop)"""
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO media_events (key, url, created_at) VALUES (?, ?, ?)",
+                    (key, url, time.time())
+                )
+            if time.time() - self._last_prune > self.PRUNE_INTERVAL:
+                self._prune()
+        except sqlite3.Error as e:
+            logger.warning("Media bus write failed: %s", e)
+
+    def _prune(self):
+        """Drop events older than the retention window (blocking)"""
+        self._last_prune = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM media_events WHERE created_at < ?",
+                (self._last_prune - self.RETENTION_SECONDS,)
+            )
+
+    def _read_since(self, event_id: int) -> list:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT id, key, url FROM media_events WHERE id > ? ORDER BY id",
+                (event_id,)
+            ).fetchall()
+
+    async def _listen(self):
+        """Pick up events published by other worker processes while anyone is waiting"""
+        while self.waiters:
+            try:
+                rows = await asyncio.to_thread(self._read_since, self._last_event_id)
+            except sqlite3.Error as e:
+                logger.warning("Media bus read failed: %s", e)
+                rows = []
+
+            for event_id, key, url in rows:
+                self._last_event_id = max(self._last_event_id, event_id)
+                self._resolve(key, url)
+
+            if time.time() - self._last_prune > self.PRUNE_INTERVAL:
+                try:
+                    await asyncio.to_thread(self._prune)
+                except sqlite3.Error as e:
+                    logger.warning("Media bus prune failed: %s", e)
+
+            await asyncio.sleep(self.poll_interval)
+        self._listener = None
+
+    # Publishing
+
+    def publish(self, key: str, url: Optional[str]):
+        """
+        Announce that an artifact is ready (or failed)
+
+        Safe to call from the event loop or from executor threads (e.g. the
+        Veo download/upload thread).
+
+        Args:
+            key: Artifact key, e.g. 'video:<uuid>'
+            url: Public URL, or None if generation failed
+        """
+        url = url or FAILED
+        self.stats["published"] += 1
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is not None:
+            # The SQLite write can wait on a lock: keep it off the event loop
+            running.run_in_executor(None, self._append, key, url)
+        else:
+            self._append(key, url)
+
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            self._remember(key, url)
+            return
+
+        if running is loop:
+            self._resolve(key, url)
+        else:
+            loop.call_soon_threadsafe(self._resolve, key, url)
+
+    def _remember(self, key: str, url: str):
+        self.ready[key] = url
+        while len(self.ready) > self.MAX_READY:
+            del self.ready[next(iter(self.ready))]
+
+    def _resolve(self, key: str, url: str):
+        self._remember(key, url)
+        for future in self.waiters.pop(key, []):
+            if not future.done():
+                future.set_result(url)
+                self.stats["delivered"] += 1
+
+    # Waiting
+
+    async def wait(
+        self,
+        key: str,
+        timeout: float,
+        fallback: Optional[Callable[[], Awaitable[Optional[str]]]] = None,
+        fallback_delay: float = 10.0,
+        fallback_max_delay: float = 60.0
+    ) -> Optional[str]:
+        """
+        Wait for an artifact to be published
+
+        Args:
+            key: Artifact key, e.g. 'video:<uuid>'
+            timeout: Deadline in seconds
+            fallback: Optional coroutine that checks storage directly (for
+                artifacts published by a producer that doesn't use the bus)
+            fallback_delay: First fallback check, doubled after each miss
+            fallback_max_delay: Cap on the fallback interval
+
+        Returns:
+            The artifact URL, or None on failure/timeout
+        """
+        if key in self.ready:
+            return self.ready[key] or None
+
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        future = loop.create_future()
+        self.waiters.setdefault(key, []).append(future)
+
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+        poller = asyncio.create_task(
+            self._poll_fallback(future, fallback, fallback_delay, fallback_max_delay)
+        ) if fallback else None
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout) or None
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            return None
+        finally:
+            if poller:
+                poller.cancel()
+            pending = self.waiters.get(key)
+            if pending and future in pending:
+                pending.remove(future)
+                if not pending:
+                    del self.waiters[key]
+
+    async def _poll_fallback(self, future: asyncio.Future, fallback, delay: float, max_delay: float):
+        """Slow exponential-backoff check in case the publish never reaches us"""
+        while not future.done():
+            await asyncio.sleep(delay)
+            try:
+                url = await fallback()
+            except Exception as e:
+                logger.warning("Media readiness fallback check failed: %s", e)
+                url = None
+
+            if url and not future.done():
+                self.stats["fallback_hits"] += 1
+                future.set_result(url)
+                return
+            delay = min(delay * 2, max_delay)
+
+    def get_stats(self) -> dict:
+        """Get media bus statistics"""
+        return {
+            **self.stats,
+            "waiting": sum(len(futures) for futures in self.waiters.values())
+        }
+
+
+# Singleton instance
+media_bus_service = MediaBusService()
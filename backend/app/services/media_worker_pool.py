@@ -0,0 +1,113 @@
+"""
+Media Worker Pool
+Dedicated process pool for CPU-bound media work (image decode/resize/encode,
+audio encoding) so the event loop never runs pixel or audio code
+"""
+import logging
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MediaWorkerPool:
+    """Bounded ProcessPoolExecutor tier for media post-processing"""
+
+    def __init__(self):
+        """Initialize media worker pool (processes start lazily)"""
+        self.processes = settings.MEDIA_WORKER_PROCESSES
+        self.queue_size = settings.MEDIA_WORKER_QUEUE_SIZE
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "waited_for_slot": 0,
+            "restarts": 0
+        }
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self._executor is None and self.processes > 0:
+            # spawn: don't fork a process holding the event loop, sockets and SDK clients
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _replace_broken(self, executor: ProcessPoolExecutor):
+        """Drop a broken executor so the next call spawns fresh workers"""
+        if self._executor is executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self.stats["restarts"] += 1
+            logger.warning("Media worker pool broken (a worker died); restarting it")
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.queue_size)
+        return self._slots
+
+    async def run(self, func: Callable, *args) -> Any:
+        """
+        Run a media function from app.workers in the pool
+
+        At most MEDIA_WORKER_QUEUE_SIZE jobs are queued or running; further
+        callers wait for a slot (backpressure) instead of growing the queue.
+        With MEDIA_WORKER_PROCESSES=0 work runs in a thread instead. If a
+        worker dies (BrokenProcessPool) the pool is rebuilt and the job
+        retried once.
+        """
+        slots = self._get_slots()
+        if slots.locked():
+            self.stats["waited_for_slot"] += 1
+
+        async with slots:
+            self.stats["submitted"] += 1
+            loop = asyncio.get_running_loop()
+            try:
+                executor = self._get_executor()
+                try:
+                    result = await loop.run_in_executor(executor, func, *args)
+                except BrokenProcessPool:
+                    self._replace_broken(executor)
+                    result = await loop.run_in_executor(self._get_executor(), func, *args)
+            except Exception:
+                self.stats["failed"] += 1
+                raise
+            self.stats["completed"] += 1
+            return result
+
+    async def start(self):
+        """Spawn the worker processes ahead of the first real job"""
+        if self.processes <= 0:
+            return
+
+        from ..workers.media import warm_up
+
+        await asyncio.gather(*(self.run(warm_up) for _ in range(self.processes)))
+        logger.info("Media worker pool ready (%s processes)", self.processes)
+
+    def shutdown(self):
+        """Stop worker processes"""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> dict:
+        """Get media worker pool statistics"""
+        return {
+            **self.stats,
+            "processes": self.processes,
+            "queue_size": self.queue_size
+        }
+
+
+# Singleton instance
+media_worker_pool = MediaWorkerPool()
@@ -2,14 +2,27 @@
 Gemini Image Generation Service
 Generates images in parallel for card combinations using Gemini 2.5 Flash Image
 """
+import logging
 import asyncio
 import uuid
-import os
 from typing import Optional, List
-from google import genai
-from PIL import Image
-from io import BytesIO
 from ..config import settings
+from . import providers
+from .metrics import metrics
+from ..workers.media import make_image_variants, process_image, sniff_image_mime
+from .media_worker_pool import media_worker_pool
+from .resilience_service import resilience_service, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+IMAGE_EXTENSIONS = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/webp": "webp",
+    "image/gif": "gif",
+    "image/avif": "avif"
+}
 
 
 class NanobananaService:
@@ -17,15 +30,22 @@ class NanobananaService:
     
     def __init__(self):
         """Initialize Gemini image generation service"""
-        pass
+        configured = {t.strip() for t in settings.IMAGE_PASSTHROUGH_TYPES.split(",") if t.strip()}
+        # Only formats we can sniff and name can be uploaded as-is
+        unsupported = configured - IMAGE_EXTENSIONS.keys()
+        if unsupported:
+            logger.warning(
+                "Ignoring IMAGE_PASSTHROUGH_TYPES %s (supported: %s); they will be converted to PNG",
+                ", ".join(sorted(unsupported)), ", ".join(IMAGE_EXTENSIONS)
+            )
+        self.passthrough_types = configured & IMAGE_EXTENSIONS.keys()
+        self.transcode_webp = settings.IMAGE_TRANSCODE_WEBP
     
     def _get_client(self):
-        """Get or create GenAI client with fresh API key"""
-        api_key = settings.GEMINI_API_KEY
-        if api_key:
-            os.environ['GOOGLE_API_KEY'] = api_key
-        return genai.Client(api_key=api_key)
+        """GenAI client (fresh API key each time, or the fake provider)"""
+        return providers.genai_client()
     
+    @metrics.timed("image.generate")
     async def generate_image(
         self,
         prompt: str,
@@ -41,99 +61,97 @@ class NanobananaService:
         Returns:
             Image URL or None if generation fails
         """
-        if not settings.GEMINI_API_KEY:
-            print("⚠️  No Gemini API key configured")
+        if not providers.ai_configured():
+            logger.warning("No Gemini API key configured")
             return None
         
         try:
             client = self._get_client()
             
-            print(f"🎨 Generating image with Gemini 2.5 Flash Image")
-            print(f"📝 Prompt: {prompt[:100]}...")
+            logger.info("Generating image with Gemini 2.5 Flash Image")
+            logger.debug("Prompt: %s...", prompt[:100])
             
             # Generate image using Gemini 2.5 Flash Image
             # Run in executor since the SDK call is synchronous
             loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: client.models.generate_content(
-                    model="gemini-2.5-flash-image",
-                    contents=[prompt]
-                )
+            response = await resilience_service.call(
+                "gemini_image",
+                lambda: loop.run_in_executor(
+                    None,
+                    lambda: client.models.generate_content(
+                        model="gemini-2.5-flash-image",
+                        contents=[prompt]
+                    )
+                ),
+                timeout=settings.IMAGE_CALL_TIMEOUT
             )
             
             # Process response - extract image from inline data
             image_saved = False
             for part in response.candidates[0].content.parts:
                 if part.text is not None:
-                    print(f"📄 Text response: {part.text}")
+                    logger.debug("Text response: %s", part.text)
                 elif part.inline_data is not None:
-                    # Convert inline data to PIL Image
-                    image = Image.open(BytesIO(part.inline_data.data))
-                    
-                    # Save to temp file
                     image_id = str(uuid.uuid4())
-                    temp_path = f"/tmp/{image_id}.png"
-                    image.save(temp_path)
-                    
-                    print(f"✅ Image generated: {temp_path} (size: {image.size})")
-                    
-                    # Upload to Supabase for persistence
-                    uploaded_url = await self._upload_to_supabase_from_file(temp_path)
-                    
-                    # Clean up temp file
-                    if os.path.exists(temp_path):
-                        os.remove(temp_path)
+                    uploaded_url = await self._store_image(part.inline_data.data, image_id)
                     
                     image_saved = True
                     return uploaded_url
             
             if not image_saved:
-                print(f"❌ No image data found in response")
+                logger.error("No image data found in response")
             return None
                 
+        except CircuitOpenError as e:
+            logger.info("Skipping image generation: %s", e)
+            return None
         except Exception as e:
-            print(f"❌ Gemini image generation error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Gemini image generation error: %s", e)
             return None
     
-    async def _upload_to_supabase_from_file(self, file_path: str) -> Optional[str]:
-        """Upload image file to Supabase storage"""
+    async def _store_image(self, data: bytes, image_id: str) -> Optional[str]:
+        """
+        Upload generated image bytes, transcoding only when needed
+        
+        Images already in an accepted format are uploaded straight from the
+        response buffer - no decode, encode or temp files.
+        
+        Returns:
+            Public URL of the stored image
+        """
+        mime = sniff_image_mime(data)
+        
+        if self.transcode_webp:
+            # Compact WebP + small preview, encoded in the media worker pool
+            variants = await media_worker_pool.run(make_image_variants, data)
+            full, preview = variants['full'], variants['preview']
+            logger.info("Image generated: %s.webp (%s → %s bytes, preview %s bytes)",
+                        image_id, len(data), len(full['data']), len(preview['data']))
+            await self._upload_to_supabase(preview['data'], f"{image_id}_preview.webp", "image/webp")
+            return await self._upload_to_supabase(full['data'], f"{image_id}.webp", "image/webp")
+        
+        if mime in self.passthrough_types:
+            logger.info("Image generated: %s (%s, %s bytes, uploaded as-is)", image_id, mime, len(data))
+            return await self._upload_to_supabase(data, f"{image_id}.{IMAGE_EXTENSIONS[mime]}", mime)
+        
+        # Unknown/unaccepted format: normalize to PNG off the event loop
+        image = await media_worker_pool.run(process_image, data, "PNG")
+        logger.info("Image generated: %s.png (converted from %s, size: %sx%s)",
+                    image_id, mime or 'unknown', image['width'], image['height'])
+        return await self._upload_to_supabase(image['data'], f"{image_id}.png", "image/png")
+    
+    async def _upload_to_supabase(self, image_data: bytes, file_name: str, content_type: str = "image/png") -> Optional[str]:
+        """Upload encoded image bytes to Supabase storage"""
+        from ..services.supabase_http import supabase_http
+        
         try:
-            from ..services.supabase_service import supabase_service
-            
-            # Read the image file
-            with open(file_path, 'rb') as f:
-                image_data = f.read()
-            
-            # Upload to Supabase images bucket
-            image_id = os.path.basename(file_path)
-            storage_path = image_id
-            
-            try:
-                result = supabase_service.client.storage.from_('images').upload(
-                    storage_path,
-                    image_data,
-                    file_options={"content-type": "image/png"}
-                )
-                print(f"📤 Upload result: {result}")
-            except Exception as upload_error:
-                print(f"⚠️  Upload exception: {upload_error}")
-                # File might already exist, try to get URL anyway
-                pass
-            
-            # Always try to get public URL
-            public_url = supabase_service.client.storage.from_('images').get_public_url(storage_path)
-            # Remove trailing ? if present
-            if public_url and public_url.endswith('?'):
-                public_url = public_url[:-1]
-            print(f"✅ Image URL from Supabase: {public_url}")
+            public_url = await supabase_http.upload('images', file_name, image_data, content_type)
+            logger.info("Image URL from Supabase: %s", public_url)
             return public_url
-                
         except Exception as e:
-            print(f"⚠️  Supabase upload error: {e}")
-            return None
+            logger.warning("Supabase upload error: %s", e)
+            # File might already exist - the URL is still valid
+            return supabase_http.public_url('images', file_name)
     
     async def generate_images_parallel(
         self,
@@ -150,7 +168,7 @@ class NanobananaService:
         Returns:
             List of image URLs (None for failed generations)
         """
-        print(f"🎨 Generating {len(prompts)} images in parallel...")
+        logger.info("Generating %s images in parallel...", len(prompts))
         
         # Create tasks for parallel generation
         tasks = [
@@ -165,13 +183,13 @@ class NanobananaService:
         image_urls = []
         for i, result in enumerate(results):
             if isinstance(result, Exception):
-                print(f"❌ Image {i+1} generation failed: {result}")
+                logger.error("Image %s generation failed: %s", i+1, result)
                 image_urls.append(None)
             else:
                 image_urls.append(result)
         
         successful = sum(1 for url in image_urls if url is not None)
-        print(f"✅ Generated {successful}/{len(prompts)} images successfully")
+        logger.info("Generated %s/%s images successfully", successful, len(prompts))
         
         return image_urls
     
@@ -0,0 +1,128 @@
+"""
+Narration Index Service
+Persistent map from narration key (hash of script, voice, style and TTS model)
+to the uploaded audio, so repeat card combinations skip TTS entirely
+"""
+import logging
+import asyncio
+import contextlib
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class NarrationIndexService:
+    """SQLite-backed narration artifact index shared by all workers on a host"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """Initialize narration index service"""
+        db_path = Path(db_path or settings.NARRATION_INDEX_DB_PATH)
+        if not db_path.is_absolute():
+            # Relative to the backend directory, like data/cards.json
+            db_path = Path(__file__).parent.parent.parent / db_path
+        self.db_path = str(db_path)
+
+        self.stats = {"hits": 0, "misses": 0, "stored": 0}
+        self._init_db()
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Short-lived autocommit connection (safe to use from worker threads)"""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        """Create the narrations table if needed"""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS narrations (
+                    key TEXT PRIMARY KEY,
+                    script TEXT NOT NULL,
+                    voice TEXT NOT NULL,
+                    style TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    audio_url TEXT NOT NULL,
+                    content_type TEXT,
+                    duration_seconds REAL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                )
+            """)
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT audio_url, content_type, duration_seconds FROM narrations WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE narrations SET hits = hits + 1, last_used_at = ? WHERE key = ?",
+                    (time.time(), key)
+                )
+        return dict(row) if row else None
+
+    def _store(self, key: str, script: str, voice: str, style: str, model: str, artifact: Dict[str, Any]):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO narrations
+                   (key, script, voice, style, model, audio_url, content_type,
+                    duration_seconds, created_at, last_used_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (key, script, voice, style, model, artifact['audio_url'],
+                 artifact.get('content_type'), artifact.get('duration_seconds'), now, now)
+            )
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a stored narration
+
+        Args:
+            key: Narration key from GeminiTTSService.narration_key
+
+        Returns:
+            Dict with 'audio_url', 'content_type' and 'duration_seconds',
+            or None if this narration was never synthesized
+        """
+        try:
+            artifact = await asyncio.to_thread(self._lookup, key)
+        except sqlite3.Error as e:
+            logger.warning("Narration index lookup failed: %s", e)
+            return None
+
+        self.stats["hits" if artifact else "misses"] += 1
+        return artifact
+
+    async def put(self, key: str, script: str, voice: str, style: str, model: str, artifact: Dict[str, Any]):
+        """Record a synthesized narration"""
+        try:
+            await asyncio.to_thread(self._store, key, script, voice, style, model, artifact)
+            self.stats["stored"] += 1
+        except sqlite3.Error as e:
+            logger.warning("Narration index write failed: %s", e)
+
+    def get_stats(self) -> dict:
+        """Get narration index statistics"""
+        with self._connect() as conn:
+            size = conn.execute("SELECT COUNT(*) FROM narrations").fetchone()[0]
+        return {**self.stats, "size": size}
+
+
+# Singleton instance
+narration_index_service = NarrationIndexService()
@@ -0,0 +1,158 @@
+"""
+Pipeline DAG
+Small dependency-aware stage executor for content generation:
+declared stages, shared intermediate artifacts, per-stage concurrency
+and rate limits, and per-stage timing output
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class RateLimiter:
+    """Spaces stage starts to stay under a requests-per-minute quota"""
+
+    def __init__(self, per_minute: int = 0, burst: int = 1):
+        """
+        Args:
+            per_minute: Allowed starts per minute (0 = unlimited)
+            burst: Starts allowed back-to-back before spacing kicks in
+        """
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self.burst = max(1, burst)
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until the next start slot is available"""
+        if not self.interval:
+            return
+
+        async with self._lock:
+            now = time.monotonic()
+            earliest = now - (self.burst - 1) * self.interval
+            slot = max(earliest, self._next_slot)
+            self._next_slot = slot + self.interval
+            wait = slot - now
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class StageLimit:
+    """Concurrency + rate limit for one kind of stage, shared across DAG runs"""
+
+    def __init__(self, concurrency: int = 0, per_minute: int = 0, burst: Optional[int] = None):
+        self._semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+        # By default let a full set of concurrent slots start back-to-back
+        self._rate = RateLimiter(per_minute, burst or concurrency or 1)
+
+    async def __aenter__(self):
+        if self._semaphore:
+            await self._semaphore.acquire()
+        try:
+            await self._rate.acquire()
+        except BaseException:
+            if self._semaphore:
+                self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._semaphore:
+            self._semaphore.release()
+        return False
+
+
+@dataclass
+class Stage:
+    """A pipeline step: receives the artifacts of earlier stages, returns its own"""
+    name: str
+    func: Callable[[Dict[str, Any]], Awaitable[Any]]
+    depends_on: List[str] = field(default_factory=list)
+    limit: Optional[StageLimit] = None
+
+
+class PipelineDAG:
+    """Runs stages as soon as their dependencies are done"""
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = {stage.name: stage for stage in stages}
+
+        for stage in stages:
+            for dep in stage.depends_on:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        """Reject dependency cycles up front instead of deadlocking at run time"""
+        visiting, done = set(), set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through stage '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    async def run(self, artifacts: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], Dict[str, Dict[str, float]]]:
+        """
+        Execute all stages
+
+        Args:
+            artifacts: Initial inputs available to every stage
+
+        Returns:
+            Tuple of (artifacts by stage name, timings by stage name).
+            Timings hold 'queued' (seconds waiting on deps/limits) and
+            'duration' (seconds running).
+
+        Raises:
+            The first stage exception; remaining stages are cancelled
+        """
+        artifacts = dict(artifacts or {})
+        timings: Dict[str, Dict[str, float]] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+        start = time.monotonic()
+
+        async def run_stage(stage: Stage):
+            if stage.depends_on:
+                await asyncio.gather(*(tasks[dep] for dep in stage.depends_on))
+
+            if stage.limit:
+                async with stage.limit:
+                    began = time.monotonic()
+                    result = await stage.func(artifacts)
+            else:
+                began = time.monotonic()
+                result = await stage.func(artifacts)
+
+            artifacts[stage.name] = result
+            timings[stage.name] = {
+                'queued': round(began - start, 3),
+                'duration': round(time.monotonic() - began, 3)
+            }
+            return result
+
+        for name, stage in self.stages.items():
+            tasks[name] = asyncio.create_task(run_stage(stage))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        timings['total'] = {'queued': 0.0, 'duration': round(time.monotonic() - start, 3)}
+        return artifacts, timings
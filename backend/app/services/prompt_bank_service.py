@@ -0,0 +1,139 @@
+"""
+Prompt Bank Service
+Precomputed (prompt, safe prompt) pairs for card combinations, built offline
+by build_prompt_bank.py and loaded at startup. Submissions whose combination
+is banked need no LLM calls before image and video generation.
+"""
+import logging
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from ..config import settings
+from .metrics import metrics
+from .ttl_cache import TTLCache
+from .ai_service import ai_service
+from .content_moderator import content_moderator
+
+logger = logging.getLogger(__name__)
+
+
+class PromptBankService:
+    """Combination key -> (prompt, safe_prompt) lookup table"""
+
+    def __init__(self):
+        """Initialize prompt bank and load the table, if any"""
+        path = settings.PROMPT_BANK_PATH
+        if path and not Path(path).is_absolute():
+            # Relative to the backend directory, like data/cards.json
+            path = str(Path(__file__).parent.parent.parent / path)
+        self.path = path
+
+        # combination key -> [prompt, safe_prompt], built offline
+        self.prompts: Dict[str, List[str]] = {}
+        # Same, banked at runtime (round plans); bounded, memory only
+        self.live = TTLCache(
+            "prompt_bank_live",
+            max_entries=settings.PROMPT_BANK_LIVE_MAX_ENTRIES,
+            max_bytes=0,
+            default_ttl=settings.PROMPT_BANK_LIVE_TTL_SECONDS
+        )
+        self.meta: Dict = {}
+        self.stats = {"hits": 0, "misses": 0}
+        self.load()
+
+    # Persistence
+
+    def load(self):
+        """(Re)load the table from disk"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            self.prompts = data["prompts"]
+            self.meta = {k: v for k, v in data.items() if k != "prompts"}
+            logger.info("Loaded %s banked prompts from %s", len(self.prompts), self.path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring prompt bank: %s", e)
+            self.prompts, self.meta = {}, {}
+
+    def save(self):
+        """Write the table to disk atomically"""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.meta.update({"model": ai_service.model_name, "updated_at": int(time.time())})
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({**self.meta, "prompts": self.prompts}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    # Lookup
+
+    def put(self, combo_key: str, prompt: str, safe_prompt: str):
+        """Bank the prompts for a combination (persisted by save())"""
+        self.prompts[combo_key] = [prompt, safe_prompt]
+
+    def remember(self, combo_key: str, prompt: str, safe_prompt: str):
+        """Bank prompts produced at runtime, in the bounded live table"""
+        self.live.set(combo_key, [prompt, safe_prompt])
+
+    def has(self, combo_key: Optional[str]) -> bool:
+        """Whether a combination is banked (does not count as a lookup)"""
+        return bool(combo_key) and (combo_key in self.prompts or combo_key in self.live)
+
+    def get(self, combo_key: Optional[str]) -> Optional[Tuple[str, str]]:
+        """(prompt, safe_prompt) for a combination, or None if not banked"""
+        entry = (self.prompts.get(combo_key) or self.live.get(combo_key)) if combo_key else None
+        if entry:
+            self.stats["hits"] += 1
+            return entry[0], entry[1]
+        self.stats["misses"] += 1
+        return None
+
+    @metrics.timed("prompt.resolve")
+    async def resolve(
+        self,
+        black_card_text: str,
+        white_texts: List[str],
+        combo_key: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """
+        Prompt and moderated prompt for a submission
+
+        Args:
+            black_card_text: The black card text
+            white_texts: White card texts
+            combo_key: Submission's combination key (enables the bank lookup)
+
+        Returns:
+            (prompt, safe_prompt) - from the bank when available, otherwise
+            generated and moderated live
+        """
+        banked = self.get(combo_key)
+        if banked:
+            return banked
+
+        prompt = await ai_service.generate_video_prompt(black_card_text, white_texts)
+        safe_prompt = await content_moderator.sanitize_prompt(prompt)
+        return prompt, safe_prompt
+
+    def get_stats(self) -> dict:
+        """Get prompt bank statistics"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_ratio": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            "banked": len(self.prompts),
+            "live": len(self.live),
+            "model": self.meta.get("model"),
+            "updated_at": self.meta.get("updated_at")
+        }
+
+
+# Singleton instance
+prompt_bank_service = PromptBankService()
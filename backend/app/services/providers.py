@@ -0,0 +1,86 @@
+"""
+Providers
+Chooses the live or fake backends for AI and storage from config, so the
+services ask here for their clients instead of constructing them:
+- AI_PROVIDER=fake: Gemini text models and the google.genai client (images,
+  TTS, Veo) are replaced by the deterministic fakes in fake_providers.py
+- STORAGE_PROVIDER=local: supabase_http talks to local_supabase.py through an
+  in-process transport; public URLs are served by app/routes/local_storage.py
+"""
+import os
+from typing import Optional
+import httpx
+import google.generativeai as generativeai
+from google import genai
+from ..config import settings
+from .fake_providers import fake_providers, FakeGenAIClient, FakeTextModel
+from .local_supabase import local_supabase
+
+
+def fake_ai() -> bool:
+    return settings.AI_PROVIDER == "fake"
+
+
+def local_storage() -> bool:
+    return settings.STORAGE_PROVIDER == "local"
+
+
+def ai_configured() -> bool:
+    """Whether AI calls can be made (fake provider, or a Gemini API key)"""
+    return fake_ai() or bool(settings.GEMINI_API_KEY)
+
+
+def genai_client():
+    """
+    Client for image, TTS and Veo calls
+
+    Returns:
+        FakeGenAIClient, or a google.genai Client with a fresh API key
+    """
+    if fake_ai():
+        return _fake_client
+    api_key = settings.GEMINI_API_KEY
+    if api_key:
+        os.environ['GOOGLE_API_KEY'] = api_key
+    return genai.Client(api_key=api_key)
+
+
+def text_model(model_name: str):
+    """
+    Text model for google.generativeai-style generate_content calls
+
+    Args:
+        model_name: Gemini model name
+
+    Returns:
+        FakeTextModel, GenerativeModel, or None when no API key is configured
+    """
+    if fake_ai():
+        return FakeTextModel(model_name)
+    if not settings.GEMINI_API_KEY:
+        return None
+    generativeai.configure(api_key=settings.GEMINI_API_KEY)
+    return generativeai.GenerativeModel(model_name)
+
+
+def supabase_url() -> str:
+    """Base URL for Supabase requests and public object URLs"""
+    if local_storage():
+        return f"http://localhost:{settings.PORT}"
+    return settings.SUPABASE_URL.rstrip("/")
+
+
+def supabase_transport() -> Optional[httpx.AsyncBaseTransport]:
+    """Transport for supabase_http (None = real network)"""
+    return local_supabase.transport() if local_storage() else None
+
+
+def get_stats() -> dict:
+    """Selected providers, plus fake call counts when the fakes are in use"""
+    stats = {"ai": settings.AI_PROVIDER, "storage": settings.STORAGE_PROVIDER}
+    if fake_ai():
+        stats["fake"] = fake_providers.get_stats()
+    return stats
+
+
+_fake_client = FakeGenAIClient()
@@ -0,0 +1,235 @@
+"""
+Resilience Service
+Per-endpoint circuit breakers for the external AI providers, with timeouts
+and latency-based hedging for small text calls. While a breaker is open,
+calls fail immediately with CircuitOpenError so callers drop straight to
+their local fallbacks instead of each waiting out a timeout.
+"""
+import logging
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+from ..config import settings
+from .metrics import provider_seconds
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose breaker is open"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} circuit open (retry in {retry_in:.0f}s)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open probe -> closed"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float, window: int = 200):
+        """
+        Args:
+            name: Endpoint name (used in stats and errors)
+            failure_threshold: Consecutive failures that open the breaker
+            reset_seconds: How long the breaker stays open before a probe
+            window: Number of recent successful latencies kept for percentiles
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.stats = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "timeouts": 0,
+            "rejected": 0,
+            "opened": 0,
+            "hedged": 0,
+            "hedge_wins": 0
+        }
+
+    def allow(self) -> bool:
+        """Whether a call may go through now (claims the probe when half-open)"""
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+            self.state = self.HALF_OPEN
+            self._probing = False
+
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def retry_in(self) -> float:
+        return max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+
+    def release_probe(self):
+        """Give the half-open probe back when a call was abandoned"""
+        self._probing = False
+
+    def record_success(self, latency: float):
+        self.stats["successes"] += 1
+        self.latencies.append(latency)
+        self.failures = 0
+        if self.state != self.CLOSED:
+            logger.info("%s circuit closed", self.name)
+        self.state = self.CLOSED
+        self._probing = False
+
+    def record_failure(self):
+        self.stats["failures"] += 1
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (
+            self.state == self.CLOSED and self.failures >= self.failure_threshold
+        ):
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._probing = False
+            self.stats["opened"] += 1
+            logger.warning("%s circuit opened after %s failures", self.name, self.failures)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency percentile of recent successes (None until enough samples)"""
+        if len(self.latencies) < settings.HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def get_stats(self) -> dict:
+        p50, p95 = self.percentile(50), self.percentile(95)
+        return {
+            **self.stats,
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "retry_in": round(self.retry_in(), 1) if self.state == self.OPEN else 0,
+            "p50_ms": round(p50 * 1000) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000) if p95 is not None else None
+        }
+
+
+class ResilienceService:
+    """Registry of breakers plus guarded/hedged call helpers"""
+
+    def __init__(self):
+        """Initialize resilience service"""
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        """Get (or create) the breaker for an endpoint"""
+        if name not in self.breakers:
+            self.breakers[name] = CircuitBreaker(
+                name,
+                settings.CIRCUIT_FAILURE_THRESHOLD,
+                settings.CIRCUIT_RESET_SECONDS
+            )
+        return self.breakers[name]
+
+    def available(self, name: str) -> bool:
+        """False while an endpoint's breaker is open (does not claim a probe)"""
+        breaker = self.breaker(name)
+        return breaker.state != CircuitBreaker.OPEN or breaker.retry_in() == 0
+
+    async def call(
+        self,
+        name: str,
+        fn: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None,
+        hedge: bool = False
+    ) -> Any:
+        """
+        Run a provider call behind its breaker
+
+        Args:
+            name: Endpoint name
+            fn: Zero-argument coroutine factory (called again for a hedge)
+            timeout: Seconds before the call counts as failed (None = no limit)
+            hedge: Start a duplicate call if the first is slower than the
+                endpoint's HEDGE_PERCENTILE latency; first success wins.
+                Only for small, idempotent calls.
+
+        Returns:
+            The call's result
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+            asyncio.TimeoutError: If the call timed out
+        """
+        breaker = self.breaker(name)
+        if not breaker.allow():
+            breaker.stats["rejected"] += 1
+            provider_seconds.observe(0, provider=name, outcome="rejected")
+            raise CircuitOpenError(name, breaker.retry_in())
+
+        breaker.stats["calls"] += 1
+        started = time.monotonic()
+        try:
+            if hedge:
+                result = await asyncio.wait_for(self._hedged(breaker, fn), timeout)
+            else:
+                result = await asyncio.wait_for(fn(), timeout)
+        except asyncio.TimeoutError:
+            breaker.stats["timeouts"] += 1
+            breaker.record_failure()
+            provider_seconds.observe(time.monotonic() - started, provider=name, outcome="timeout")
+            raise
+        except asyncio.CancelledError:
+            breaker.release_probe()
+            raise
+        except Exception:
+            breaker.record_failure()
+            provider_seconds.observe(time.monotonic() - started, provider=name, outcome="error")
+            raise
+
+        latency = time.monotonic() - started
+        breaker.record_success(latency)
+        provider_seconds.observe(latency, provider=name, outcome="ok")
+        return result
+
+    async def _hedged(self, breaker: CircuitBreaker, fn: Callable[[], Awaitable[Any]]) -> Any:
+        delay = breaker.percentile(settings.HEDGE_PERCENTILE)
+        first = asyncio.ensure_future(fn())
+        if delay is None:
+            return await first
+
+        done, _ = await asyncio.wait({first}, timeout=max(delay, settings.HEDGE_MIN_DELAY))
+        if done:
+            return first.result()
+
+        breaker.stats["hedged"] += 1
+        second = asyncio.ensure_future(fn())
+        pending = {first, second}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            breaker.stats["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def get_stats(self) -> dict:
+        """Breaker state per endpoint"""
+        return {name: breaker.get_stats() for name, breaker in self.breakers.items()}
+
+
+# Singleton instance
+resilience_service = ResilienceService()
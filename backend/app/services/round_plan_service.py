@@ -0,0 +1,257 @@
+"""
+Round Plan Service
+Round-level structured LLM calls: one "deal" call picks cards (plus video
+prompts) for every AI player, one "judging" call ranks all submissions (plus
+prompts for submissions nobody has prompted yet). Responses are validated
+item by item, so a bad entry only falls back that one choice.
+"""
+import logging
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from ..config import settings
+from ..models.round_plan import BotPlay, SubmissionPrompt, JudgingPlan
+from .ai_service import ai_service
+from .combination_key import combination_key
+from .prompt_bank_service import prompt_bank_service
+
+logger = logging.getLogger(__name__)
+
+
+SCENE_INSTRUCTIONS = """- "prompt": a humorous, absurd, and visually engaging video scene of the completed black card.
+  Use cinematic creativity, playful exaggeration, and expressive character actions. Always speak
+  and act the description. At most 50 words.
+- "safe_prompt": the same prompt rewritten to be safe for image/video generation APIs (no explicit
+  sexual content, violence, gore or hate speech), keeping the joke intact and PG-13. If the prompt
+  is already safe, repeat it unchanged."""
+
+
+def _truncate(text: str, words: int = 50) -> str:
+    return " ".join(text.split()[:words])
+
+
+class RoundPlanService:
+    """Per-round deal and judging plans, shared by every caller in the round"""
+
+    def __init__(self):
+        """Initialize round plan service"""
+        self.enabled = settings.ROUND_PLAN_ENABLED
+        # (game_id, round_number, kind) -> plan shared by concurrent callers
+        self._plans: Dict[Tuple[str, int, str], asyncio.Future] = {}
+        self.stats = {
+            "deal_plans": 0,
+            "judging_plans": 0,
+            "failed_plans": 0,
+            "invalid_items": 0,
+            "prompts_banked": 0
+        }
+
+    async def _shared(self, key: Tuple[str, int, str], build: Callable[[], Awaitable]):
+        """Run build() once per key; later callers await the same result"""
+        game_id, round_number, _ = key
+        for stale in [k for k in self._plans if k[0] == game_id and k[1] != round_number]:
+            del self._plans[stale]
+
+        if key not in self._plans:
+            self._plans[key] = asyncio.ensure_future(build())
+        return await asyncio.shield(self._plans[key])
+
+    def _bank(self, combo_key: str, prompt: Optional[str], safe_prompt: Optional[str]):
+        if prompt and safe_prompt:
+            prompt_bank_service.remember(combo_key, _truncate(prompt), _truncate(safe_prompt))
+            self.stats["prompts_banked"] += 1
+
+    # Deal
+
+    async def deal(
+        self,
+        game_id: str,
+        round_number: int,
+        black_card_id: str,
+        black_card_text: str,
+        pick: int,
+        bots: List[Dict]
+    ) -> Dict[str, List[str]]:
+        """
+        Card choices for all AI players of a round in one LLM call
+
+        Args:
+            game_id: Game being played
+            round_number: Current round
+            black_card_id: Black card ID (for combination keys)
+            black_card_text: Black card text
+            pick: Number of white cards to play
+            bots: [{"player_id", "personality", "hand": [{"id", "text"}]}]
+
+        Returns:
+            player_id -> selected card IDs, only for players whose choice was
+            valid (others should fall back to select_cards)
+        """
+        if not self.enabled or not ai_service.model or not bots:
+            return {}
+
+        async def build():
+            try:
+                return await self._deal(black_card_id, black_card_text, pick, bots)
+            except Exception as e:
+                logger.warning("Deal plan failed, AI players choose individually: %s", e)
+                self.stats["failed_plans"] += 1
+                return {}
+
+        return await self._shared((game_id, round_number, "deal"), build)
+
+    async def _deal(self, black_card_id: str, black_card_text: str, pick: int, bots: List[Dict]) -> Dict[str, List[str]]:
+        players_text = ""
+        for bot in bots:
+            hand_text = "\n".join(f"{i + 1}. {card['text']}" for i, card in enumerate(bot['hand']))
+            players_text += (
+                f"\nPlayer {bot['player_id']}\n"
+                f"Personality: {ai_service.personality_instruction(bot['personality'])}\n"
+                f"Hand:\n{hand_text}\n"
+            )
+
+        prompt = f"""You are playing Cards Against Humanity for several AI players at once.
+
+Black Card: "{black_card_text}"
+Each player picks {pick} white card(s) from their OWN hand.
+{players_text}
+For EACH player, choose the funniest card(s) for their personality, then write for the
+black card completed with those cards:
+{SCENE_INSTRUCTIONS}
+
+Respond with JSON only:
+{{"plays": [{{"player_id": "...", "cards": [3], "prompt": "...", "safe_prompt": "..."}}]}}"""
+
+        # Per-round prompt (player IDs, hands): never repeats, so don't cache it
+        response = await ai_service.generate_json(prompt, cache=False)
+        self.stats["deal_plans"] += 1
+
+        hands = {bot['player_id']: bot['hand'] for bot in bots}
+        choices: Dict[str, List[str]] = {}
+        for item in (response.get("plays") if isinstance(response, dict) else None) or []:
+            try:
+                play = BotPlay.model_validate(item)
+            except ValidationError:
+                self.stats["invalid_items"] += 1
+                continue
+
+            hand = hands.get(play.player_id)
+            positions = list(dict.fromkeys(play.cards))
+            if (
+                hand is None or play.player_id in choices or len(positions) != pick
+                or not all(1 <= n <= len(hand) for n in positions)
+            ):
+                self.stats["invalid_items"] += 1
+                continue
+
+            card_ids = [hand[n - 1]['id'] for n in positions]
+            choices[play.player_id] = card_ids
+            self._bank(combination_key(black_id=black_card_id, white_ids=card_ids), play.prompt, play.safe_prompt)
+
+        logger.info("Deal plan: %s/%s AI choices in one call", len(choices), len(bots))
+        return choices
+
+    # Judging
+
+    async def judging(
+        self,
+        game_id: str,
+        round_number: int,
+        black_card_text: str,
+        submissions: List[Dict],
+        personality: str = "absurd"
+    ) -> JudgingPlan:
+        """
+        Ranking of a round's submissions (and missing prompts) in one LLM call
+
+        Args:
+            game_id: Game being judged
+            round_number: Round being judged
+            black_card_text: Black card text
+            submissions: [{"cards": [texts], "combo_key", "needs_prompt": bool}]
+            personality: Judging personality
+
+        Returns:
+            JudgingPlan; ranking is None if the call failed or was unusable
+        """
+        if not self.enabled or not ai_service.model or not submissions:
+            return JudgingPlan()
+
+        async def build():
+            try:
+                return await self._judging(black_card_text, submissions, personality)
+            except Exception as e:
+                logger.warning("Judging plan failed: %s", e)
+                self.stats["failed_plans"] += 1
+                return JudgingPlan()
+
+        return await self._shared((game_id, round_number, "judging"), build)
+
+    async def _judging(self, black_card_text: str, submissions: List[Dict], personality: str) -> JudgingPlan:
+        submissions_text = "\n".join(
+            f"{i + 1}. {', '.join(sub['cards'])}" for i, sub in enumerate(submissions)
+        )
+        needs_prompt = [i + 1 for i, sub in enumerate(submissions) if sub.get('needs_prompt')]
+        prompt_request = ""
+        if needs_prompt:
+            prompt_request = (
+                f"\nAlso, for submissions {', '.join(map(str, needs_prompt))}, write for the black card "
+                f"completed with that submission:\n{SCENE_INSTRUCTIONS}\n"
+            )
+
+        prompt = f"""You are judging Cards Against Humanity submissions.
+
+Black Card: "{black_card_text}"
+
+Submissions:
+{submissions_text}
+
+Criteria: Rank the submissions from the {ai_service.judging_criteria(personality)} to the least.
+{prompt_request}
+Respond with JSON only:
+{{"ranking": [2, 1, 3], "prompts": [{{"submission": 1, "prompt": "...", "safe_prompt": "..."}}]}}"""
+
+        # Per-round prompt (player IDs, hands): never repeats, so don't cache it
+        response = await ai_service.generate_json(prompt, cache=False)
+        self.stats["judging_plans"] += 1
+        if not isinstance(response, dict):
+            response = {}
+
+        # Ranking: keep valid, unique numbers; unranked submissions go last
+        ranking: List[int] = []
+        for number in response.get("ranking") or []:
+            if isinstance(number, int) and 1 <= number <= len(submissions) and number - 1 not in ranking:
+                ranking.append(number - 1)
+        if ranking:
+            ranking += [i for i in range(len(submissions)) if i not in ranking]
+
+        prompts: List[SubmissionPrompt] = []
+        for item in response.get("prompts") or []:
+            try:
+                entry = SubmissionPrompt.model_validate(item)
+            except ValidationError:
+                self.stats["invalid_items"] += 1
+                continue
+            if entry.submission not in needs_prompt:
+                continue
+            combo_key = submissions[entry.submission - 1].get('combo_key')
+            if combo_key:
+                self._bank(combo_key, entry.prompt, entry.safe_prompt)
+            prompts.append(entry)
+
+        logger.info("Judging plan: ranking=%s, %s/%s prompts in one call",
+                    'yes' if ranking else 'no', len(prompts), len(needs_prompt))
+        return JudgingPlan(ranking=ranking or None, prompts=prompts)
+
+    def cancel_game(self, game_id: str):
+        """Forget plans for a game (e.g. when it is cleaned up)"""
+        for key in [k for k in self._plans if k[0] == game_id]:
+            del self._plans[key]
+
+    def get_stats(self) -> dict:
+        """Get round plan statistics"""
+        return {**self.stats, "rounds_tracked": len({k[:2] for k in self._plans})}
+
+
+# Singleton instance
+round_plan_service = RoundPlanService()
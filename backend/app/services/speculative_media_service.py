@@ -0,0 +1,208 @@
+"""
+Speculative Media Service
+Starts prompt generation, moderation, image and narration for each submission
+as soon as it is played, so media is ready (or nearly ready) when judging opens
+"""
+import logging
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from ..config import settings
+from .metrics import metrics
+from .prompt_bank_service import prompt_bank_service
+from .nanobanana_service import nanobanana_service
+from .gemini_tts_service import gemini_tts_service
+
+logger = logging.getLogger(__name__)
+
+
+class SpeculativeMediaService:
+    """Runs per-submission media jobs ahead of the judging phase"""
+
+    def __init__(self):
+        """Initialize speculative media service"""
+        self.enabled = settings.SPECULATIVE_MEDIA_ENABLED
+        self.max_jobs_per_round = settings.SPECULATIVE_MEDIA_MAX_PER_ROUND
+        self._semaphore = asyncio.Semaphore(settings.SPECULATIVE_MEDIA_CONCURRENCY)
+
+        # (game_id, round_number) -> {player_id: task}
+        self.jobs: Dict[Tuple[str, int], Dict[str, asyncio.Task]] = {}
+        # (game_id, round_number) -> number of jobs started (budget usage)
+        self.started: Dict[Tuple[str, int], int] = {}
+
+        self.stats = {
+            "started": 0,
+            "consumed": 0,
+            "cancelled": 0,
+            "over_budget": 0
+        }
+
+    def start(
+        self,
+        game_id: str,
+        round_number: int,
+        player_id: str,
+        black_card_text: str,
+        white_texts: List[str],
+        combo_key: Optional[str] = None
+    ) -> Optional[asyncio.Task]:
+        """
+        Start media generation for a freshly played submission
+
+        Args:
+            game_id: Game the submission belongs to
+            round_number: Round the submission belongs to
+            player_id: Player who submitted
+            black_card_text: The black card text
+            white_texts: Submitted white card texts
+            combo_key: Stable key of the card combination (for the prompt bank)
+
+        Returns:
+            The running task, or None if disabled or over the round budget
+        """
+        if not self.enabled:
+            return None
+
+        round_key = (game_id, round_number)
+        self._discard_stale_rounds(game_id, round_number)
+
+        round_jobs = self.jobs.setdefault(round_key, {})
+        if player_id in round_jobs:
+            return round_jobs[player_id]
+
+        if self.started.get(round_key, 0) >= self.max_jobs_per_round:
+            self.stats["over_budget"] += 1
+            logger.warning("Speculative media budget exhausted for round %s of game %s", round_number, game_id)
+            return None
+
+        task = asyncio.create_task(self._generate(black_card_text, white_texts, combo_key))
+        round_jobs[player_id] = task
+        self.started[round_key] = self.started.get(round_key, 0) + 1
+        self.stats["started"] += 1
+
+        logger.info("Speculative media started for player %s (round %s)", player_id, round_number)
+        return task
+
+    async def result(
+        self,
+        game_id: str,
+        round_number: int,
+        player_id: str,
+        black_card_text: str,
+        white_texts: List[str],
+        combo_key: Optional[str] = None
+    ) -> Dict:
+        """
+        Get media for a submission, awaiting the speculative job if one exists
+        and generating it inline otherwise
+
+        Args:
+            game_id: Game the submission belongs to
+            round_number: Round the submission belongs to
+            player_id: Player who submitted
+            black_card_text: The black card text
+            white_texts: Submitted white card texts
+            combo_key: Stable key of the card combination, so the inline
+                fallback uses the same prompt bank entry as the speculative job
+
+        Returns:
+            Dict with 'prompt', 'safe_prompt', 'image_url' and 'narration' keys
+        """
+        # Leave the task in place so concurrent callers share the same job
+        task = self.jobs.get((game_id, round_number), {}).get(player_id)
+
+        if task and not task.cancelled():
+            self.stats["consumed"] += 1
+            try:
+                # Shielded: a cancelled caller must not cancel the shared job
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                # Only swallow the job's own cancellation, not ours
+                if not task.cancelled():
+                    raise
+            except Exception as e:
+                logger.warning("Speculative media failed for player %s, retrying inline: %s", player_id, e)
+
+        return await self._generate(black_card_text, white_texts, combo_key)
+
+    def has_job(self, game_id: str, round_number: int, player_id: str) -> bool:
+        """Whether a submission already has a media job (and so its prompts)"""
+        return player_id in self.jobs.get((game_id, round_number), {})
+
+    def cancel_submission(self, game_id: str, round_number: int, player_id: str) -> bool:
+        """Cancel the job for a withdrawn submission"""
+        round_jobs = self.jobs.get((game_id, round_number), {})
+        task = round_jobs.pop(player_id, None)
+        if not task:
+            return False
+
+        # Give the withdrawn job's budget slot back to the round
+        round_key = (game_id, round_number)
+        if self.started.get(round_key, 0) > 0:
+            self.started[round_key] -= 1
+
+        if not task.done():
+            task.cancel()
+            self.stats["cancelled"] += 1
+            logger.info("Cancelled speculative media for player %s (round %s)", player_id, round_number)
+        return True
+
+    def end_round(self, game_id: str, round_number: int):
+        """Drop a finished round's jobs (its media has been consumed by now)"""
+        self._cancel_round((game_id, round_number))
+
+    def cancel_game(self, game_id: str):
+        """Cancel all jobs for a game (e.g. when it is cleaned up)"""
+        for round_key in [key for key in self.jobs if key[0] == game_id]:
+            self._cancel_round(round_key)
+
+    def _discard_stale_rounds(self, game_id: str, round_number: int):
+        """Drop jobs left over from earlier rounds of the same game"""
+        for round_key in [key for key in self.jobs if key[0] == game_id and key[1] != round_number]:
+            self._cancel_round(round_key)
+
+    def _cancel_round(self, round_key: Tuple[str, int]):
+        """Cancel every pending job of a round and release its budget"""
+        for task in self.jobs.pop(round_key, {}).values():
+            if not task.done():
+                task.cancel()
+                self.stats["cancelled"] += 1
+        self.started.pop(round_key, None)
+
+    @metrics.timed("media.speculative")
+    async def _generate(self, black_card_text: str, white_texts: List[str],
+                        combo_key: Optional[str] = None) -> Dict:
+        """Prompt -> moderation (or prompt bank) -> image + narration in parallel"""
+        async with self._semaphore:
+            prompt, safe_prompt = await prompt_bank_service.resolve(black_card_text, white_texts, combo_key)
+
+            image_url, narration = await asyncio.gather(
+                nanobanana_service.generate_image(safe_prompt, aspect_ratio="9:16"),
+                gemini_tts_service.generate_narrated_script(
+                    black_card_text,
+                    white_texts,
+                    style="humorous"
+                )
+            )
+
+        return {
+            'prompt': prompt,
+            'safe_prompt': safe_prompt,
+            'image_url': image_url,
+            'narration': narration
+        }
+
+    def get_stats(self) -> dict:
+        """Get speculative media statistics"""
+        pending = sum(
+            1 for round_jobs in self.jobs.values()
+            for task in round_jobs.values() if not task.done()
+        )
+        return {
+            **self.stats,
+            "pending": pending,
+            "rounds_tracked": len(self.jobs)
+        }
+
+
+# Singleton instance
+speculative_media_service = SpeculativeMediaService()
@@ -0,0 +1,227 @@
+"""
+Speculative Video Service
+Starts Veo generation for the most likely winners while the czar is still judging,
+so the winner video is ready (or well underway) by the time a winner is picked
+"""
+import logging
+import asyncio
+import re
+import uuid
+from typing import Dict, List, Optional, Tuple
+from ..config import settings
+from .metrics import metrics
+from .prompt_bank_service import prompt_bank_service
+from .veo_service import veo_service
+from .video_cache import video_cache
+from .media_bus_service import media_bus_service
+from .resilience_service import resilience_service
+
+logger = logging.getLogger(__name__)
+
+
+class SpeculativeVideoService:
+    """Warm-starts winner videos for the top-k candidates of a round"""
+
+    def __init__(self):
+        """Initialize speculative video service"""
+        self.enabled = settings.SPECULATIVE_VIDEO_ENABLED
+        self.top_k = settings.SPECULATIVE_VIDEO_TOP_K
+        self.max_jobs_per_game = settings.SPECULATIVE_VIDEO_MAX_JOBS_PER_GAME
+        self.park_losers = settings.SPECULATIVE_VIDEO_PARK_LOSERS
+
+        # (game_id, round_number) -> {player_id: (task, black_card_text, white_texts, combo_key, video_id)}
+        self.jobs: Dict[Tuple[str, int], Dict[str, Tuple[asyncio.Task, str, List[str], Optional[str], str]]] = {}
+        # game_id -> number of Veo jobs started (cost budget usage)
+        self.spent: Dict[str, int] = {}
+
+        self.stats = {
+            "started": 0,
+            "hits": 0,
+            "misses": 0,
+            "parked": 0,
+            "cancelled": 0,
+            "over_budget": 0
+        }
+
+    def score(self, black_card_text: str, white_texts: List[str]) -> float:
+        """
+        Cheap local guess at how likely a submission is to win
+
+        Favours specific, vivid answers: words that don't already appear
+        on the black card, with a bonus for proper nouns.
+        """
+        black_words = set(re.findall(r"[a-z']+", black_card_text.lower()))
+        score = 0.0
+        for text in white_texts:
+            words = re.findall(r"[A-Za-z']+", text)
+            score += sum(1 for w in words if w.lower() not in black_words)
+            score += 0.5 * sum(1 for w in words if w[0].isupper())
+        return score
+
+    def rank(self, black_card_text: str, candidates: List[List[str]]) -> List[int]:
+        """Rank candidate submissions (lists of white card texts), best first"""
+        return sorted(
+            range(len(candidates)),
+            key=lambda i: self.score(black_card_text, candidates[i]),
+            reverse=True
+        )
+
+    def start(
+        self,
+        game_id: str,
+        round_number: int,
+        black_card_text: str,
+        candidates: List[Tuple[str, List[str], Optional[str]]],
+        preferred_index: Optional[int] = None,
+        ranking: Optional[List[int]] = None
+    ) -> Dict[str, str]:
+        """
+        Start Veo jobs for the most likely winners of a round
+
+        Args:
+            game_id: Game being judged
+            round_number: Round being judged
+            black_card_text: The black card text
+            candidates: List of (player_id, white card texts, combination key)
+                per submission
+            preferred_index: Submission the (AI) czar is known to prefer,
+                always started first if the budget allows
+            ranking: Candidate indices best first (e.g. from the judging
+                plan); defaults to the local heuristic
+
+        Returns:
+            Player ID -> storage video ID (published as 'video:<id>' on the
+            media bus) for every submission with a speculative job
+        """
+        if not self.enabled or not candidates:
+            return {}
+        if not resilience_service.available("veo"):
+            logger.info("Veo circuit open, no speculative videos this round")
+            return {}
+
+        # Earlier rounds that never reached claim() (e.g. the winner path failed)
+        for round_key in [key for key in self.jobs if key[0] == game_id and key[1] != round_number]:
+            self._release(self.jobs.pop(round_key).values())
+
+        round_jobs = self.jobs.setdefault((game_id, round_number), {})
+
+        order = ranking or self.rank(black_card_text, [whites for _, whites, _ in candidates])
+        if preferred_index is not None and 0 <= preferred_index < len(candidates):
+            order = [preferred_index]
+        else:
+            order = order[:self.top_k]
+
+        for idx in order:
+            player_id, white_texts, combo_key = candidates[idx]
+            if player_id in round_jobs:
+                continue
+
+            # Already generated earlier (e.g. parked from a previous round)
+            if video_cache.get(black_card_text, white_texts, key=combo_key):
+                continue
+
+            if self.spent.get(game_id, 0) >= self.max_jobs_per_game:
+                self.stats["over_budget"] += 1
+                logger.warning("Speculative video budget exhausted for game %s", game_id)
+                break
+
+            video_id = str(uuid.uuid4())
+            task = asyncio.create_task(self._generate(black_card_text, white_texts, combo_key, video_id))
+            round_jobs[player_id] = (task, black_card_text, white_texts, combo_key, video_id)
+            self.spent[game_id] = self.spent.get(game_id, 0) + 1
+            self.stats["started"] += 1
+            logger.info("Speculative video started for player %s (round %s)", player_id, round_number)
+
+        return {player_id: job[4] for player_id, job in round_jobs.items()}
+
+    def claim(self, game_id: str, round_number: int, player_id: str) -> Optional[Tuple[asyncio.Task, str]]:
+        """
+        Take the speculative job for the actual winner and release the others
+
+        Returns:
+            (task, video_id) of the winner's job - the task resolves to a dict
+            with 'prompt', 'safe_prompt' and 'video_url', and the URL is
+            published as 'video:<video_id>' on the media bus as soon as it is
+            uploaded - or None if the winner had no speculative job
+        """
+        round_jobs = self.jobs.pop((game_id, round_number), {})
+        job = round_jobs.pop(player_id, None)
+
+        self._release(round_jobs.values())
+
+        if not job:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return job[0], job[4]
+
+    def end_round(self, game_id: str, round_number: int):
+        """Release a finished round's unclaimed jobs"""
+        self._release(self.jobs.pop((game_id, round_number), {}).values())
+
+    def cancel_game(self, game_id: str):
+        """Release all jobs for a game (e.g. when it is cleaned up)"""
+        for round_key in [key for key in self.jobs if key[0] == game_id]:
+            self._release(self.jobs.pop(round_key).values())
+        self.spent.pop(game_id, None)
+
+    def _release(self, jobs):
+        """Park finished/running loser jobs in the video cache, or cancel them"""
+        for task, black_card_text, white_texts, combo_key, _ in jobs:
+            if self.park_losers:
+                # Veo cost is already paid - keep the result for future rounds
+                task.add_done_callback(
+                    lambda t, b=black_card_text, w=white_texts, k=combo_key: self._park(t, b, w, k)
+                )
+            elif not task.done():
+                task.cancel()
+                self.stats["cancelled"] += 1
+
+    def _park(self, task: asyncio.Task, black_card_text: str, white_texts: List[str],
+              combo_key: Optional[str] = None):
+        """Store a finished loser video in the video cache"""
+        if task.cancelled() or task.exception():
+            return
+
+        result = task.result()
+        # Only public URLs: a failed upload leaves a local temp file path
+        if result and (result.get('video_url') or '').startswith(('http://', 'https://')):
+            video_cache.set(black_card_text, white_texts, result['video_url'], key=combo_key)
+            self.stats["parked"] += 1
+            logger.info("Parked speculative video in cache: %s", result['video_url'])
+
+    @metrics.timed("video.speculative")
+    async def _generate(self, black_card_text: str, white_texts: List[str],
+                        combo_key: Optional[str], video_id: str) -> Dict:
+        """Prompt -> moderation (or prompt bank) -> Veo video"""
+        try:
+            prompt, safe_prompt = await prompt_bank_service.resolve(black_card_text, white_texts, combo_key)
+        except Exception:
+            # Nothing will reach Veo: release anyone waiting on the bus
+            media_bus_service.publish(f"video:{video_id}", None)
+            raise
+        video_url = await veo_service.generate_video(safe_prompt, video_id=video_id)
+
+        return {
+            'prompt': prompt,
+            'safe_prompt': safe_prompt,
+            'video_url': video_url
+        }
+
+    def get_stats(self) -> dict:
+        """Get speculative video statistics"""
+        pending = sum(
+            1 for round_jobs in self.jobs.values()
+            for task, *_ in round_jobs.values() if not task.done()
+        )
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "pending": pending,
+            "budget_used": sum(self.spent.values())
+        }
+
+
+# Singleton instance
+speculative_video_service = SpeculativeVideoService()
@@ -0,0 +1,240 @@
+"""
+Storage Index Service
+Local index of known Supabase storage object keys so existence checks are
+O(1) instead of listing (and scanning) a whole bucket per check
+"""
+import logging
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set, Tuple
+from ..config import settings
+from .supabase_http import supabase_http
+
+logger = logging.getLogger(__name__)
+
+
+class StorageIndexService:
+    """Known-key sets per bucket, targeted HEAD lookups and negative caching"""
+
+    def __init__(self):
+        """Initialize storage index service"""
+        self.negative_ttl = settings.STORAGE_INDEX_NEGATIVE_TTL
+        self.page_size = settings.STORAGE_INDEX_PAGE_SIZE
+        self.reconcile_interval = settings.STORAGE_INDEX_RECONCILE_SECONDS
+
+        # bucket -> {object key known to exist: created_at}
+        self.known: Dict[str, Dict[str, str]] = {}
+        # bucket -> change counter, bumped whenever its key set changes
+        self.versions: Dict[str, int] = {}
+        # Buckets listed at least once (not just registered into)
+        self.listed: Set[str] = set()
+        # (bucket, key) -> monotonic time the "missing" answer expires
+        self.missing: Dict[Tuple[str, str], float] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+        self.stats = {
+            "known_hits": 0,
+            "negative_hits": 0,
+            "lookups": 0,
+            "registered": 0,
+            "refreshed": 0,
+            "removed": 0
+        }
+
+    def _changed(self, bucket: str):
+        self.versions[bucket] = self.versions.get(bucket, 0) + 1
+
+    def register(self, bucket: str, key: str):
+        """Record an object we just uploaded (or otherwise know exists)"""
+        known = self.known.setdefault(bucket, {})
+        if key not in known:
+            known[key] = datetime.now(timezone.utc).isoformat()
+            self._changed(bucket)
+        self.missing.pop((bucket, key), None)
+        self.stats["registered"] += 1
+
+    def forget(self, bucket: str, key: str):
+        """Drop an object from the index (e.g. after deleting it)"""
+        if self.known.get(bucket, {}).pop(key, None) is not None:
+            self._changed(bucket)
+
+    async def exists(self, bucket: str, key: str) -> bool:
+        """
+        Check whether an object exists
+
+        Known keys answer immediately; recently-missing keys answer from the
+        negative cache; anything else costs one targeted HEAD request.
+
+        Args:
+            bucket: Storage bucket name
+            key: Object key (e.g. '<uuid>.mp4')
+
+        Returns:
+            True if the object exists
+        """
+        if key in self.known.get(bucket, ()):
+            self.stats["known_hits"] += 1
+            return True
+
+        expires = self.missing.get((bucket, key))
+        if expires is not None:
+            if expires > time.monotonic():
+                self.stats["negative_hits"] += 1
+                return False
+            del self.missing[(bucket, key)]
+
+        self.stats["lookups"] += 1
+        found = await supabase_http.exists(bucket, key)
+
+        if found:
+            self.register(bucket, key)
+        elif self.negative_ttl > 0:
+            self.missing[(bucket, key)] = time.monotonic() + self.negative_ttl
+        return found
+
+    async def refresh(self, bucket: str) -> int:
+        """
+        Incrementally pull object keys created since the last refresh
+
+        Lists newest objects first and keeps paging while pages still yield
+        new keys; it stops at the first page that is entirely known (keys
+        registered by this process can be interleaved with other writers').
+
+        Returns:
+            Number of newly indexed keys
+        """
+        async with self._lock(bucket):
+            known = self.known.setdefault(bucket, {})
+            added = 0
+            offset = 0
+
+            while True:
+                page = await self._list_page(bucket, offset)
+                files = [f for f in page if f.get('name')]
+                new = [f for f in files if f['name'] not in known]
+
+                for f in new:
+                    known[f['name']] = f.get('created_at') or ''
+                added += len(new)
+                self.stats["refreshed"] += len(new)
+
+                # Sorted newest first: a page with nothing new means we're caught up
+                if not new or len(page) < self.page_size:
+                    break
+                offset += self.page_size
+
+            self.listed.add(bucket)
+            if added:
+                self._changed(bucket)
+            return added
+
+    async def reconcile(self, bucket: str) -> int:
+        """
+        List a whole bucket and drop keys that no longer exist
+
+        The incremental refresh only ever adds keys, so objects deleted
+        outside the app (e.g. from the dashboard) are dropped here.
+
+        Returns:
+            Number of removed keys
+        """
+        async with self._lock(bucket):
+            known = self.known.setdefault(bucket, {})
+            # Keys registered while we list are not in the snapshot, so they survive
+            before = set(known)
+            seen: Set[str] = set()
+            offset = 0
+
+            while True:
+                page = await self._list_page(bucket, offset)
+                for f in page:
+                    if f.get('name'):
+                        seen.add(f['name'])
+                        known.setdefault(f['name'], f.get('created_at') or '')
+                if len(page) < self.page_size:
+                    break
+                offset += self.page_size
+
+            removed = before - seen
+            for key in removed:
+                known.pop(key, None)
+            self.listed.add(bucket)
+            if removed or len(known) != len(before):
+                self._changed(bucket)
+            self.stats["removed"] += len(removed)
+            return len(removed)
+
+    def _lock(self, bucket: str) -> asyncio.Lock:
+        if bucket not in self._locks:
+            self._locks[bucket] = asyncio.Lock()
+        return self._locks[bucket]
+
+    async def _list_page(self, bucket: str, offset: int) -> list:
+        return await supabase_http.list(
+            bucket,
+            limit=self.page_size,
+            offset=offset,
+            sort_by={"column": "created_at", "order": "desc"}
+        )
+
+    def prune_missing(self) -> int:
+        """Drop expired "missing" answers (keys never looked up again would stay forever)"""
+        now = time.monotonic()
+        expired = [entry for entry, expires in self.missing.items() if expires <= now]
+        for entry in expired:
+            del self.missing[entry]
+        return len(expired)
+
+    async def _refresh_loop(self, buckets: list, interval: float):
+        last_reconcile = time.monotonic()
+        while True:
+            reconcile = (
+                self.reconcile_interval > 0
+                and time.monotonic() - last_reconcile >= self.reconcile_interval
+            )
+            for bucket in buckets:
+                try:
+                    if reconcile:
+                        await self.reconcile(bucket)
+                    else:
+                        await self.refresh(bucket)
+                except Exception as e:
+                    logger.warning("Storage index refresh failed for %s: %s", bucket, e)
+            if reconcile:
+                last_reconcile = time.monotonic()
+            self.prune_missing()
+            await asyncio.sleep(interval)
+
+    def start(self):
+        """Start the background refresh of the configured buckets"""
+        interval = settings.STORAGE_INDEX_REFRESH_SECONDS
+        if self._refresh_task or interval <= 0:
+            return
+
+        # The feed index is built from this index too
+        buckets = list(dict.fromkeys([
+            settings.SUPABASE_BUCKET, settings.SUPABASE_WINNING_BUCKET, settings.FEED_INDEX_BUCKET
+        ]))
+        self._refresh_task = asyncio.create_task(self._refresh_loop(buckets, interval))
+        logger.info("Storage index refreshing %s every %ss", ', '.join(buckets), interval)
+
+    async def stop(self):
+        """Stop the background refresh"""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+
+    def get_stats(self) -> dict:
+        """Get storage index statistics"""
+        return {
+            **self.stats,
+            "known_keys": {bucket: len(keys) for bucket, keys in self.known.items()},
+            "negative_entries": len(self.missing)
+        }
+
+
+# Singleton instance
+storage_index_service = StorageIndexService()
@@ -0,0 +1,272 @@
+"""
+Supabase HTTP
+Async data-access layer for PostgREST and Supabase Storage over one pooled
+httpx client (HTTP/2 when the h2 package is installed), with keep-alive,
+per-call timeouts and retries. Replaces blocking supabase-py calls inside
+async request handlers.
+"""
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+import httpx
+from ..config import settings
+from .metrics import storage_seconds
+from . import providers
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class SupabaseHTTPError(Exception):
+    """Non-2xx response from PostgREST or Storage"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"{status_code}: {message}")
+        self.status_code = status_code
+
+
+class SupabaseHTTP:
+    """Pooled async client for the Supabase REST and Storage APIs"""
+
+    # Safe to resend after a timeout or 5xx (the first attempt may have run)
+    IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE"}
+    RETRY_STATUSES = {502, 503, 504}
+
+    def __init__(self):
+        """Initialize Supabase HTTP client (connections open lazily)"""
+        self.base_url = providers.supabase_url()
+        self.key = settings.SUPABASE_KEY
+        self.timeout = settings.SUPABASE_HTTP_TIMEOUT
+        self.upload_timeout = settings.SUPABASE_HTTP_UPLOAD_TIMEOUT
+        self.retries = settings.SUPABASE_HTTP_RETRIES
+        self._client: Optional[httpx.AsyncClient] = None
+
+        self.stats = {"requests": 0, "retries": 0, "errors": 0}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                transport=providers.supabase_transport(),
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.SUPABASE_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.SUPABASE_HTTP_MAX_KEEPALIVE
+                ),
+                headers={
+                    "apikey": self.key,
+                    "Authorization": f"Bearer {self.key}"
+                }
+            )
+        return self._client
+
+    async def close(self):
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """
+        Send a request with retries
+
+        Connection failures are retried for every method (nothing reached the
+        server); timeouts and 502/503/504 only for idempotent methods.
+
+        Raises:
+            SupabaseHTTPError: On a non-2xx response (404 is left to callers
+                via raise_for_missing=False)
+        """
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._request(method, path, **kwargs)
+            status = str(response.status_code)
+            return response
+        except SupabaseHTTPError as e:
+            status = str(e.status_code)
+            raise
+        finally:
+            api = "storage" if path.startswith("/storage") else "rest"
+            storage_seconds.observe(time.perf_counter() - started, method=method, api=api, status=status)
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        raise_for_missing = kwargs.pop("raise_for_missing", True)
+        client = self._get_client()
+        idempotent = method in self.IDEMPOTENT_METHODS
+        attempt = 0
+
+        while True:
+            self.stats["requests"] += 1
+            try:
+                response = await client.request(method, path, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                if attempt >= self.retries:
+                    self.stats["errors"] += 1
+                    raise
+            except httpx.TimeoutException:
+                if not idempotent or attempt >= self.retries:
+                    self.stats["errors"] += 1
+                    raise
+            else:
+                if response.status_code in self.RETRY_STATUSES and idempotent and attempt < self.retries:
+                    pass
+                elif response.status_code == 404 and not raise_for_missing:
+                    return response
+                elif response.is_error:
+                    self.stats["errors"] += 1
+                    raise SupabaseHTTPError(response.status_code, response.text[:200])
+                else:
+                    return response
+
+            attempt += 1
+            self.stats["retries"] += 1
+            await asyncio.sleep(0.2 * (2 ** (attempt - 1)))
+
+    # PostgREST
+
+    async def select(
+        self,
+        table: str,
+        filters: Optional[Dict[str, str]] = None,
+        columns: str = "*",
+        order: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Select rows
+
+        Args:
+            table: Table name
+            filters: PostgREST filters, e.g. {"id": "eq.<uuid>"}
+            columns: Column list
+            order: Order clause, e.g. "created_at.desc"
+            limit: Max rows
+            offset: Rows to skip
+        """
+        params = {"select": columns, **(filters or {})}
+        if order:
+            params["order"] = order
+        if limit is not None:
+            params["limit"] = limit
+        if offset:
+            params["offset"] = offset
+
+        response = await self.request("GET", f"/rest/v1/{table}", params=params)
+        return response.json()
+
+    async def insert(self, table: str, rows: Any) -> List[Dict[str, Any]]:
+        """Insert one row (dict) or many (list) and return them"""
+        response = await self.request(
+            "POST", f"/rest/v1/{table}",
+            json=rows,
+            headers={"Prefer": "return=representation"}
+        )
+        return response.json()
+
+    async def update(self, table: str, values: Dict[str, Any], filters: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Update rows matching filters and return them"""
+        response = await self.request(
+            "PATCH", f"/rest/v1/{table}",
+            params=filters,
+            json=values,
+            headers={"Prefer": "return=representation"}
+        )
+        return response.json()
+
+    async def delete(self, table: str, filters: Dict[str, str]) -> None:
+        """Delete rows matching filters"""
+        await self.request("DELETE", f"/rest/v1/{table}", params=filters)
+
+    async def rpc(self, function: str, args: Optional[Dict[str, Any]] = None) -> Any:
+        """Call a Postgres function"""
+        response = await self.request("POST", f"/rest/v1/rpc/{function}", json=args or {})
+        return response.json() if response.content else None
+
+    # Storage
+
+    def _object_path(self, bucket: str, path: str) -> str:
+        return f"{quote(bucket)}/{quote(path)}"
+
+    def public_url(self, bucket: str, path: str) -> str:
+        """Public URL of an object in a public bucket (no request)"""
+        return f"{self.base_url}/storage/v1/object/public/{self._object_path(bucket, path)}"
+
+    async def upload(
+        self,
+        bucket: str,
+        path: str,
+        data: bytes,
+        content_type: str = "application/octet-stream",
+        upsert: bool = False
+    ) -> str:
+        """
+        Upload an object
+
+        Returns:
+            The object's public URL
+        """
+        await self.request(
+            "POST", f"/storage/v1/object/{self._object_path(bucket, path)}",
+            content=data,
+            headers={"Content-Type": content_type, "x-upsert": "true" if upsert else "false"},
+            timeout=self.upload_timeout
+        )
+        return self.public_url(bucket, path)
+
+    async def download(self, bucket: str, path: str) -> Optional[bytes]:
+        """Download an object (None if it doesn't exist)"""
+        response = await self.request(
+            "GET", f"/storage/v1/object/{self._object_path(bucket, path)}",
+            timeout=self.upload_timeout,
+            raise_for_missing=False
+        )
+        return response.content if response.status_code == 200 else None
+
+    async def exists(self, bucket: str, path: str) -> bool:
+        """Targeted HEAD lookup for a single object"""
+        try:
+            response = await self.request(
+                "HEAD", f"/storage/v1/object/{self._object_path(bucket, path)}",
+                raise_for_missing=False
+            )
+        except SupabaseHTTPError as e:
+            # HEAD has no body, so some gateways report a missing object as 400
+            if e.status_code == 400:
+                return False
+            raise
+        return response.status_code == 200
+
+    async def list(
+        self,
+        bucket: str,
+        prefix: str = "",
+        limit: int = 100,
+        offset: int = 0,
+        sort_by: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """List objects under a prefix (one page)"""
+        response = await self.request(
+            "POST", f"/storage/v1/object/list/{quote(bucket)}",
+            json={
+                "prefix": prefix,
+                "limit": limit,
+                "offset": offset,
+                "sortBy": sort_by or {"column": "name", "order": "asc"}
+            }
+        )
+        return response.json()
+
+    def get_stats(self) -> dict:
+        """Get HTTP client statistics"""
+        return {**self.stats, "http2": HTTP2_AVAILABLE}
+
+
+# Singleton instance
+supabase_http = SupabaseHTTP()
@@ -1,13 +1,26 @@
+import logging
 from supabase import create_client, Client
 from ..config import settings
+from .storage_index_service import storage_index_service
+from .supabase_http import supabase_http
+from . import providers
+from .trending_service import trending_service
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 import uuid
 
+logger = logging.getLogger(__name__)
+
 
 class SupabaseService:
     def __init__(self):
-        self.client: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+        # Blocking client: only for startup loading and executor threads
+        # (None with local storage, which only the async client can reach)
+        self.client: Optional[Client] = None
+        if not providers.local_storage():
+            self.client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+        # Async pooled client for everything on the event loop
+        self.http = supabase_http
         self.bucket = settings.SUPABASE_BUCKET
     
     # Video Management
@@ -29,76 +42,62 @@ class SupabaseService:
                 "comments_count": 0
             }
             
-            result = self.client.table("videos").insert(data).execute()
-            return video_id if result.data else None
+            rows = await self.http.insert("videos", data)
+            return video_id if rows else None
         except Exception as e:
-            print(f"❌ Error saving video: {e}")
+            logger.error("Error saving video: %s", e)
             return None
     
     async def get_video(self, video_id: str) -> Optional[Dict[str, Any]]:
         """Get video by ID"""
         try:
-            result = self.client.table("videos").select("*").eq("id", video_id).execute()
-            return result.data[0] if result.data else None
+            rows = await self.http.select("videos", {"id": f"eq.{video_id}"}, limit=1)
+            return rows[0] if rows else None
         except Exception as e:
-            print(f"❌ Error getting video: {e}")
+            logger.error("Error getting video: %s", e)
             return None
     
     async def get_videos_feed(self, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
         """Get videos for feed (TikTok/Reel style)"""
         try:
-            result = (
-                self.client.table("videos")
-                .select("*")
-                .order("created_at", desc=True)
-                .range(offset, offset + limit - 1)
-                .execute()
+            return await self.http.select(
+                "videos", order="created_at.desc", limit=limit, offset=offset
             )
-            return result.data if result.data else []
         except Exception as e:
-            print(f"❌ Error getting videos feed: {e}")
+            logger.error("Error getting videos feed: %s", e)
             return []
     
     # Likes Management
-    async def like_video(self, video_id: str, user_id: str) -> bool:
-        """Like a video"""
+    async def toggle_like(self, video_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Like or unlike a video in a single round-trip (toggle_like RPC)
+        
+        Returns:
+            Dict with 'liked' and 'likes_count', or None on error
+        """
         try:
-            # Check if already liked
-            existing = (
-                self.client.table("likes")
-                .select("*")
-                .eq("video_id", video_id)
-                .eq("user_id", user_id)
-                .execute()
-            )
-            
-            if existing.data:
-                # Unlike
-                self.client.table("likes").delete().eq("video_id", video_id).eq("user_id", user_id).execute()
-                # Decrement count
-                self.client.rpc("decrement_likes", {"video_id": video_id}).execute()
-                return False
-            else:
-                # Like
-                self.client.table("likes").insert({
-                    "video_id": video_id,
-                    "user_id": user_id,
-                    "created_at": datetime.utcnow().isoformat()
-                }).execute()
-                # Increment count
-                self.client.rpc("increment_likes", {"video_id": video_id}).execute()
-                return True
+            rows = await self.http.rpc("toggle_like", {"p_video_id": video_id, "p_user_id": user_id})
+            if not rows:
+                return None
+            if rows[0]["is_liked"]:
+                trending_service.record(video_id, "like")
+            return {"liked": rows[0]["is_liked"], "likes_count": rows[0]["new_count"] or 0}
         except Exception as e:
-            print(f"❌ Error liking video: {e}")
-            return False
+            logger.error("Error liking video: %s", e)
+            return None
+    
+    async def like_video(self, video_id: str, user_id: str) -> bool:
+        """Like a video (returns the new liked state)"""
+        result = await self.toggle_like(video_id, user_id)
+        return bool(result and result["liked"])
     
     async def get_video_likes(self, video_id: str) -> int:
         """Get like count for a video"""
         try:
-            result = self.client.table("videos").select("likes_count").eq("id", video_id).execute()
-            return result.data[0]["likes_count"] if result.data else 0
+            rows = await self.http.select("videos", {"id": f"eq.{video_id}"}, columns="likes_count")
+            return rows[0]["likes_count"] if rows else 0
         except Exception as e:
-            print(f"❌ Error getting likes: {e}")
+            logger.error("Error getting likes: %s", e)
             return 0
     
     # Comments Management
@@ -115,67 +114,50 @@ class SupabaseService:
                 "created_at": datetime.utcnow().isoformat()
             }
             
-            result = self.client.table("comments").insert(data).execute()
+            rows = await self.http.insert("comments", data)
             
-            if result.data:
+            if rows:
                 # Increment comment count
-                self.client.rpc("increment_comments", {"video_id": video_id}).execute()
-                return result.data[0]
+                await self.http.rpc("increment_comments", {"video_id": video_id})
+                trending_service.record(video_id, "comment")
+                return rows[0]
             return None
         except Exception as e:
-            print(f"❌ Error adding comment: {e}")
+            logger.error("Error adding comment: %s", e)
             return None
     
     async def get_video_comments(self, video_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get comments for a video"""
         try:
-            result = (
-                self.client.table("comments")
-                .select("*")
-                .eq("video_id", video_id)
-                .order("created_at", desc=False)
-                .limit(limit)
-                .execute()
+            return await self.http.select(
+                "comments", {"video_id": f"eq.{video_id}"},
+                order="created_at.asc", limit=limit
             )
-            return result.data if result.data else []
         except Exception as e:
-            print(f"❌ Error getting comments: {e}")
+            logger.error("Error getting comments: %s", e)
             return []
     
     # Storage Management
     async def upload_video_file(self, file_path: str, file_data: bytes) -> Optional[str]:
         """Upload video file to Supabase storage"""
         try:
-            result = self.client.storage.from_(self.bucket).upload(file_path, file_data)
-            if result:
-                # Get public URL
-                url = self.client.storage.from_(self.bucket).get_public_url(file_path)
-                return url
-            return None
+            url = await self.http.upload(self.bucket, file_path, file_data, "video/mp4")
+            storage_index_service.register(self.bucket, file_path)
+            return url
         except Exception as e:
-            print(f"❌ Error uploading video: {e}")
+            logger.error("Error uploading video: %s", e)
             return None
     
     async def get_video_url_by_uuid(self, video_uuid: str) -> Optional[str]:
         """Get video URL from Supabase storage by UUID"""
-        try:
-            # Check if file exists in storage
-            file_path = f"{video_uuid}.mp4"
-            url = self.client.storage.from_(self.bucket).get_public_url(file_path)
-            return url
-        except Exception as e:
-            print(f"❌ Error getting video URL: {e}")
-            return None
+        return self.http.public_url(self.bucket, f"{video_uuid}.mp4")
     
     async def check_video_exists(self, video_uuid: str) -> bool:
         """Check if video exists in Supabase storage"""
         try:
-            file_path = f"{video_uuid}.mp4"
-            # Try to get file info
-            files = self.client.storage.from_(self.bucket).list(path="")
-            return any(f['name'] == file_path for f in files)
+            return await storage_index_service.exists(self.bucket, f"{video_uuid}.mp4")
         except Exception as e:
-            print(f"❌ Error checking video: {e}")
+            logger.error("Error checking video: %s", e)
             return False
     
     async def copy_to_winning_bucket(self, video_uuid: str, video_id: str) -> Optional[str]:
@@ -194,24 +176,20 @@ class SupabaseService:
             dest_path = f"{video_id}.mp4"
             
             # Download from videos bucket
-            data = self.client.storage.from_(self.bucket).download(source_path)
+            data = await self.http.download(self.bucket, source_path)
             
             if data:
                 # Upload to winning-videos bucket
-                result = self.client.storage.from_(settings.SUPABASE_WINNING_BUCKET).upload(
-                    dest_path, 
-                    data
+                url = await self.http.upload(
+                    settings.SUPABASE_WINNING_BUCKET, dest_path, data, "video/mp4"
                 )
-                
-                if result:
-                    # Get public URL from winning bucket
-                    url = self.client.storage.from_(settings.SUPABASE_WINNING_BUCKET).get_public_url(dest_path)
-                    print(f"✅ Copied winning video to feed bucket: {url}")
-                    return url
+                storage_index_service.register(settings.SUPABASE_WINNING_BUCKET, dest_path)
+                logger.info("Copied winning video to feed bucket: %s", url)
+                return url
             
             return None
         except Exception as e:
-            print(f"❌ Error copying to winning bucket: {e}")
+            logger.error("Error copying to winning bucket: %s", e)
             return None
 
 
@@ -0,0 +1,209 @@
+"""
+Trending Service
+Time-decayed trending ranking kept in memory. Scores are stored in the log
+domain as ln(sum(w * e^(t/tau))), so new interactions are added with a
+single logaddexp and never need re-decaying: ordering by the stored value is
+the same as ordering by the decayed score at any "now".
+"""
+import logging
+import asyncio
+import heapq
+import math
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from ..config import settings
+from .supabase_http import supabase_http
+from .counter_service import counter_service
+from .feed_index_service import feed_index_service
+
+logger = logging.getLogger(__name__)
+
+
+def _logaddexp(a: float, b: float) -> float:
+    if a == -math.inf:
+        return b
+    if b == -math.inf:
+        return a
+    high, low = (a, b) if a > b else (b, a)
+    return high + math.log1p(math.exp(low - high))
+
+
+def _timestamp(value: Optional[str]) -> float:
+    """Epoch seconds from a Postgres/ISO timestamp (now if missing/unparseable)"""
+    if not value:
+        return time.time()
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return time.time()
+
+
+class TrendingService:
+    """Incremental decayed scores + periodic bulk recompute + cached top-K"""
+
+    def __init__(self):
+        """Initialize trending service"""
+        self.tau = settings.TRENDING_HALF_LIFE_HOURS * 3600 / math.log(2)
+        self.weights = {
+            "view": settings.TRENDING_VIEW_WEIGHT,
+            "like": settings.TRENDING_LIKE_WEIGHT,
+            "comment": settings.TRENDING_COMMENT_WEIGHT
+        }
+        self.top_k = settings.TRENDING_TOP_K
+        self.cache_seconds = settings.TRENDING_CACHE_SECONDS
+        self.recompute_interval = settings.TRENDING_RECOMPUTE_SECONDS
+
+        # Epoch offset keeps t/tau small enough for float precision
+        self._epoch = time.time()
+        self.scores: Dict[str, float] = {}
+        self.videos: Dict[str, Dict] = {}
+        # (video_id, kind, at, buffered) not yet reflected in the database
+        # counts the last recompute read (re-applied on top of it); bounded so
+        # a failing recompute can't grow it forever (oldest dropped first)
+        self.max_live_events = settings.TRENDING_LIVE_EVENTS_MAX
+        self._live_events: "deque[Tuple[str, str, float, bool]]" = deque(maxlen=self.max_live_events)
+
+        self._top: List[Dict] = []
+        self._top_built_at = 0.0
+        self._recompute_task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            "events": 0, "rejected": 0, "live_dropped": 0,
+            "recomputes": 0, "cache_hits": 0, "cache_rebuilds": 0
+        }
+
+    def _term(self, weight: float, at: float) -> float:
+        return math.log(weight) + (at - self._epoch) / self.tau
+
+    def record(self, video_id: str, kind: str, amount: int = 1, at: Optional[float] = None,
+               buffered: bool = False) -> bool:
+        """
+        Add an interaction to a video's decayed score
+
+        Args:
+            video_id: Video ID (a scored candidate or a feed video; anything
+                else is ignored)
+            kind: 'view', 'like' or 'comment'
+            amount: Number of interactions (non-positive amounts are ignored;
+                unlikes are reconciled by the next bulk recompute)
+            at: Epoch seconds (default now)
+            buffered: The database write goes through counter_service, so it
+                only shows up in recomputes after the next flush
+
+        Returns:
+            True if the interaction was scored
+        """
+        weight = self.weights.get(kind, 0) * amount
+        if weight <= 0:
+            return False
+        if video_id not in self.videos and not feed_index_service.contains(video_id):
+            self.stats["rejected"] += 1
+            return False
+
+        at = at or time.time()
+        self.scores[video_id] = _logaddexp(self.scores.get(video_id, -math.inf), self._term(weight, at))
+        if self._recompute_task is not None:
+            if len(self._live_events) == self.max_live_events:
+                self.stats["live_dropped"] += 1
+            self._live_events.append((video_id, kind, at, buffered))
+        self.stats["events"] += 1
+        return True
+
+    async def recompute(self) -> int:
+        """
+        Rebuild scores from the database counts of recent videos
+
+        Stored counts are treated as having happened when the video was
+        created; interactions the database read can't include yet (recorded
+        since the recompute started, or still waiting for a counter flush)
+        are re-applied on top.
+
+        Returns:
+            Number of videos scored
+        """
+        started = time.time()
+        flushed_through = counter_service.flushed_through
+        rows = await supabase_http.select(
+            "videos", order="created_at.desc", limit=settings.TRENDING_CANDIDATES
+        )
+
+        scores: Dict[str, float] = {}
+        videos: Dict[str, Dict] = {}
+        for row in rows:
+            video_id = str(row["id"])
+            weight = (
+                1.0
+                + self.weights["view"] * (row.get("views_count") or row.get("views") or 0)
+                + self.weights["like"] * (row.get("likes_count") or row.get("likes") or 0)
+                + self.weights["comment"] * (row.get("comments_count") or 0)
+            )
+            scores[video_id] = self._term(weight, _timestamp(row.get("created_at")))
+            videos[video_id] = row
+
+        live = [
+            event for event in self._live_events
+            if event[2] >= started or (event[3] and event[2] >= flushed_through)
+        ]
+        self.scores, self.videos = scores, videos
+        self._live_events = deque(maxlen=self.max_live_events)
+        for video_id, kind, at, buffered in live:
+            self.record(video_id, kind, at=at, buffered=buffered)
+
+        self._top_built_at = 0.0
+        self.stats["recomputes"] += 1
+        return len(rows)
+
+    def get_top(self, limit: int) -> List[Dict]:
+        """
+        Trending videos, best first (no database access)
+
+        The top-K list is rebuilt with a heap at most every
+        TRENDING_CACHE_SECONDS.
+        """
+        now = time.monotonic()
+        if now - self._top_built_at > self.cache_seconds:
+            best = heapq.nlargest(
+                self.top_k,
+                (item for item in self.scores.items() if item[0] in self.videos),
+                key=lambda item: item[1]
+            )
+            self._top = [
+                {**self.videos[video_id], "trending_score": round(score, 4)}
+                for video_id, score in best
+            ]
+            self._top_built_at = now
+            self.stats["cache_rebuilds"] += 1
+        else:
+            self.stats["cache_hits"] += 1
+
+        return self._top[:limit]
+
+    async def _recompute_loop(self):
+        while True:
+            try:
+                await self.recompute()
+            except Exception as e:
+                logger.warning("Trending recompute failed: %s", e)
+            await asyncio.sleep(self.recompute_interval)
+
+    def start(self):
+        """Start the periodic bulk recompute"""
+        if self._recompute_task is None and self.recompute_interval > 0:
+            self._recompute_task = asyncio.create_task(self._recompute_loop())
+
+    async def stop(self):
+        """Stop the periodic recompute"""
+        if self._recompute_task:
+            self._recompute_task.cancel()
+            await asyncio.gather(self._recompute_task, return_exceptions=True)
+            self._recompute_task = None
+
+    def get_stats(self) -> dict:
+        """Get trending statistics"""
+        return {**self.stats, "scored_videos": len(self.scores), "candidates": len(self.videos)}
+
+
+# Singleton instance
+trending_service = TrendingService()
@@ -0,0 +1,355 @@
+"""
+TTL Cache
+Bounded in-process cache: LRU-ordered map with entry-count and byte budgets,
+a monotonic-clock expiry heap (O(log n) expiry, no full scans), an optional
+background sweeper and an optional SQLite second tier that survives restarts.
+
+The memory tier is synchronous. Disk I/O runs on one dedicated thread per
+cache (writes in order, never on the event loop): the disk tier is loaded
+into memory at startup, written behind on set/delete, and read on memory
+misses only through aget().
+"""
+import logging
+import asyncio
+import contextlib
+import heapq
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    __slots__ = ("value", "size", "expires_at")
+
+    def __init__(self, value: Any, size: int, expires_at: Optional[float]):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+
+
+class TTLCache:
+    """LRU + TTL cache with memory budgets and an optional disk tier"""
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 10000,
+        max_bytes: int = 16 * 1024 * 1024,
+        default_ttl: Optional[float] = 3600,
+        disk_path: Optional[str] = None
+    ):
+        """
+        Args:
+            name: Cache name (used in stats and as the disk table name)
+            max_entries: Max entries kept in memory (0 = unlimited)
+            max_bytes: Approximate memory budget for values (0 = unlimited)
+            default_ttl: Seconds until entries expire (None = never)
+            disk_path: SQLite file for the second tier (None = memory only);
+                relative paths are resolved against the backend directory
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # (expires_at, key) - stale heap items are skipped when popped
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._bytes = 0
+        self._sweeper: Optional[asyncio.Task] = None
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "disk_hits": 0,
+            "sets": 0,
+            "evictions": 0,
+            "expirations": 0
+        }
+
+        self.disk_path = None
+        self._disk: Optional[ThreadPoolExecutor] = None
+        if disk_path:
+            path = Path(disk_path)
+            if not path.is_absolute():
+                path = Path(__file__).parent.parent.parent / path
+            self.disk_path = str(path)
+            self._disk = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{name}-disk")
+            self._init_disk()
+            self._load_disk()
+
+    # Disk tier
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.disk_path, timeout=5, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_disk(self):
+        directory = os.path.dirname(self.disk_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS "{self.name}" (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL
+                )
+            """)
+
+    def _load_disk(self):
+        """Warm the memory tier with the most recently written disk entries (startup only)"""
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f'''SELECT key, value, expires_at FROM "{self.name}"
+                        WHERE expires_at IS NULL OR expires_at > ?
+                        ORDER BY rowid DESC LIMIT ?''',
+                    (time.time(), self.max_entries or -1)
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("%s disk cache load failed: %s", self.name, e)
+            return
+
+        # Oldest first, so the newest entries end up most recently used
+        for key, value, expires_at in reversed(rows):
+            ttl = expires_at - time.time() if expires_at is not None else None
+            self._store(key, json.loads(value), ttl)
+
+    def _disk_get(self, key: str) -> Tuple[bool, Any, Optional[float]]:
+        """Returns (found, value, remaining ttl)"""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    f'SELECT value, expires_at FROM "{self.name}" WHERE key = ?', (key,)
+                ).fetchone()
+                if not row:
+                    return False, None, None
+                value, expires_at = row
+                if expires_at is not None and expires_at <= time.time():
+                    conn.execute(f'DELETE FROM "{self.name}" WHERE key = ?', (key,))
+                    return False, None, None
+        except sqlite3.Error as e:
+            logger.warning("%s disk cache read failed: %s", self.name, e)
+            return False, None, None
+
+        ttl = expires_at - time.time() if expires_at is not None else None
+        return True, json.loads(value), ttl
+
+    def _disk_set(self, key: str, value: Any, ttl: Optional[float]):
+        # Disk expiry uses wall-clock time so it survives restarts
+        expires_at = time.time() + ttl if ttl is not None else None
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    f'INSERT OR REPLACE INTO "{self.name}" (key, value, expires_at) VALUES (?, ?, ?)',
+                    (key, json.dumps(value), expires_at)
+                )
+        except sqlite3.Error as e:
+            logger.warning("%s disk cache write failed: %s", self.name, e)
+
+    def _disk_delete(self, key: str):
+        try:
+            with self._connect() as conn:
+                conn.execute(f'DELETE FROM "{self.name}" WHERE key = ?', (key,))
+        except sqlite3.Error as e:
+            logger.warning("%s disk cache delete failed: %s", self.name, e)
+
+    # Memory tier
+
+    @staticmethod
+    def _size_of(key: str, value: Any) -> int:
+        if isinstance(value, (bytes, bytearray)):
+            payload = len(value)
+        elif isinstance(value, str):
+            payload = len(value)
+        else:
+            payload = len(json.dumps(value, default=str))
+        # Rough per-entry overhead of the dict slot, key and entry object
+        return payload + len(key) + 200
+
+    def _remove(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._bytes -= entry.size
+        return entry
+
+    def _store(self, key: str, value: Any, ttl: Optional[float]):
+        self._remove(key)
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        entry = _Entry(value, self._size_of(key, value), expires_at)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        if expires_at is not None:
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+
+        # Evict least recently used until back within budget
+        while self._entries and (
+            (self.max_entries and len(self._entries) > self.max_entries)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._entries))
+            if oldest == key and len(self._entries) == 1:
+                break
+            self._remove(oldest)
+            self.stats["evictions"] += 1
+
+    def _memory_get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at is None or entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return True, entry.value
+            self._remove(key)
+            self.stats["expirations"] += 1
+        return False, None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a value from memory (never touches disk); expired entries count as misses"""
+        found, value = self._memory_get(key)
+        if found:
+            return value
+        self.stats["misses"] += 1
+        return default
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        """Get a value, falling back to the disk tier (read off the event loop) on a memory miss"""
+        found, value = self._memory_get(key)
+        if found:
+            return value
+
+        if self._disk:
+            found, value, ttl = await asyncio.get_running_loop().run_in_executor(
+                self._disk, self._disk_get, key
+            )
+            if found:
+                self._store(key, value, ttl)
+                self.stats["disk_hits"] += 1
+                return value
+
+        self.stats["misses"] += 1
+        return default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = -1):
+        """
+        Store a value
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value (when a disk tier is configured)
+            ttl: Seconds to live; None = never expires; default = default_ttl
+        """
+        if ttl == -1:
+            ttl = self.default_ttl
+        self._store(key, value, ttl)
+        if self._disk:
+            self._disk.submit(self._disk_set, key, value, ttl)
+        self.stats["sets"] += 1
+
+    def delete(self, key: str):
+        """Remove a key from both tiers"""
+        self._remove(key)
+        if self._disk:
+            self._disk.submit(self._disk_delete, key)
+
+    def sweep(self) -> int:
+        """
+        Drop expired memory entries by popping the expiry heap
+
+        Returns:
+            Number of entries expired
+        """
+        now = time.monotonic()
+        expired = 0
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry_heap)
+            entry = self._entries.get(key)
+            # Skip heap items left behind by overwrites/evictions
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+                expired += 1
+
+        # Heap items of evicted/overwritten keys pile up; rebuild when mostly stale
+        if len(self._expiry_heap) > 2 * len(self._entries) + 64:
+            self._expiry_heap = [
+                (entry.expires_at, key) for key, entry in self._entries.items()
+                if entry.expires_at is not None
+            ]
+            heapq.heapify(self._expiry_heap)
+
+        if self._disk:
+            self._disk.submit(self._disk_sweep)
+
+        self.stats["expirations"] += expired
+        return expired
+
+    def _disk_sweep(self):
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    f'DELETE FROM "{self.name}" WHERE expires_at IS NOT NULL AND expires_at <= ?',
+                    (time.time(),)
+                )
+        except sqlite3.Error as e:
+            logger.warning("%s disk cache sweep failed: %s", self.name, e)
+
+    async def flush(self):
+        """Wait until queued disk writes have been applied"""
+        if self._disk:
+            await asyncio.get_running_loop().run_in_executor(self._disk, lambda: None)
+
+    async def _sweep_loop(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            self.sweep()
+
+    def start_sweeper(self, interval: float):
+        """Expire entries in the background every `interval` seconds"""
+        if self._sweeper is None and interval > 0:
+            self._sweeper = asyncio.create_task(self._sweep_loop(interval))
+
+    async def stop_sweeper(self):
+        """Stop the background sweeper and flush pending disk writes"""
+        if self._sweeper:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        await self.flush()
+
+    def values(self) -> List[Tuple[str, Any, Optional[float]]]:
+        """(key, value, monotonic expiry) for every entry in memory, LRU first"""
+        return [(key, entry.value, entry.expires_at) for key, entry in self._entries.items()]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        """Unexpired key in memory (no stats, no LRU update)"""
+        entry = self._entries.get(key)
+        return entry is not None and (entry.expires_at is None or entry.expires_at > time.monotonic())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.stats["hits"] + self.stats["disk_hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_ratio": round((self.stats["hits"] + self.stats["disk_hits"]) / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "disk_tier": bool(self.disk_path)
+        }
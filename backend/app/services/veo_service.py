@@ -1,36 +1,41 @@
 """
 Veo3 Video Generation Service using Google GenAI SDK
 """
+import logging
 import asyncio
 import time
 import os
 from typing import Optional
-from google import genai
 from ..config import settings
+from . import providers
+from .metrics import metrics
+from .media_bus_service import media_bus_service
+from .resilience_service import resilience_service, CircuitOpenError
+
+logger = logging.getLogger(__name__)
 
 
 class VeoService:
     """Service for generating videos using Google Veo3"""
     
+    MAX_WAIT_SECONDS = 180  # Veo3 can be slow
+    
     def __init__(self):
         """Initialize Veo service"""
         self.use_fast = settings.USE_VEO3_FAST
         self.default_duration = settings.VIDEO_DURATION
     
     def _get_client(self):
-        """Get or create GenAI client with fresh API key"""
-        # Always get fresh API key from settings
-        api_key = settings.GEMINI_API_KEY
-        if api_key:
-            os.environ['GOOGLE_API_KEY'] = api_key
-        # Create new client each time to ensure fresh API key
-        return genai.Client(api_key=api_key)
+        """GenAI client (fresh API key each time, or the fake provider)"""
+        return providers.genai_client()
     
+    @metrics.timed("veo.generate")
     async def generate_video(
         self,
         prompt: str,
         duration: int = None,
-        aspect_ratio: str = "16:9"
+        aspect_ratio: str = "16:9",
+        video_id: Optional[str] = None
     ) -> Optional[str]:
         """
         Generate a video using Veo3 with Google GenAI SDK
@@ -39,12 +44,16 @@ class VeoService:
             prompt: Text description of the video
             duration: Video duration in seconds (ignored for now)
             aspect_ratio: Video aspect ratio (ignored for now)
+            video_id: Storage UUID to use, so callers can wait on
+                'video:<video_id>' on the media bus before it exists
         
         Returns:
             Video file path or None if generation fails
         """
-        if not settings.GEMINI_API_KEY:
-            print("⚠️  No Gemini API key configured for Veo3")
+        if not providers.ai_configured():
+            logger.warning("No Gemini API key configured for Veo3")
+            if video_id:
+                media_bus_service.publish(f"video:{video_id}", None)
             return None
         
         try:
@@ -53,106 +62,101 @@ class VeoService:
             # Use veo-3.1-fast-generate-preview model
             model = "veo-3.1-fast-generate-preview"
             
-            print(f"🎬 Generating video with {model}")
-            print(f"📝 Prompt: {prompt[:100]}...")
-            
-            # Start video generation
-            # Note: Resolution config not available in current API version
-            operation = client.models.generate_videos(
-                model=model,
-                prompt=prompt
-            )
-            
-            print(f"⏳ Video generation started, polling for completion...")
+            logger.info("Generating video with %s", model)
+            logger.debug("Prompt: %s...", prompt[:100])
             
-            # Poll for completion (run in thread pool to not block)
-            loop = asyncio.get_event_loop()
-            video_path = await loop.run_in_executor(
-                None,
-                self._wait_for_video,
-                client,
-                operation
-            )
+            async def generate():
+                # Start video generation
+                # Note: Resolution config not available in current API version
+                operation = await asyncio.to_thread(
+                    client.models.generate_videos,
+                    model=model,
+                    prompt=prompt
+                )
+                
+                logger.info("Video generation started, polling for completion...")
+                
+                # Poll for completion (run in thread pool to not block)
+                loop = asyncio.get_event_loop()
+                video_path = await loop.run_in_executor(
+                    None,
+                    self._wait_for_video,
+                    client,
+                    operation,
+                    video_id
+                )
+                if not video_path:
+                    raise RuntimeError("Veo returned no video")
+                return await self._upload_video(video_path, video_id or os.path.basename(video_path)[:-4])
             
-            return video_path
-                    
+            # Breaker only: polling has its own time limit
+            return await resilience_service.call("veo", generate)
+        
+        except CircuitOpenError as e:
+            logger.info("Skipping video generation: %s", e)
+            if video_id:
+                media_bus_service.publish(f"video:{video_id}", None)
+            return None
         except Exception as e:
-            print(f"❌ Veo3 video generation error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Veo3 video generation error: %s", e)
+            if video_id:
+                media_bus_service.publish(f"video:{video_id}", None)
             return None
     
-    def _wait_for_video(self, client, operation):
-        """Wait for video generation to complete and upload to Supabase (blocking)"""
-        max_wait = 180  # 3 minutes max (Veo3 can be slow)
+    def _wait_for_video(self, client, operation, video_id: Optional[str] = None):
+        """Wait for video generation to complete and download it to a temp file (blocking)"""
+        max_wait = self.MAX_WAIT_SECONDS
         start_time = time.time()
         
         while not operation.done:
             elapsed = time.time() - start_time
             if elapsed > max_wait:
-                print(f"⏱️  Video generation timeout after {max_wait}s")
+                logger.info("Video generation timeout after %ss", max_wait)
                 return None
             
-            print(f"⏳ Waiting... ({int(elapsed)}s)")
+            logger.info("Waiting... (%ss)", int(elapsed))
             time.sleep(10)
             operation = client.operations.get(operation)
         
-        # Download and upload the generated video
+        # Download the generated video
         try:
             generated_video = operation.response.generated_videos[0]
             
             # Save to temp file first
             import uuid
             
-            video_id = str(uuid.uuid4())
+            video_id = video_id or str(uuid.uuid4())
             temp_path = f"/tmp/{video_id}.mp4"
             
             client.files.download(file=generated_video.video)
             generated_video.video.save(temp_path)
             
-            print(f"✅ Video downloaded to {temp_path}")
-            
-            # Upload to Supabase
-            from ..services.supabase_service import supabase_service
-            
-            with open(temp_path, 'rb') as f:
-                video_data = f.read()
-            
-            # Upload to Supabase storage
-            file_path = f"{video_id}.mp4"
-            
-            try:
-                result = supabase_service.client.storage.from_(settings.SUPABASE_BUCKET).upload(
-                    file_path,
-                    video_data,
-                    file_options={"content-type": "video/mp4"}
-                )
-                
-                if result:
-                    # Get public URL
-                    video_url = supabase_service.client.storage.from_(settings.SUPABASE_BUCKET).get_public_url(file_path)
-                    print(f"✅ Video uploaded to Supabase: {video_url}")
-                    
-                    # Clean up temp file
-                    import os
-                    os.remove(temp_path)
-                    
-                    return video_url
-                else:
-                    print(f"❌ Failed to upload to Supabase")
-                    return None
-                    
-            except Exception as upload_error:
-                print(f"❌ Supabase upload error: {upload_error}")
-                print(f"⚠️  Returning local file path as fallback")
-                return temp_path
+            logger.info("Video downloaded to %s", temp_path)
+            return temp_path
             
         except Exception as e:
-            print(f"❌ Error processing video: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error processing video: %s", e)
             return None
     
+    async def _upload_video(self, temp_path: str, video_id: str) -> str:
+        """Upload a downloaded video to Supabase and wake anyone waiting on it"""
+        from ..services.supabase_service import supabase_service
+        
+        with open(temp_path, 'rb') as f:
+            video_data = await asyncio.to_thread(f.read)
+        
+        video_url = await supabase_service.upload_video_file(f"{video_id}.mp4", video_data)
+        if not video_url:
+            # Clients can't play a local path: waiters on the bus see a failure
+            logger.warning("Returning local file path as fallback")
+            media_bus_service.publish(f"video:{video_id}", None)
+            return temp_path
+        
+        logger.info("Video uploaded to Supabase: %s", video_url)
+        media_bus_service.publish(f"video:{video_id}", video_url)
+        os.remove(temp_path)
+        return video_url
+    
     async def _poll_for_video(
         self,
         operation_name: str,
@@ -179,7 +183,7 @@ class VeoService:
                     )
                     
                     if response.status_code != 200:
-                        print(f"⚠️  Poll attempt {attempt + 1} failed: {response.status_code}")
+                        logger.warning("Poll attempt %s failed: %s", attempt + 1, response.status_code)
                         await asyncio.sleep(poll_interval)
                         continue
                     
@@ -188,21 +192,21 @@ class VeoService:
                     # Check if done
                     if data.get("done"):
                         if "response" in data and "videoUrl" in data["response"]:
-                            print(f"✅ Video generated successfully after {attempt + 1} attempts")
+                            logger.info("Video generated successfully after %s attempts", attempt + 1)
                             return data["response"]["videoUrl"]
                         elif "error" in data:
-                            print(f"❌ Video generation failed: {data['error']}")
+                            logger.error("Video generation failed: %s", data['error'])
                             return None
                     
                     # Still processing
-                    print(f"⏳ Video generation in progress... ({attempt + 1}/{max_attempts})")
+                    logger.info("Video generation in progress... (%s/%s)", attempt + 1, max_attempts)
                     await asyncio.sleep(poll_interval)
                     
                 except Exception as e:
-                    print(f"⚠️  Poll error on attempt {attempt + 1}: {e}")
+                    logger.warning("Poll error on attempt %s: %s", attempt + 1, e)
                     await asyncio.sleep(poll_interval)
         
-        print(f"❌ Video generation timed out after {max_attempts} attempts")
+        logger.error("Video generation timed out after %s attempts", max_attempts)
         return None
     
     async def generate_video_for_cards(
@@ -232,15 +236,15 @@ class VeoService:
                 result = result.replace('_', white_text, 1)
             prompt = f"A humorous short video scene: {result}"
         
-        print(f"🎬 Generating video with prompt: {prompt[:100]}...")
+        logger.info("Generating video with prompt: %s...", prompt[:100])
         
         # Generate video
         video_url = await self.generate_video(prompt)
         
         if video_url:
-            print(f"✅ Video URL: {video_url}")
+            logger.info("Video URL: %s", video_url)
         else:
-            print(f"❌ Failed to generate video")
+            logger.error("Failed to generate video")
         
         return video_url
 
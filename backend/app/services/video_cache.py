@@ -1,72 +1,71 @@
 from typing import Optional
-import hashlib
-import json
-from datetime import datetime, timedelta
+import time
+from ..config import settings
+from .ttl_cache import TTLCache
+from .combination_key import combination_key
 
 
 class VideoCache:
-    """In-memory video cache"""
-    
+    """Bounded video URL cache (LRU + TTL in memory, SQLite second tier)"""
+
     def __init__(self):
-        self.cache_duration_seconds = 86400  # 24 hours
-        self.memory_cache: dict = {}
-        # Silent initialization - no Redis needed
-    
-    def _generate_key(self, black_card: str, white_cards: list) -> str:
-        """Generate a cache key from card combination"""
-        combination = json.dumps({
-            "black": black_card,
-            "white": sorted(white_cards)
-        }, sort_keys=True)
-        hash_key = hashlib.sha256(combination.encode()).hexdigest()
-        return f"video:{hash_key}"
-    
-    def get(self, black_card: str, white_cards: list) -> Optional[str]:
-        """Get cached video URL if exists"""
-        key = self._generate_key(black_card, white_cards)
-        
-        if key in self.memory_cache:
-            entry = self.memory_cache[key]
-            if datetime.utcnow() < entry["expires_at"]:
-                return entry["video_url"]
-            else:
-                del self.memory_cache[key]
-        
-        return None
-    
-    def set(self, black_card: str, white_cards: list, video_url: str, 
-            permanent: bool = False):
+        self.cache_duration_seconds = settings.VIDEO_CACHE_TTL_SECONDS
+        self.cache = TTLCache(
+            "video_cache",
+            max_entries=settings.VIDEO_CACHE_MAX_ENTRIES,
+            max_bytes=settings.VIDEO_CACHE_MAX_BYTES,
+            default_ttl=self.cache_duration_seconds,
+            disk_path=settings.VIDEO_CACHE_DISK_PATH or None
+        )
+
+    def _generate_key(self, black_card: str, white_cards: list, key: Optional[str] = None) -> str:
+        """Cache key for a card combination (a precomputed combination key wins)"""
+        return f"video:{key or combination_key(black_card, white_cards)}"
+
+    def get(self, black_card: str, white_cards: list, key: Optional[str] = None) -> Optional[str]:
+        """Get cached video URL if exists (memory tier only)"""
+        entry = self.cache.get(self._generate_key(black_card, white_cards, key))
+        return entry["video_url"] if entry else None
+
+    async def aget(self, black_card: str, white_cards: list, key: Optional[str] = None) -> Optional[str]:
+        """Get cached video URL, also checking the disk tier"""
+        entry = await self.cache.aget(self._generate_key(black_card, white_cards, key))
+        return entry["video_url"] if entry else None
+
+    def set(self, black_card: str, white_cards: list, video_url: str,
+            permanent: bool = False, key: Optional[str] = None):
         """Cache a video URL"""
-        key = self._generate_key(black_card, white_cards)
-        
-        expires_at = datetime.max if permanent else datetime.utcnow() + timedelta(seconds=self.cache_duration_seconds)
-        self.memory_cache[key] = {
-            "video_url": video_url,
-            "created_at": datetime.utcnow(),
-            "expires_at": expires_at,
-            "permanent": permanent
-        }
-    
+        key = self._generate_key(black_card, white_cards, key)
+        self.cache.set(
+            key,
+            {"video_url": video_url, "created_at": time.time(), "permanent": permanent},
+            ttl=None if permanent else self.cache_duration_seconds
+        )
+
     def clear_expired(self):
         """Remove expired cache entries"""
-        now = datetime.utcnow()
-        expired_keys = [
-            key for key, entry in self.memory_cache.items()
-            if now >= entry["expires_at"]
-        ]
-        for key in expired_keys:
-            del self.memory_cache[key]
-    
+        self.cache.sweep()
+
+    def start(self):
+        """Start the background expiry sweeper"""
+        self.cache.start_sweeper(settings.CACHE_SWEEP_INTERVAL)
+
+    async def stop(self):
+        """Stop the background expiry sweeper"""
+        await self.cache.stop_sweeper()
+
     def get_stats(self) -> dict:
         """Get cache statistics"""
-        total = len(self.memory_cache)
-        permanent = sum(1 for entry in self.memory_cache.values() if entry["permanent"])
-        
+        entries = self.cache.values()
+        total = len(entries)
+        permanent = sum(1 for _, value, _ in entries if value["permanent"])
+
         return {
             "total_entries": total,
             "permanent_entries": permanent,
             "temporary_entries": total - permanent,
-            "cache_type": "memory"
+            "cache_type": "memory+disk" if self.cache.disk_path else "memory",
+            **self.cache.get_stats()
         }
 
 
@@ -1,3 +1,4 @@
 from .events import register_socket_events
+from .server import InstrumentedAsyncServer
 
-__all__ = ["register_socket_events"]
+__all__ = ["register_socket_events", "InstrumentedAsyncServer"]
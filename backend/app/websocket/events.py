@@ -1,18 +1,29 @@
+import logging
 import socketio
 import json
 import random
-from typing import Optional
+import uuid
+from typing import Dict, List, Optional
 from ..services.game_service import game_service
 from ..services.card_service import card_service
 from ..services.video_cache import video_cache
 from ..services.ai_service import ai_service
 from ..services.supabase_service import supabase_service
 from ..services.veo_service import veo_service
-from ..services.content_moderator import content_moderator
+from ..services.prompt_bank_service import prompt_bank_service
+from ..services.speculative_media_service import speculative_media_service
+from ..services.speculative_video_service import speculative_video_service
+from ..services.round_plan_service import round_plan_service
+from ..services.job_queue_service import job_queue_service
+from ..services.media_bus_service import media_bus_service
 from ..models.player import Player, AIPlayer, PlayerType
-from ..models.game import GameState
+from ..models.game import GameState, Round
+from ..services.metrics import metrics, round_stage_seconds
 from ..config import settings
 import asyncio
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
 
 
 def safe_emit_data(data):
@@ -22,13 +33,162 @@ def safe_emit_data(data):
         json_str = json.dumps(data, default=str)
         return json.loads(json_str)
     except Exception as e:
-        print(f"❌ Failed to serialize data: {e}")
+        logger.error("Failed to serialize data: %s", e)
         return {}
 
 
+def observe_round_stage(round_: Optional[Round], stage: str):
+    """Record the time from round start to a lifecycle event"""
+    if round_:
+        elapsed = (datetime.utcnow() - round_.started_at).total_seconds()
+        round_stage_seconds.observe(elapsed, stage=stage)
+
+
 def register_socket_events(sio: socketio.AsyncServer):
     """Register all Socket.IO event handlers"""
     
+    async def push_job_update(job: dict):
+        """Push background job status/progress to subscribed clients"""
+        await sio.emit('job_update', safe_emit_data(job), room=f"job:{job['job_id']}")
+    
+    job_queue_service.add_listener(push_job_update)
+    
+    def start_speculative_media(game_id: str, player_id: str):
+        """Start image + audio generation for a submission while others are still playing"""
+        game = game_service.get_game(game_id)
+        if not game or not game.current_round:
+            return
+        
+        submission = next(
+            (sub for sub in game.current_round.submissions if sub.player_id == player_id),
+            None
+        )
+        black_card = card_service.get_black_card(game.current_round.black_card_id)
+        if not submission or not black_card:
+            return
+        
+        white_cards = [card_service.get_white_card(cid) for cid in submission.card_ids]
+        speculative_media_service.start(
+            game_id,
+            game.current_round.round_number,
+            player_id,
+            black_card.text,
+            [c.text for c in white_cards if c],
+            combo_key=submission.combo_key
+        )
+    
+    def start_speculative_videos(
+        game_id: str,
+        preferred_index: Optional[int] = None,
+        ranking: Optional[List[int]] = None
+    ):
+        """Warm-start winner videos for the likeliest winners while the czar judges"""
+        game = game_service.get_game(game_id)
+        if not game or not game.current_round:
+            return
+        
+        black_card = card_service.get_black_card(game.current_round.black_card_id)
+        if not black_card:
+            return
+        
+        candidates = []
+        for sub in game.current_round.submissions:
+            white_cards = [card_service.get_white_card(cid) for cid in sub.card_ids]
+            candidates.append((sub.player_id, [c.text for c in white_cards if c], sub.combo_key))
+        
+        video_ids = speculative_video_service.start(
+            game_id,
+            game.current_round.round_number,
+            black_card.text,
+            candidates,
+            preferred_index=preferred_index,
+            ranking=ranking
+        )
+        
+        # The winner path waits on 'video:<video_id>' on the media bus
+        for sub in game.current_round.submissions:
+            if sub.player_id in video_ids:
+                sub.video_id = video_ids[sub.player_id]
+    
+    def finish_speculative_round(game_id: str, round_number: int):
+        """Release a finished round's leftover speculative jobs (all of them once the game is over)"""
+        game = game_service.get_game(game_id)
+        if not game or game.state == GameState.GAME_END:
+            speculative_media_service.cancel_game(game_id)
+            speculative_video_service.cancel_game(game_id)
+        else:
+            speculative_media_service.end_round(game_id, round_number)
+            speculative_video_service.end_round(game_id, round_number)
+    
+    @metrics.timed("plan.deal")
+    async def plan_ai_plays(game_id: str) -> Dict[str, List[str]]:
+        """Card choices for every AI player still to play, from one shared deal plan"""
+        game = game_service.get_game(game_id)
+        if not game or not game.current_round:
+            return {}
+        
+        black_card = card_service.get_black_card(game.current_round.black_card_id)
+        submitted = {sub.player_id for sub in game.current_round.submissions}
+        bots = []
+        for pid in game.players:
+            player = game_service.get_player(pid)
+            if (not player or player.type != PlayerType.AI or pid in submitted
+                    or pid == game.current_round.czar_id):
+                continue
+            hand = [card_service.get_white_card(cid) for cid in player.hand]
+            bots.append({
+                "player_id": pid,
+                "personality": player.personality if isinstance(player, AIPlayer) else "absurd",
+                "hand": [{"id": c.id, "text": c.text} for c in hand if c]
+            })
+        
+        return await round_plan_service.deal(
+            game_id,
+            game.current_round.round_number,
+            black_card.id,
+            black_card.text,
+            black_card.pick,
+            bots
+        )
+    
+    @metrics.timed("plan.judging")
+    async def plan_judging(game_id: str, personality: str = "absurd") -> Optional[List[int]]:
+        """
+        Rank the round's submissions with one shared judging plan, which also
+        banks prompts for submissions that have none yet
+        
+        Returns:
+            Submission indices best first, or None if the plan failed
+        """
+        game = game_service.get_game(game_id)
+        if not game or not game.current_round:
+            return None
+        
+        round_number = game.current_round.round_number
+        black_card = card_service.get_black_card(game.current_round.black_card_id)
+        submissions_data = []
+        for sub in game.current_round.submissions:
+            cards = [card_service.get_white_card(cid) for cid in sub.card_ids]
+            submissions_data.append({
+                "cards": [c.text for c in cards if c],
+                "combo_key": sub.combo_key,
+                "needs_prompt": (
+                    not prompt_bank_service.has(sub.combo_key)
+                    and not speculative_media_service.has_job(game_id, round_number, sub.player_id)
+                )
+            })
+        
+        plan = await round_plan_service.judging(
+            game_id, round_number, black_card.text, submissions_data, personality
+        )
+        return plan.ranking
+    
+    async def start_planned_speculative_videos(game_id: str):
+        """Warm-start winner videos in the order of the judging plan (human czars)"""
+        ranking = await plan_judging(game_id)
+        start_speculative_videos(game_id, ranking=ranking)
+    
+    @metrics.timed("ai.submission")
     async def handle_ai_player_submission(game_id: str, player_id: str):
         """Handle a single AI player's card submission with 30s delay"""
         game = game_service.get_game(game_id)
@@ -45,7 +205,7 @@ def register_socket_events(sio: socketio.AsyncServer):
             return
         
         # AI submits instantly (no wait time for hackathon demo)
-        print(f"🤖 AI player {player.name} selecting cards...")
+        logger.info("AI player %s selecting cards...", player.name)
         
         # Re-check game state after delay
         game = game_service.get_game(game_id)
@@ -57,15 +217,20 @@ def register_socket_events(sio: socketio.AsyncServer):
         white_cards = [card_service.get_white_card(cid) for cid in player.hand]
         white_cards_dict = [{"id": c.id, "text": c.text} for c in white_cards if c]
         
-        selected_ids = await ai_service.select_cards(
-            black_card.text,
-            white_cards_dict,
-            black_card.pick,
-            player.personality if isinstance(player, AIPlayer) else "absurd"
-        )
+        # One deal plan covers every AI player; fall back to choosing alone
+        selected_ids = (await plan_ai_plays(game_id)).get(player_id)
+        if not selected_ids or not all(cid in player.hand for cid in selected_ids):
+            selected_ids = await ai_service.select_cards(
+                black_card.text,
+                white_cards_dict,
+                black_card.pick,
+                player.personality if isinstance(player, AIPlayer) else "absurd"
+            )
         
         # Submit cards
         if game_service.submit_cards(game_id, player_id, selected_ids):
+            start_speculative_media(game_id, player_id)
+            
             await sio.emit('cards_submitted', {
                 'player_id': player_id,
                 'player_name': player.name,
@@ -83,10 +248,16 @@ def register_socket_events(sio: socketio.AsyncServer):
                 
                 # Check if entered judging phase
                 if game.state == GameState.JUDGING:
-                    print(f"🎨 AI submission triggered judging phase, generating media")
+                    logger.info("AI submission triggered judging phase, generating media")
                     await sio.emit('judging_phase', {}, room=game_id)
+                    observe_round_stage(game.current_round, 'judging_phase')
                     asyncio.create_task(generate_all_submission_media(game_id))
-    
+
+                    # Trigger AI czar to judge (the last submission may be an AI's)
+                    czar = game_service.get_player(game.current_round.czar_id)
+                    if czar and czar.type == PlayerType.AI:
+                        asyncio.create_task(handle_ai_turns(game_id))
+
     async def handle_ai_turns(game_id: str):
         """Handle AI player turns (submissions and judging) - all in parallel"""
         game = game_service.get_game(game_id)
@@ -115,26 +286,34 @@ def register_socket_events(sio: socketio.AsyncServer):
             
             czar = game_service.get_player(game.current_round.czar_id)
             if czar and czar.type == PlayerType.AI:
-                # AI judges after waiting for media to generate and for humans to view
-                print(f"🤖 AI Czar waiting for media generation and human review...")
-                await asyncio.sleep(30)  # Wait 30 seconds for media + human viewing time
-                
-                black_card = card_service.get_black_card(game.current_round.black_card_id)
-                submissions_data = []
-                for sub in game.current_round.submissions:
-                    cards = [card_service.get_white_card(cid) for cid in sub.card_ids]
-                    submissions_data.append({
-                        "cards": [c.text for c in cards if c]
-                    })
+                # AI decides up front (text only) so the winner video can start early
+                personality = czar.personality if isinstance(czar, AIPlayer) else "absurd"
+                ranking = await plan_judging(game_id, personality)
+                if ranking:
+                    winner_index = ranking[0]
+                else:
+                    black_card = card_service.get_black_card(game.current_round.black_card_id)
+                    submissions_data = []
+                    for sub in game.current_round.submissions:
+                        cards = [card_service.get_white_card(cid) for cid in sub.card_ids]
+                        submissions_data.append({
+                            "cards": [c.text for c in cards if c]
+                        })
+                    
+                    winner_index = await ai_service.judge_submissions(
+                        black_card.text,
+                        submissions_data,
+                        personality
+                    )
+                start_speculative_videos(game_id, preferred_index=winner_index)
                 
-                winner_index = await ai_service.judge_submissions(
-                    black_card.text,
-                    submissions_data,
-                    czar.personality if isinstance(czar, AIPlayer) else "absurd"
-                )
+                # AI announces after waiting for media to generate and for humans to view
+                logger.info("AI Czar waiting for media generation and human review...")
+                await asyncio.sleep(settings.AI_CZAR_DELAY_SECONDS)  # Media + human viewing time
                 
                 # Select winner
                 if game_service.select_winner(game_id, game.current_round.czar_id, winner_index):
+                    round_number = game.current_round.round_number
                     winner_sub = game.current_round.submissions[winner_index]
                     winner = game_service.get_player(winner_sub.player_id)
                     
@@ -143,6 +322,7 @@ def register_socket_events(sio: socketio.AsyncServer):
                         'winner_name': winner.name,
                         'submission_index': winner_index
                     }, room=game_id)
+                    observe_round_stage(game.current_round, 'winner_selected')
                     
                     # Send updated game state to all players
                     game = game_service.get_game(game_id)
@@ -157,7 +337,8 @@ def register_socket_events(sio: socketio.AsyncServer):
                     asyncio.create_task(generate_winner_video(game_id, winner_index))
                     
                     # Auto-advance to next round after delay
-                    await asyncio.sleep(5)
+                    await asyncio.sleep(settings.ROUND_ADVANCE_DELAY_SECONDS)
+                    finish_speculative_round(game_id, round_number)
                     game = game_service.get_game(game_id)
                     if game and game.state != GameState.GAME_END:
                         game_service.end_round(game_id)
@@ -178,77 +359,80 @@ def register_socket_events(sio: socketio.AsyncServer):
                             # Trigger AI players for new round
                             asyncio.create_task(handle_ai_turns(game_id))
     
+    @metrics.timed("media.all_submissions")
     async def generate_all_submission_media(game_id: str):
         """Generate images + audio for all submissions in parallel during judging phase"""
-        print(f"🎨 Starting parallel image + audio generation for all submissions in game {game_id}")
+        logger.info("Starting parallel image + audio generation for all submissions in game %s", game_id)
         game = game_service.get_game(game_id)
         if not game or not game.current_round:
-            print(f"❌ Game or round not found")
+            logger.error("Game or round not found")
             return
         
         try:
             black_card = card_service.get_black_card(game.current_round.black_card_id)
             
+            # Human czars: warm up videos for the best-ranked candidates
+            czar = game_service.get_player(game.current_round.czar_id)
+            if not czar or czar.type != PlayerType.AI:
+                asyncio.create_task(start_planned_speculative_videos(game_id))
+            
             # Create tasks for all submissions (images + audio only)
             tasks = []
             for idx, submission in enumerate(game.current_round.submissions):
-                task = generate_submission_media(game_id, idx, black_card, submission)
+                task = generate_submission_media(game_id, game.current_round.round_number, idx, black_card, submission)
                 tasks.append(task)
             
             # Run all media generations in parallel
-            print(f"🚀 Launching {len(tasks)} parallel image + audio generation tasks")
+            logger.info("Launching %s parallel image + audio generation tasks", len(tasks))
             results = await asyncio.gather(*tasks, return_exceptions=True)
             
             # Log results
             successful = sum(1 for r in results if r and not isinstance(r, Exception))
-            print(f"✅ Completed {successful}/{len(tasks)} image + audio generations")
+            logger.info("Completed %s/%s image + audio generations", successful, len(tasks))
             
         except Exception as e:
-            print(f"❌ Error in parallel video generation: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in parallel video generation: %s", e)
     
     async def fetch_and_send_all_videos(game_id: str):
         """Fetch all submission videos and send to players"""
-        print(f"📹 Fetching all submission videos for game {game_id}")
+        logger.info("Fetching all submission videos for game %s", game_id)
         game = game_service.get_game(game_id)
         if not game or not game.current_round:
             return
         
         try:
-            # Fetch videos for all submissions in parallel
-            video_tasks = []
+            # Wait for all submission videos in parallel, under one shared deadline
+            video_results = {}
+            waits = {}
             for idx, submission in enumerate(game.current_round.submissions):
                 video_id = getattr(submission, 'video_id', None)
                 if video_id:
-                    task = wait_for_video_ready(video_id, timeout=settings.VIDEO_FETCH_TIMEOUT)
-                    video_tasks.append((idx, task))
-                else:
-                    video_tasks.append((idx, None))
-            
-            # Wait for all videos
-            video_results = {}
-            for idx, task in video_tasks:
-                if task:
-                    video_url = await task
-                    video_results[idx] = video_url
+                    waits[idx] = wait_for_video_ready(video_id, timeout=settings.VIDEO_FETCH_TIMEOUT)
                 else:
                     video_results[idx] = settings.VIDEO_PLACEHOLDER_URL
             
+            urls = await asyncio.gather(*waits.values(), return_exceptions=True)
+            for idx, video_url in zip(waits, urls):
+                video_results[idx] = None if isinstance(video_url, BaseException) else video_url
+            
             # Send video URLs to all players
             await sio.emit('submission_videos_ready', {
-                'videos': video_results
+                'videos': dict(sorted(video_results.items()))
             }, room=game_id)
             
-            print(f"✅ Sent {len(video_results)} video URLs to players")
+            logger.info("Sent %s video URLs to players", len(video_results))
             
         except Exception as e:
-            print(f"❌ Error fetching submission videos: {e}")
+            logger.error("Error fetching submission videos: %s", e)
     
+    @metrics.timed("video.wait")
     async def wait_for_video_ready(video_uuid: str, timeout: int = 90) -> Optional[str]:
         """
         Wait for video to be ready in Supabase storage with timeout
         
+        Veo publishes 'video:<uuid>' on the media bus as soon as the upload
+        finishes; storage is only checked as a slow backoff fallback.
+        
         Args:
             video_uuid: UUID of the video
             timeout: Maximum seconds to wait (default 90)
@@ -257,34 +441,25 @@ def register_socket_events(sio: socketio.AsyncServer):
             Video URL if ready, placeholder URL if timeout/failed
         """
         start_time = asyncio.get_event_loop().time()
-        check_interval = 15  # Check every 15 seconds
+        logger.info("Waiting for video %s (timeout: %ss)", video_uuid, timeout)
+        
+        async def check_storage() -> Optional[str]:
+            if await supabase_service.check_video_exists(video_uuid):
+                return await supabase_service.get_video_url_by_uuid(video_uuid)
+            return None
+        
+        url = await media_bus_service.wait(f"video:{video_uuid}", timeout, fallback=check_storage)
+        elapsed = asyncio.get_event_loop().time() - start_time
         
-        print(f"⏳ Waiting for video {video_uuid} (timeout: {timeout}s, checking every {check_interval}s)")
+        if not url:
+            logger.info("No video %s after %.1fs, using placeholder", video_uuid, elapsed)
+            return settings.VIDEO_PLACEHOLDER_URL
         
-        while True:
-            elapsed = asyncio.get_event_loop().time() - start_time
-            
-            if elapsed >= timeout:
-                print(f"⏱️  Timeout waiting for video {video_uuid} after {timeout}s")
-                print(f"🖼️  Using placeholder for failed video")
-                return settings.VIDEO_PLACEHOLDER_URL
-            
-            # Check if video exists in Supabase
-            print(f"🔍 Checking Supabase for video {video_uuid} (elapsed: {elapsed:.1f}s)")
-            exists = await supabase_service.check_video_exists(video_uuid)
-            
-            if exists:
-                # Video is ready, get URL
-                url = await supabase_service.get_video_url_by_uuid(video_uuid)
-                if url:
-                    print(f"✅ Video ready after {elapsed:.1f}s")
-                    return url
-            
-            # Wait before next check
-            print(f"⏳ Video not ready yet, waiting {check_interval}s before next check...")
-            await asyncio.sleep(check_interval)
+        logger.info("Video ready after %.1fs", elapsed)
+        return url
     
-    async def generate_submission_media(game_id: str, submission_index: int, black_card, submission):
+    @metrics.timed("media.submission")
+    async def generate_submission_media(game_id: str, round_number: int, submission_index: int, black_card, submission):
         """Generate image + narration for a single submission (no video)"""
         try:
             white_cards = [card_service.get_white_card(cid) for cid in submission.card_ids]
@@ -298,41 +473,40 @@ def register_socket_events(sio: socketio.AsyncServer):
                 'message': 'Generating image...'
             }, room=game_id)
             
-            from ..services.nanobanana_service import nanobanana_service
-            from ..services.gemini_tts_service import gemini_tts_service
-            
-            # Generate prompt
-            prompt = await ai_service.generate_video_prompt(black_card.text, white_texts)
-            
-            # Moderate prompt for safety
-            safe_prompt = await content_moderator.sanitize_prompt(prompt)
-            
-            # Parallel: image + narration
-            image_task = nanobanana_service.generate_image(safe_prompt, aspect_ratio="9:16")
-            narration_task = gemini_tts_service.generate_narrated_script(
+            # Prompt, moderation, image + narration - usually already started on submit
+            media = await speculative_media_service.result(
+                game_id,
+                round_number,
+                submission.player_id,
                 black_card.text,
                 white_texts,
-                style="humorous"
+                combo_key=submission.combo_key
             )
-            
-            image_url, narration = await asyncio.gather(image_task, narration_task)
+            image_url = media['image_url']
+            narration = media['narration']
             
             # Store image and audio URLs on submission object
             game = game_service.get_game(game_id)
             if game and game.current_round and submission_index < len(game.current_round.submissions):
                 game.current_round.submissions[submission_index].image_url = image_url
                 game.current_round.submissions[submission_index].audio_url = narration.get('audio_url') if narration else None
-                print(f"💾 Stored URLs on submission {submission_index}: image={image_url is not None}, audio={narration.get('audio_url') is not None}")
+                game.current_round.submissions[submission_index].audio_duration = narration.get('duration_seconds') if narration else None
+                logger.debug("Stored URLs on submission %s: image=%s, audio=%s",
+                             submission_index, image_url is not None,
+                             narration is not None and narration.get('audio_url') is not None)
             
             # Send image + audio immediately
             media_data = {
                 'game_id': game_id,
                 'submission_index': submission_index,
                 'image_url': image_url,
-                'audio_url': narration.get('audio_url') if narration else None
+                'audio_url': narration.get('audio_url') if narration else None,
+                'audio_duration': narration.get('duration_seconds') if narration else None
             }
-            print(f"📤 Emitting submission_media_ready: {media_data}")
+            logger.debug("Emitting submission_media_ready: %s", media_data)
             await sio.emit('submission_media_ready', media_data, room=game_id)
+            if game:
+                observe_round_stage(game.current_round, 'submission_media_ready')
             
             # Update all players with new game state
             for pid in game.players:
@@ -341,36 +515,87 @@ def register_socket_events(sio: socketio.AsyncServer):
                     player_state = game_service.get_game_state_for_player(game_id, pid)
                     await sio.emit('game_state', safe_emit_data(player_state), room=p.socket_id)
             
-            print(f"✅ Image + audio generated for submission {submission_index}")
+            logger.info("Image + audio generated for submission %s", submission_index)
                 
         except Exception as e:
-            print(f"❌ Error generating media for submission {submission_index}: {e}")
+            logger.error("Error generating media for submission %s: %s", submission_index, e)
             return None
     
+    async def wait_for_winner_video(video_id: str) -> Optional[str]:
+        """Veo URL as soon as its upload is published on the media bus (None on failure)"""
+        timeout = veo_service.MAX_WAIT_SECONDS + settings.SUPABASE_HTTP_UPLOAD_TIMEOUT
+        return await media_bus_service.wait(f"video:{video_id}", timeout)
+    
+    @metrics.timed("video.winner")
     async def generate_winner_video(game_id: str, submission_index: int):
         """Generate video for winning submission only"""
-        print(f"🎬 Generating video for winner in game {game_id}")
+        logger.info("Generating video for winner in game %s", game_id)
         game = game_service.get_game(game_id)
         if not game or not game.current_round:
-            print(f"❌ Game or round not found")
+            logger.error("Game or round not found")
             return
         
         try:
-            submission = game.current_round.submissions[submission_index]
-            black_card = card_service.get_black_card(game.current_round.black_card_id)
+            current_round = game.current_round
+            submission = current_round.submissions[submission_index]
+            black_card = card_service.get_black_card(current_round.black_card_id)
             white_cards = [card_service.get_white_card(cid) for cid in submission.card_ids]
             white_texts = [c.text for c in white_cards if c]
             
-            # Generate prompt and moderate it
-            prompt = await ai_service.generate_video_prompt(black_card.text, white_texts)
-            safe_prompt = await content_moderator.sanitize_prompt(prompt)
-            
-            # Generate video with Veo3
-            print(f"🎥 Generating video for winning submission...")
-            video_url = await veo_service.generate_video(safe_prompt)
+            # Use the speculative job started during judging, if any
+            speculative = speculative_video_service.claim(
+                game_id,
+                current_round.round_number,
+                submission.player_id
+            )
+            video_url = None
+            safe_prompt = None
+            
+            if speculative:
+                job, video_id = speculative
+                logger.info("Waiting on speculative video %s for winning submission", video_id)
+                video_url = await wait_for_winner_video(video_id)
+                if video_url:
+                    try:
+                        safe_prompt = (await job)['safe_prompt']
+                    except Exception as e:
+                        logger.warning("Speculative job failed after upload: %s", e)
+            
+            if not video_url:
+                video_url = await video_cache.aget(black_card.text, white_texts, key=submission.combo_key)
+                if video_url:
+                    logger.info("Using cached video for winning submission")
+            
+            if not video_url:
+                # Banked prompt, or generate and moderate one
+                prompt, safe_prompt = await prompt_bank_service.resolve(
+                    black_card.text, white_texts, submission.combo_key
+                )
+                
+                # Veo3 in the background; the URL arrives over the media bus
+                logger.info("Generating video for winning submission...")
+                video_id = str(uuid.uuid4())
+                submission.video_id = video_id
+                asyncio.create_task(veo_service.generate_video(safe_prompt, video_id=video_id))
+                video_url = await wait_for_winner_video(video_id)
             
             if video_url:
-                print(f"✅ Video generated: {video_url}")
+                video_cache.set(black_card.text, white_texts, video_url, key=submission.combo_key)
+                logger.info("Video generated: %s", video_url)
+                
+                # Notify players first; metadata and feed writes can follow
+                current_round.video_url = video_url
+                await sio.emit('video_ready', {
+                    'video_url': video_url
+                }, room=game_id)
+                observe_round_stage(current_round, 'video_ready')
+                
+                # Send updated game state
+                for pid in game.players:
+                    p = game_service.get_player(pid)
+                    if p and p.socket_id:
+                        player_state = game_service.get_game_state_for_player(game_id, pid)
+                        await sio.emit('game_state', safe_emit_data(player_state), room=p.socket_id)
                 
                 # Save video metadata to Supabase
                 winner = game_service.get_player(submission.player_id)
@@ -386,7 +611,7 @@ def register_socket_events(sio: socketio.AsyncServer):
                 
                 db_video_id = await supabase_service.save_video(video_data)
                 if db_video_id:
-                    print(f"✅ Video metadata saved to Supabase: {db_video_id}")
+                    logger.info("Video metadata saved to Supabase: %s", db_video_id)
                     
                     # Add to public feed
                     from ..services.feed_service import feed_service
@@ -404,40 +629,28 @@ def register_socket_events(sio: socketio.AsyncServer):
                     }
                     feed_id = await feed_service.add_to_feed(feed_content)
                     if feed_id:
-                        print(f"📱 Added to public feed: {feed_id}")
-                
-                # Update game state with video URL
-                game.current_round.video_url = video_url
-                
-                # Notify all players
+                        logger.info("Added to public feed: %s", feed_id)
+            else:
+                logger.warning("Video generation failed for winner")
+                # Let clients stop waiting instead of hanging on a dead provider
                 await sio.emit('video_ready', {
-                    'video_url': video_url
+                    'video_url': settings.VIDEO_PLACEHOLDER_URL
                 }, room=game_id)
-                
-                # Send updated game state
-                for pid in game.players:
-                    p = game_service.get_player(pid)
-                    if p and p.socket_id:
-                        player_state = game_service.get_game_state_for_player(game_id, pid)
-                        await sio.emit('game_state', safe_emit_data(player_state), room=p.socket_id)
-            else:
-                print(f"⚠️  Video generation failed for winner")
+                observe_round_stage(current_round, 'video_failed')
                 
         except Exception as e:
-            print(f"❌ Error generating video: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error generating video: %s", e)
     
     @sio.event
     async def connect(sid, environ):
         """Handle client connection"""
-        print(f"Client connected: {sid}")
+        logger.info("Client connected: %s", sid)
         await sio.emit('connected', {'sid': sid}, room=sid)
     
     @sio.event
     async def disconnect(sid):
         """Handle client disconnection"""
-        print(f"Client disconnected: {sid}")
+        logger.info("Client disconnected: %s", sid)
         
         # Find and disconnect player
         for player in game_service.players.values():
@@ -462,7 +675,10 @@ def register_socket_events(sio: socketio.AsyncServer):
                         
                         # If no human players left, clean up the game
                         if not human_players_connected:
-                            print(f"🗑️  No human players left in game {game.id}, cleaning up...")
+                            logger.info("No human players left in game %s, cleaning up...", game.id)
+                            speculative_media_service.cancel_game(game.id)
+                            speculative_video_service.cancel_game(game.id)
+                            round_plan_service.cancel_game(game.id)
                             # Remove all players from this game
                             for pid in list(game.players):
                                 if pid in game_service.players:
@@ -470,11 +686,12 @@ def register_socket_events(sio: socketio.AsyncServer):
                             # Remove the game
                             if game.id in game_service.games:
                                 del game_service.games[game.id]
-                            print(f"✅ Game {game.id} cleaned up")
+                            logger.info("Game %s cleaned up", game.id)
                         
                         break
     
     @sio.event
+    @metrics.timed("socket.create_game")
     async def create_game(sid, data):
         """Create a new game"""
         try:
@@ -503,6 +720,7 @@ def register_socket_events(sio: socketio.AsyncServer):
             await sio.emit('error', {'message': str(e)}, room=sid)
     
     @sio.event
+    @metrics.timed("socket.join_game")
     async def join_game(sid, data):
         """Join an existing game"""
         try:
@@ -552,6 +770,7 @@ def register_socket_events(sio: socketio.AsyncServer):
             await sio.emit('error', {'message': str(e)}, room=sid)
     
     @sio.event
+    @metrics.timed("socket.start_game")
     async def start_game(sid, data):
         """Start the game"""
         try:
@@ -580,6 +799,7 @@ def register_socket_events(sio: socketio.AsyncServer):
             await sio.emit('error', {'message': str(e)}, room=sid)
     
     @sio.event
+    @metrics.timed("socket.submit_cards")
     async def submit_cards(sid, data):
         """Submit white cards for the round"""
         try:
@@ -591,6 +811,9 @@ def register_socket_events(sio: socketio.AsyncServer):
                 game = game_service.get_game(game_id)
                 player = game_service.get_player(player_id)
                 
+                # Start media generation right away instead of waiting for judging
+                start_speculative_media(game_id, player_id)
+                
                 # Notify all players
                 await sio.emit('cards_submitted', {
                     'player_id': player_id,
@@ -599,9 +822,9 @@ def register_socket_events(sio: socketio.AsyncServer):
                 }, room=game_id)
                 
                 # If all submitted, trigger AI players and move to judging
-                print(f"🔍 Game state after submission: {game.state}")
+                logger.debug("Game state after submission: %s", game.state)
                 if game.state == GameState.JUDGING:
-                    print(f"🎨 Entering judging phase, triggering media generation")
+                    logger.info("Entering judging phase, triggering media generation")
                     # Send updated state
                     for pid in game.players:
                         player_state = game_service.get_game_state_for_player(game_id, pid)
@@ -610,6 +833,7 @@ def register_socket_events(sio: socketio.AsyncServer):
                             await sio.emit('game_state', player_state, room=p.socket_id)
                     
                     await sio.emit('judging_phase', {}, room=game_id)
+                    observe_round_stage(game.current_round, 'judging_phase')
                     
                     # Generate images + audio for all submissions
                     asyncio.create_task(generate_all_submission_media(game_id))
@@ -626,6 +850,34 @@ def register_socket_events(sio: socketio.AsyncServer):
             await sio.emit('error', {'message': str(e)}, room=sid)
     
     @sio.event
+    @metrics.timed("socket.withdraw_cards")
+    async def withdraw_cards(sid, data):
+        """Take back a submission before judging starts"""
+        try:
+            game_id = data.get('game_id')
+            player_id = data.get('player_id')
+            
+            game = game_service.get_game(game_id)
+            round_number = game.current_round.round_number if game and game.current_round else None
+            
+            if game_service.withdraw_submission(game_id, player_id):
+                # Drop media work for the withdrawn cards
+                speculative_media_service.cancel_submission(game_id, round_number, player_id)
+                
+                await sio.emit('cards_withdrawn', {
+                    'player_id': player_id
+                }, room=game_id)
+                
+                player_state = game_service.get_game_state_for_player(game_id, player_id)
+                await sio.emit('game_state', safe_emit_data(player_state), room=sid)
+            else:
+                await sio.emit('error', {'message': 'Cannot withdraw cards'}, room=sid)
+                
+        except Exception as e:
+            await sio.emit('error', {'message': str(e)}, room=sid)
+    
+    @sio.event
+    @metrics.timed("socket.select_winner")
     async def select_winner(sid, data):
         """Czar selects the winning submission"""
         try:
@@ -637,6 +889,7 @@ def register_socket_events(sio: socketio.AsyncServer):
             
             if game_service.select_winner(game_id, czar_id, winning_index):
                 game = game_service.get_game(game_id)
+                round_number = game.current_round.round_number
                 winning_submission = game.current_round.submissions[winning_index]
                 winner = game_service.get_player(winning_submission.player_id)
                 
@@ -646,6 +899,7 @@ def register_socket_events(sio: socketio.AsyncServer):
                     'winner_name': winner.name,
                     'submission_index': winning_index
                 }, room=game_id)
+                observe_round_stage(game.current_round, 'winner_selected')
                 
                 # Generate video asynchronously
                 asyncio.create_task(generate_winner_video(game_id, winning_index))
@@ -658,7 +912,8 @@ def register_socket_events(sio: socketio.AsyncServer):
                         await sio.emit('game_state', safe_emit_data(player_state), room=p.socket_id)
                 
                 # Auto-advance after delay
-                await asyncio.sleep(5)
+                await asyncio.sleep(settings.ROUND_ADVANCE_DELAY_SECONDS)
+                finish_speculative_round(game_id, round_number)
                 game = game_service.get_game(game_id)
                 if game and game.state != GameState.GAME_END:
                     game_service.end_round(game_id)
@@ -685,19 +940,20 @@ def register_socket_events(sio: socketio.AsyncServer):
             await sio.emit('error', {'message': str(e)}, room=sid)
     
     @sio.event
+    @metrics.timed("socket.request_ai_join")
     async def request_ai_join(sid, data):
         """Request an AI player to join the game"""
         try:
-            print(f"🤖 AI join request from {sid}")
+            logger.info("AI join request from %s", sid)
             game_id = data.get('game_id')
             # Use random personality for variety
             personality = ai_service.get_random_personality()
             
-            print(f"🤖 Adding AI to game {game_id} with personality: {personality}")
+            logger.info("Adding AI to game %s with personality: %s", game_id, personality)
             ai_player = game_service.add_ai_player(game_id, personality)
             
             if ai_player:
-                print(f"🤖 AI player created: {ai_player.name} ({ai_player.id})")
+                logger.info("AI player created: %s (%s)", ai_player.name, ai_player.id)
                 
                 # Create SIMPLE dict with only strings and numbers
                 simple_data = {
@@ -711,20 +967,38 @@ def register_socket_events(sio: socketio.AsyncServer):
                     }
                 }
                 
-                print(f"🤖 Emitting player_joined: {simple_data}")
+                logger.info("Emitting player_joined: %s", simple_data)
                 await sio.emit('player_joined', simple_data, room=game_id)
-                print(f"✅ AI player joined successfully")
+                logger.info("AI player joined successfully")
             else:
-                print(f"❌ Failed to add AI player")
+                logger.error("Failed to add AI player")
                 await sio.emit('error', {'message': 'Cannot add AI player'}, room=sid)
                 
         except Exception as e:
-            print(f"❌ Exception in request_ai_join: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Exception in request_ai_join: %s", e)
+            await sio.emit('error', {'message': str(e)}, room=sid)
+    
+    @sio.event
+    @metrics.timed("socket.subscribe_job")
+    async def subscribe_job(sid, data):
+        """Subscribe to progress events for a background job"""
+        try:
+            job_id = data.get('job_id')
+            job = await job_queue_service.get_job(job_id)
+            if not job:
+                await sio.emit('error', {'message': 'Job not found'}, room=sid)
+                return
+            
+            await sio.enter_room(sid, f"job:{job_id}")
+            await sio.emit('job_update', safe_emit_data(job_queue_service.public_view(job)), room=sid)
+            # Also reaches us when the job runs in a separate worker process
+            job_queue_service.watch(job)
+            
+        except Exception as e:
             await sio.emit('error', {'message': str(e)}, room=sid)
     
     @sio.event
+    @metrics.timed("socket.send_message")
     async def send_message(sid, data):
         """Send chat message"""
         try:
@@ -0,0 +1,38 @@
+import socketio
+from socketio import packet
+from ..services.metrics import socket_emits, socket_emit_bytes
+
+
+class InstrumentedPacket(packet.Packet):
+    """Packet that counts event payload bytes as Socket.IO encodes them
+
+    Room emits are encoded once and reused for every recipient, so this
+    costs a len() per emit instead of a second json.dumps on the event loop.
+    """
+
+    def encode(self):
+        encoded = super().encode()
+        if self.packet_type in (packet.EVENT, packet.BINARY_EVENT) and self.data:
+            parts = encoded if isinstance(encoded, list) else [encoded]
+            socket_emit_bytes.inc(sum(len(part) for part in parts), event=self.data[0])
+        return encoded
+
+
+class InstrumentedAsyncServer(socketio.AsyncServer):
+    """AsyncServer that counts emits and payload bytes per event"""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('serializer', InstrumentedPacket)
+        super().__init__(*args, **kwargs)
+
+    async def emit(self, event, data=None, *args, **kwargs):
+        room = kwargs.get('to') or kwargs.get('room')
+        if room is None:
+            target = "broadcast"
+        elif room in self.environ:
+            target = "player"  # Every sid is also a room of its own
+        else:
+            target = "room"
+        socket_emits.inc(event=event, target=target)
+
+        return await super().emit(event, data, *args, **kwargs)
@@ -0,0 +1 @@
+"""CPU-bound work executed in worker processes"""
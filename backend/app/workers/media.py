@@ -0,0 +1,170 @@
+"""
+Media processing functions run in the media worker process pool
+
+Everything here is CPU-bound (pixel/audio work) and must stay importable
+without the rest of the app: no service imports, only stdlib + Pillow.
+"""
+import io
+import subprocess
+import wave
+from typing import Optional, Tuple
+from PIL import Image
+
+
+def process_image(
+    data: bytes,
+    output_format: str = "PNG",
+    max_size: Optional[Tuple[int, int]] = None,
+    quality: int = 85
+) -> dict:
+    """
+    Decode, optionally downscale, and re-encode an image
+
+    Args:
+        data: Encoded image bytes
+        output_format: Pillow format name (PNG, WEBP, JPEG)
+        max_size: Optional (width, height) bounding box to fit within
+        quality: Encoder quality for lossy formats
+
+    Returns:
+        Dict with 'data', 'width' and 'height'
+    """
+    image = Image.open(io.BytesIO(data))
+    image.load()
+
+    if max_size:
+        image.thumbnail(max_size)
+
+    if output_format.upper() == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=output_format, quality=quality)
+    return {
+        'data': buffer.getvalue(),
+        'width': image.width,
+        'height': image.height
+    }
+
+
+def make_image_variants(
+    data: bytes,
+    preview_size: Tuple[int, int] = (270, 480),
+    quality: int = 80
+) -> dict:
+    """
+    Transcode an image to a compact WebP plus a small WebP preview
+
+    Returns:
+        Dict with 'full' and 'preview' entries, each holding 'data',
+        'width' and 'height'
+    """
+    image = Image.open(io.BytesIO(data))
+    image.load()
+
+    full = io.BytesIO()
+    image.save(full, format="WEBP", quality=quality)
+    full_size = image.size
+
+    image.thumbnail(preview_size)
+    preview = io.BytesIO()
+    image.save(preview, format="WEBP", quality=quality)
+
+    return {
+        'full': {'data': full.getvalue(), 'width': full_size[0], 'height': full_size[1]},
+        'preview': {'data': preview.getvalue(), 'width': image.width, 'height': image.height}
+    }
+
+
+def sniff_image_mime(data) -> Optional[str]:
+    """
+    Detect an image MIME type from its magic bytes
+
+    Accepts bytes or a memoryview; only the first 12 bytes are inspected.
+    """
+    head = bytes(memoryview(data)[:12])
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if head[4:12] in (b"ftypavif", b"ftypavis"):
+        return "image/avif"
+    return None
+
+
+def encode_wav(pcm: bytes, channels: int = 1, rate: int = 24000, sample_width: int = 2) -> bytes:
+    """Wrap raw PCM samples in a WAV container"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(sample_width)
+        wf.setframerate(rate)
+        wf.writeframes(pcm)
+    return buffer.getvalue()
+
+
+AUDIO_CODECS = {
+    # format: (ffmpeg output args, MIME type, file extension)
+    "mp3": (["-c:a", "libmp3lame", "-f", "mp3"], "audio/mpeg", "mp3"),
+    "opus": (["-c:a", "libopus", "-f", "ogg"], "audio/ogg", "ogg"),
+}
+
+
+def encode_audio(
+    pcm: bytes,
+    audio_format: str = "mp3",
+    bitrate: str = "48k",
+    channels: int = 1,
+    rate: int = 24000,
+    sample_width: int = 2
+) -> dict:
+    """
+    Compress raw PCM to MP3 or Ogg/Opus with ffmpeg
+
+    Falls back to WAV when ffmpeg is not installed or the codec is unavailable.
+
+    Returns:
+        Dict with 'data', 'content_type', 'extension' and 'duration_seconds'
+    """
+    duration = len(pcm) / float(rate * channels * sample_width)
+    codec = AUDIO_CODECS.get(audio_format)
+
+    if codec:
+        output_args, content_type, extension = codec
+        try:
+            result = subprocess.run(
+                [
+                    "ffmpeg", "-hide_banner", "-loglevel", "error",
+                    "-f", f"s{sample_width * 8}le", "-ar", str(rate), "-ac", str(channels),
+                    "-i", "pipe:0",
+                    "-b:a", bitrate, *output_args, "pipe:1"
+                ],
+                input=pcm,
+                capture_output=True,
+                check=True,
+                timeout=60
+            )
+            return {
+                'data': result.stdout,
+                'content_type': content_type,
+                'extension': extension,
+                'duration_seconds': duration
+            }
+        except (FileNotFoundError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
+            pass
+
+    return {
+        'data': encode_wav(pcm, channels, rate, sample_width),
+        'content_type': "audio/wav",
+        'extension': "wav",
+        'duration_seconds': duration
+    }
+
+
+def warm_up() -> bool:
+    """No-op used to spawn pool processes ahead of the first real job"""
+    return True
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Prompt bank builder
+
+Precomputes video prompts (and their moderated versions) for the most likely
+pick-1 card combinations, so live submissions skip the prompt + moderation
+LLM calls. Combinations are ranked with the speculative video scorer and
+sent to Gemini in batches; the table is written to PROMPT_BANK_PATH after
+every batch, so an interrupted run keeps its progress:
+
+    python build_prompt_bank.py --top 2000
+    python build_prompt_bank.py --report
+"""
+import argparse
+import asyncio
+import json
+import re
+from typing import List, Optional, Tuple
+from app.services.card_service import card_service
+from app.services.ai_service import ai_service
+from app.services.combination_key import combination_key
+from app.services.prompt_bank_service import prompt_bank_service
+from app.services.speculative_video_service import speculative_video_service
+
+
+BATCH_PROMPT = """You will receive numbered scenarios from the game Cards Against Humanity.
+For EACH scenario:
+1. "prompt": interpret it as a humorous, absurd, and visually engaging video. Use cinematic
+   creativity, playful exaggeration, and expressive character actions to bring the humor to
+   life. Always speak and act the description. At most 50 words.
+2. "safe_prompt": the same prompt rewritten to be safe for image/video generation APIs:
+   remove explicit sexual content, violence, gore and hate speech, keep the joke intact and
+   PG-13, replace problematic words with creative alternatives. If the prompt is already
+   safe, repeat it unchanged.
+
+Scenarios:
+{scenarios}
+
+Return ONLY a JSON array with one object per scenario, in order:
+[{{"n": 1, "prompt": "...", "safe_prompt": "..."}}, ...]"""
+
+
+Combination = Tuple[str, str, str, str]  # (key, black id, white id, description)
+
+
+def ranked_combinations() -> List[Combination]:
+    """Every pick-1 combination, most likely winners first"""
+    whites = card_service.get_all_white_cards()
+    combinations = []
+    for black in card_service.get_all_black_cards():
+        if black.pick != 1:
+            continue
+        for white in whites:
+            combinations.append((
+                speculative_video_service.score(black.text, [white.text]),
+                combination_key(black_id=black.id, white_ids=[white.id]),
+                black.id,
+                white.id,
+                black.format_with_answers([white.text])
+            ))
+    combinations.sort(key=lambda c: c[0], reverse=True)
+    return [c[1:] for c in combinations]
+
+
+def _truncate(text: str, words: int = 50) -> str:
+    return " ".join(text.split()[:words])
+
+
+def parse_batch(response: str, size: int) -> Optional[List[Tuple[str, str]]]:
+    """(prompt, safe_prompt) per scenario, or None if the response is unusable"""
+    match = re.search(r"\[.*\]", response, re.DOTALL)
+    if not match:
+        return None
+    try:
+        items = json.loads(match.group(0))
+    except ValueError:
+        return None
+    if not isinstance(items, list) or len(items) != size:
+        return None
+
+    results = []
+    for item in items:
+        if not isinstance(item, dict) or not item.get("prompt") or not item.get("safe_prompt"):
+            return None
+        results.append((_truncate(str(item["prompt"])), _truncate(str(item["safe_prompt"]))))
+    return results
+
+
+async def build(top: int, batch_size: int, concurrency: int):
+    ranked = ranked_combinations()[:top]
+    pending = [c for c in ranked if c[0] not in prompt_bank_service.prompts]
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    print(f"🏦 {len(ranked) - len(pending)}/{len(ranked)} already banked, "
+          f"{len(pending)} to generate in {len(batches)} batches")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    failed = 0
+
+    async def run(batch: List[Combination]):
+        nonlocal failed
+        scenarios = "\n".join(f"{n}. {description}" for n, (_, _, _, description) in enumerate(batch, 1))
+        async with semaphore:
+            try:
+                response = await ai_service.generate_text(BATCH_PROMPT.format(scenarios=scenarios))
+            except Exception as e:
+                print(f"⚠️  Batch failed: {e}")
+                failed += len(batch)
+                return
+
+        results = parse_batch(response, len(batch))
+        if results is None:
+            print(f"⚠️  Unusable batch response ({len(batch)} combinations skipped)")
+            failed += len(batch)
+            return
+
+        for (key, _, _, _), (prompt, safe_prompt) in zip(batch, results):
+            prompt_bank_service.put(key, prompt, safe_prompt)
+        prompt_bank_service.save()
+        print(f"✅ Banked {len(prompt_bank_service.prompts)} prompts")
+
+    await asyncio.gather(*(run(batch) for batch in batches))
+    if failed:
+        print(f"⚠️  {failed} combinations failed; re-run to retry them")
+
+
+def report(top: int):
+    """Print how much of the catalog (and of the top-N) is banked"""
+    ranked = ranked_combinations()
+    banked = prompt_bank_service.prompts
+    covered = [c for c in ranked if c[0] in banked]
+    top_covered = sum(1 for c in ranked[:top] if c[0] in banked)
+    blacks = {c[1] for c in ranked}
+    blacks_covered = {c[1] for c in covered}
+
+    print("📊 Prompt bank coverage")
+    print(f"   Pick-1 combinations: {len(covered)}/{len(ranked)} ({len(covered) / max(len(ranked), 1):.1%})")
+    print(f"   Top {top}: {top_covered}/{min(top, len(ranked))} ({top_covered / max(min(top, len(ranked)), 1):.1%})")
+    print(f"   Black cards with banked prompts: {len(blacks_covered)}/{len(blacks)}")
+    print(f"   Table: {prompt_bank_service.path} ({len(banked)} entries, model {prompt_bank_service.meta.get('model')})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute prompts for likely card combinations")
+    parser.add_argument("--top", type=int, default=2000, help="Number of combinations to bank")
+    parser.add_argument("--batch-size", type=int, default=25, help="Combinations per LLM request")
+    parser.add_argument("--concurrency", type=int, default=2, help="Parallel LLM requests")
+    parser.add_argument("--report", action="store_true", help="Only print the coverage report")
+    args = parser.parse_args()
+
+    if not args.report:
+        asyncio.run(build(args.top, args.batch_size, args.concurrency))
+    report(args.top)
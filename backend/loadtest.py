@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Socket.IO load test
+
+Starts the real socket_app (uvicorn, in a child process) with AI, media and
+storage calls replaced by in-process stubs that sleep for configurable
+delays, then plays many games concurrently through python-socketio clients:
+each game is one human client plus AI players added via request_ai_join,
+playing rounds (submit cards / judge) until --rounds are done.
+
+Reports, per concurrency level: p50/p99 latency of each client action
+(emit -> confirming event), round duration, server events/s received by
+clients and peak server RSS. Needs no network access (Linux, loopback only).
+
+With --fake-providers SCALE the stubs are skipped and the server runs the real
+service code against the deterministic fake AI providers and local storage
+(AI_PROVIDER=fake, STORAGE_PROVIDER=local), with latencies scaled by SCALE.
+
+    python loadtest.py --games 10,100,500 --rounds 3
+    python loadtest.py --games 1000 --llm-delay 1.5 --image-delay 4 --json results.json
+    python loadtest.py --games 100 --fake-providers 0.1
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+import httpx
+import socketio
+
+
+# Server side (child process)
+
+def _install_stubs(args):
+    """Replace provider-backed service methods with sleeps and canned results"""
+    from app.services.ai_service import ai_service
+    from app.services.content_moderator import content_moderator
+    from app.services.nanobanana_service import nanobanana_service
+    from app.services.gemini_tts_service import gemini_tts_service
+    from app.services.veo_service import veo_service
+    from app.services.supabase_service import supabase_service
+    from app.services.feed_service import feed_service
+
+    async def delay(mean: float):
+        if mean > 0:
+            await asyncio.sleep(random.uniform(0.5, 1.5) * mean)
+
+    async def select_cards(black_card_text, white_cards, pick_count, personality="absurd"):
+        await delay(args.llm_delay)
+        return [card["id"] for card in random.sample(white_cards, pick_count)]
+
+    async def judge_submissions(black_card_text, submissions, personality="absurd"):
+        await delay(args.llm_delay)
+        return random.randrange(len(submissions))
+
+    async def generate_video_prompt(black_card, white_cards, fresh=False):
+        await delay(args.llm_delay)
+        return f"{black_card} / {' / '.join(white_cards)}"
+
+    async def sanitize_prompt(prompt):
+        await delay(args.llm_delay)
+        return prompt
+
+    async def generate_image(prompt, aspect_ratio="9:16"):
+        await delay(args.image_delay)
+        return f"http://127.0.0.1/stub/images/{random.getrandbits(64):016x}.png"
+
+    async def generate_narrated_script(black_card_text, white_cards, style="humorous"):
+        await delay(args.llm_delay + args.tts_delay)
+        return {
+            "script": "stub narration",
+            "audio_url": f"http://127.0.0.1/stub/audio/{random.getrandbits(64):016x}.mp3",
+            "content_type": "audio/mpeg",
+            "duration_seconds": 6.0
+        }
+
+    async def generate_video(prompt, duration=None, aspect_ratio="16:9", video_id=None):
+        await delay(args.video_delay)
+        return f"http://127.0.0.1/stub/videos/{video_id or f'{random.getrandbits(64):016x}'}.mp4"
+
+    async def save_video(video_data):
+        await delay(args.storage_delay)
+        return f"{random.getrandbits(64):016x}"
+
+    async def add_to_feed(content):
+        await delay(args.storage_delay)
+        return f"{random.getrandbits(64):016x}"
+
+    ai_service.select_cards = select_cards
+    ai_service.judge_submissions = judge_submissions
+    ai_service.generate_video_prompt = generate_video_prompt
+    content_moderator.sanitize_prompt = sanitize_prompt
+    nanobanana_service.generate_image = generate_image
+    gemini_tts_service.generate_narrated_script = generate_narrated_script
+    veo_service.generate_video = generate_video
+    supabase_service.save_video = save_video
+    feed_service.add_to_feed = add_to_feed
+
+
+def serve(args):
+    """Run socket_app with stubbed or fake providers (called in the child process)"""
+    import uvicorn
+    from app.main import socket_app
+
+    if args.fake_providers is None:
+        _install_stubs(args)
+    uvicorn.run(socket_app, host="127.0.0.1", port=args.port, log_level="warning",
+                access_log=False, ws_max_size=1 << 20)
+
+
+def _server_env(workdir: str, fake_latency_scale: Optional[float] = None) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        # Nothing listens here: Supabase calls fail fast instead of hanging on DNS
+        "SUPABASE_URL": "http://127.0.0.1:9",
+        "SUPABASE_KEY": "loadtest",
+        "GEMINI_API_KEY": "",
+        "ROUND_PLAN_ENABLED": "false",
+        "STORAGE_INDEX_REFRESH_SECONDS": "0",
+        "FEED_INDEX_CACHE_PATH": "",
+        "TRENDING_RECOMPUTE_SECONDS": "0",
+        "JOB_WORKERS": "0",
+        "LLM_CACHE_DISK_PATH": "",
+        "VIDEO_CACHE_DISK_PATH": "",
+        "PROMPT_BANK_PATH": "",
+        "JOB_QUEUE_DB_PATH": os.path.join(workdir, "jobs.sqlite3"),
+        "MEDIA_BUS_DB_PATH": os.path.join(workdir, "media_events.sqlite3"),
+        "NARRATION_INDEX_DB_PATH": os.path.join(workdir, "narrations.sqlite3"),
+        "LOG_LEVEL": "WARNING",
+        "SOCKET_PACKET_LOGGING": "false",
+    })
+    if fake_latency_scale is not None:
+        env.update({
+            "AI_PROVIDER": "fake",
+            "STORAGE_PROVIDER": "local",
+            "LOCAL_STORAGE_PATH": os.path.join(workdir, "storage"),
+            "FAKE_LATENCY_SCALE": str(fake_latency_scale),
+            "ROUND_PLAN_ENABLED": "true",
+        })
+    return env
+
+
+# Client side
+
+def _raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _rss_mb(pid: int) -> float:
+    """Resident set size of a process (Linux /proc)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Stats:
+    """Latencies per action plus event and error counts for one run"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.events = 0
+        self.errors: Dict[str, int] = {}
+        self.games_finished = 0
+
+    def observe(self, name: str, seconds: float):
+        self.latencies.setdefault(name, []).append(seconds)
+
+    def error(self, kind: str):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+
+class GameClient:
+    """One human player driving a game: create, add bots, start, play rounds"""
+
+    def __init__(self, url: str, stats: Stats, bots: int, rounds: int, timeout: float,
+                 transports: List[str], http_session: aiohttp.ClientSession):
+        self.url = url
+        self.transports = transports
+        self.stats = stats
+        self.bots = bots
+        self.rounds = rounds
+        self.timeout = timeout
+        self.sio = socketio.AsyncClient(reconnection=False, http_session=http_session)
+        self.game_id: Optional[str] = None
+        self.player_id: Optional[str] = None
+        self.state: dict = {}
+        self.rounds_done = 0
+        self.round_started_at = 0.0
+        self.winner_selected_at = 0.0
+        self.done = asyncio.Event()
+        # event name -> (future, sent_at) for the action waiting on it
+        self._waiting: Dict[str, tuple] = {}
+        self._acted_in_round: Optional[tuple] = None
+
+        self.sio.on("*", self._on_any)
+
+    async def _on_any(self, event: str, data=None):
+        self.stats.events += 1
+        if event == "error":
+            self.stats.error((data or {}).get("message", "error"))
+        waiter = self._waiting.get(event)
+        if waiter and self._matches(event, data) and not waiter[0].done():
+            del self._waiting[event]
+            waiter[0].set_result(data)
+
+        if event == "game_state":
+            self.state = data or {}
+            await self._maybe_act()
+        elif event == "round_started":
+            now = time.perf_counter()
+            if self.round_started_at:
+                self.stats.observe("round", now - self.round_started_at)
+                self.rounds_done += 1
+            self.round_started_at = now
+            if self.rounds_done >= self.rounds:
+                self.done.set()
+        elif event == "winner_selected":
+            self.winner_selected_at = time.perf_counter()
+        elif event == "video_ready" and self.winner_selected_at:
+            self.stats.observe("winner_video", time.perf_counter() - self.winner_selected_at)
+            self.winner_selected_at = 0.0
+
+    def _matches(self, event: str, data) -> bool:
+        if event == "cards_submitted":
+            return (data or {}).get("player_id") == self.player_id
+        return True
+
+    async def _request(self, name: str, event: str, data: dict, reply: str):
+        """Emit and wait for the confirming event, recording the latency"""
+        future = asyncio.get_running_loop().create_future()
+        sent_at = time.perf_counter()
+        self._waiting[reply] = (future, sent_at)
+        await self.sio.emit(event, data)
+        try:
+            result = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            self._waiting.pop(reply, None)
+            self.stats.error(f"{name} timeout")
+            raise
+        self.stats.observe(name, time.perf_counter() - sent_at)
+        return result
+
+    async def _maybe_act(self):
+        """Submit (player) or judge (czar) once per round, from the latest game_state"""
+        current = self.state.get("current_round") or {}
+        # Serialized as "GameState.PLAYING" or "playing" depending on the enum's str()
+        phase = str(self.state.get("state", "")).rsplit(".", 1)[-1].lower()
+        key = (current.get("round_number"), phase)
+        if not current or key == self._acted_in_round:
+            return
+
+        if phase == "playing" and current.get("czar_id") != self.player_id:
+            hand = self.state.get("your_hand") or []
+            pick = (current.get("black_card") or {}).get("pick", 1)
+            if len(hand) < pick:
+                return
+            self._acted_in_round = key
+            asyncio.ensure_future(self._act("submit_cards", "submit_cards", {
+                "game_id": self.game_id,
+                "player_id": self.player_id,
+                "card_ids": [card["id"] for card in hand[:pick]]
+            }, "cards_submitted"))
+        elif phase == "judging" and current.get("czar_id") == self.player_id:
+            self._acted_in_round = key
+            asyncio.ensure_future(self._act("select_winner", "select_winner", {
+                "game_id": self.game_id,
+                "player_id": self.player_id,
+                "winning_submission": random.randrange(max(1, current.get("submissions_count", 1)))
+            }, "winner_selected"))
+
+    async def _act(self, name: str, event: str, data: dict, reply: str):
+        try:
+            await self._request(name, event, data, reply)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run(self):
+        try:
+            started = time.perf_counter()
+            await self.sio.connect(self.url, transports=self.transports, wait_timeout=self.timeout)
+            self.stats.observe("connect", time.perf_counter() - started)
+
+            created = await self._request("create_game", "create_game", {"player_name": "loadtest"}, "game_created")
+            self.game_id, self.player_id = created["game_id"], created["player_id"]
+
+            for _ in range(self.bots):
+                await self._request("request_ai_join", "request_ai_join", {"game_id": self.game_id}, "player_joined")
+
+            await self._request("start_game", "start_game", {"game_id": self.game_id}, "round_started")
+
+            await asyncio.wait_for(self.done.wait(), self.timeout * (self.rounds + 1))
+            self.stats.games_finished += 1
+        except (asyncio.TimeoutError, socketio.exceptions.ConnectionError) as e:
+            self.stats.error(type(e).__name__)
+        finally:
+            if self.sio.connected:
+                await self.sio.disconnect()
+
+
+async def run_level(args, games: int) -> dict:
+    """Start a fresh server, play `games` games concurrently, return the report row"""
+    port = args.port or _free_port()
+    url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as workdir:
+        command = [sys.executable, os.path.abspath(__file__), "--serve", "--port", str(port),
+                   "--llm-delay", str(args.llm_delay), "--image-delay", str(args.image_delay),
+                   "--tts-delay", str(args.tts_delay), "--video-delay", str(args.video_delay),
+                   "--storage-delay", str(args.storage_delay)]
+        if args.fake_providers is not None:
+            command += ["--fake-providers", str(args.fake_providers)]
+        server = subprocess.Popen(command, cwd=os.path.dirname(os.path.abspath(__file__)),
+                                  env=_server_env(workdir, args.fake_providers) | {
+                                      "AI_CZAR_DELAY_SECONDS": str(args.czar_delay),
+                                      "ROUND_ADVANCE_DELAY_SECONDS": str(args.advance_delay),
+                                  })
+        try:
+            async with httpx.AsyncClient() as http:
+                for _ in range(300):
+                    try:
+                        if (await http.get(f"{url}/health")).status_code == 200:
+                            break
+                    except httpx.TransportError:
+                        pass
+                    if server.poll() is not None:
+                        raise RuntimeError("Server exited during startup")
+                    await asyncio.sleep(0.1)
+                else:
+                    raise RuntimeError("Server did not start")
+
+            idle_rss = _rss_mb(server.pid)
+            peak_rss = idle_rss
+            stats = Stats()
+            # One pooled session for every client (no per-client connection limit)
+            http_session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0))
+            clients = [
+                GameClient(url, stats, args.bots, args.rounds, args.timeout, args.transports, http_session)
+                for _ in range(games)
+            ]
+
+            async def sample_rss():
+                nonlocal peak_rss
+                while True:
+                    peak_rss = max(peak_rss, _rss_mb(server.pid))
+                    await asyncio.sleep(0.5)
+
+            sampler = asyncio.create_task(sample_rss())
+            started = time.perf_counter()
+            # Stagger connects over --ramp seconds so the level measures steady play
+            runs = []
+            for client in clients:
+                runs.append(asyncio.create_task(client.run()))
+                if args.ramp and games > 1:
+                    await asyncio.sleep(args.ramp / games)
+            await asyncio.gather(*runs)
+            elapsed = time.perf_counter() - started
+            sampler.cancel()
+            await http_session.close()
+            peak_rss = max(peak_rss, _rss_mb(server.pid))
+        finally:
+            server.terminate()
+            try:
+                server.wait(10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    return {
+        "games": games,
+        "players": games * (1 + args.bots),
+        "finished": stats.games_finished,
+        "seconds": round(elapsed, 2),
+        "events_per_second": round(stats.events / elapsed, 1) if elapsed else 0.0,
+        "rss_idle_mb": round(idle_rss, 1),
+        "rss_peak_mb": round(peak_rss, 1),
+        "latency_ms": {
+            name: {
+                "count": len(values),
+                "p50": round(percentile(values, 50) * 1000, 1),
+                "p99": round(percentile(values, 99) * 1000, 1)
+            }
+            for name, values in sorted(stats.latencies.items())
+        },
+        "errors": stats.errors
+    }
+
+
+def print_report(rows: List[dict]):
+    actions = sorted({name for row in rows for name in row["latency_ms"]})
+    print()
+    print(f"{'games':>6} {'done':>6} {'events/s':>9} {'rss MB':>15}  latency p50/p99 (ms)")
+    for row in rows:
+        rss = f"{row['rss_idle_mb']:.0f} -> {row['rss_peak_mb']:.0f}"
+        print(f"{row['games']:>6} {row['finished']:>6} {row['events_per_second']:>9} {rss:>15}")
+        for name in actions:
+            latency = row["latency_ms"].get(name)
+            if latency:
+                print(f"{'':>40}{name:<16} {latency['p50']:>9} / {latency['p99']:<9} (n={latency['count']})")
+        if row["errors"]:
+            print(f"{'':>40}errors: {row['errors']}")
+
+
+async def main(args):
+    _raise_fd_limit()
+    rows = []
+    for games in args.games:
+        print(f"Running {games} concurrent games ({games * (1 + args.bots)} players)...")
+        rows.append(await run_level(args, games))
+    print_report(rows)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the game server with concurrent socket clients")
+    parser.add_argument("--games", type=lambda s: [int(n) for n in s.split(",")], default=[10, 100],
+                        help="Comma-separated concurrent game counts, one run each (default 10,100)")
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds played per game")
+    parser.add_argument("--bots", type=int, default=2, help="AI players added per game")
+    parser.add_argument("--ramp", type=float, default=5.0, help="Seconds over which games connect")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for any reply")
+    parser.add_argument("--llm-delay", type=float, default=0.8, help="Mean stub LLM latency (s)")
+    parser.add_argument("--image-delay", type=float, default=3.0, help="Mean stub image latency (s)")
+    parser.add_argument("--tts-delay", type=float, default=2.0, help="Mean stub TTS latency (s)")
+    parser.add_argument("--video-delay", type=float, default=10.0, help="Mean stub Veo latency (s)")
+    parser.add_argument("--storage-delay", type=float, default=0.05, help="Mean stub Supabase latency (s)")
+    parser.add_argument("--czar-delay", type=float, default=2.0, help="AI czar viewing time (AI_CZAR_DELAY_SECONDS)")
+    parser.add_argument("--advance-delay", type=float, default=1.0, help="Pause before next round (ROUND_ADVANCE_DELAY_SECONDS)")
+    parser.add_argument("--transports", type=lambda s: s.split(","), default=["websocket"],
+                        help="Client transports, e.g. websocket or polling (default websocket)")
+    parser.add_argument("--fake-providers", type=float, metavar="SCALE",
+                        help="Use the fake AI providers and local storage instead of stubs, "
+                             "with their latencies scaled by SCALE (e.g. 0.1)")
+    parser.add_argument("--port", type=int, default=0, help="Server port (default: a free one)")
+    parser.add_argument("--json", help="Also write the report rows to this file")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+    else:
+        asyncio.run(main(args))
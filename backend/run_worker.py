@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Standalone job queue worker
+
+Drains the background job queue (batch/round content generation) in its own
+process. Run alongside the API with JOB_WORKERS=0 to keep heavy pipeline work
+off the web server (clients subscribed over Socket.IO still get job_update
+events: the API process relays changes it reads from the queue):
+
+    python run_worker.py --workers 4
+"""
+import argparse
+import asyncio
+import logging
+from app.logging_config import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+from app.services.job_queue_service import job_queue_service
+from app.services import content_jobs  # noqa: F401 - registers job handlers
+
+
+async def main(workers: int):
+    await job_queue_service.start(workers)
+    logger.info("Worker running with %s job slots, press Ctrl+C to stop", workers)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await job_queue_service.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run background job workers")
+    parser.add_argument("--workers", type=int, default=2, help="Number of concurrent jobs")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args.workers))
+    except KeyboardInterrupt:
+        logger.info("Worker stopped")
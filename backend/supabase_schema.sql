@@ -87,6 +87,56 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- View counter (written in bulk by the API's counter aggregator)
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS views_count INTEGER DEFAULT 0;
+
+-- Like/unlike in one round-trip; returns the new state and count
+CREATE OR REPLACE FUNCTION toggle_like(p_video_id UUID, p_user_id TEXT)
+RETURNS TABLE(is_liked BOOLEAN, new_count INTEGER) AS $$
+DECLARE
+    changed INTEGER;
+BEGIN
+    DELETE FROM likes WHERE likes.video_id = p_video_id AND likes.user_id = p_user_id;
+    GET DIAGNOSTICS changed = ROW_COUNT;
+
+    IF changed > 0 THEN
+        is_liked := FALSE;
+        UPDATE videos SET likes_count = GREATEST(videos.likes_count - 1, 0)
+        WHERE videos.id = p_video_id
+        RETURNING videos.likes_count INTO new_count;
+    ELSE
+        INSERT INTO likes (video_id, user_id) VALUES (p_video_id, p_user_id)
+        ON CONFLICT (video_id, user_id) DO NOTHING;
+        GET DIAGNOSTICS changed = ROW_COUNT;
+        is_liked := TRUE;
+
+        IF changed > 0 THEN
+            UPDATE videos SET likes_count = videos.likes_count + 1
+            WHERE videos.id = p_video_id
+            RETURNING videos.likes_count INTO new_count;
+        ELSE
+            -- A concurrent request inserted the same like first
+            SELECT videos.likes_count INTO new_count FROM videos WHERE videos.id = p_video_id;
+        END IF;
+    END IF;
+
+    RETURN NEXT;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Apply many counter deltas in one statement:
+-- deltas = [{"id": "<uuid>", "likes": 3, "views": 120}, ...]
+CREATE OR REPLACE FUNCTION apply_video_counters(deltas JSONB)
+RETURNS VOID AS $$
+BEGIN
+    UPDATE videos SET
+        likes_count = GREATEST(videos.likes_count + COALESCE(d.likes, 0), 0),
+        views_count = COALESCE(videos.views_count, 0) + COALESCE(d.views, 0)
+    FROM jsonb_to_recordset(deltas) AS d(id UUID, likes INTEGER, views INTEGER)
+    WHERE videos.id = d.id;
+END;
+$$ LANGUAGE plpgsql;
+
 -- Storage bucket for videos (run this in Supabase dashboard)
 -- INSERT INTO storage.buckets (id, name, public) VALUES ('videos', 'videos', true);
 
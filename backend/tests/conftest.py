@@ -0,0 +1,31 @@
+"""
+Test configuration: fake AI, local storage and throwaway data files.
+
+The services are module-level singletons configured at import time, so the
+environment is set here, before any test imports app.*.
+"""
+import os
+import sys
+import tempfile
+
+DATA_DIR = tempfile.mkdtemp(prefix="backend-tests-")
+
+os.environ.update({
+    "AI_PROVIDER": "fake",
+    "STORAGE_PROVIDER": "local",
+    "LOCAL_STORAGE_PATH": os.path.join(DATA_DIR, "local_supabase"),
+    "FAKE_LATENCY_SCALE": "0",
+    "SUPABASE_URL": "",
+    "SUPABASE_KEY": "",
+    "LOG_LEVEL": "CRITICAL",
+    "LLM_CACHE_DISK_PATH": "",
+    "VIDEO_CACHE_DISK_PATH": "",
+    "PROMPT_BANK_PATH": "",
+    "FEED_INDEX_CACHE_PATH": "",
+    "JOB_QUEUE_DB_PATH": os.path.join(DATA_DIR, "jobs.sqlite3"),
+    "MEDIA_BUS_DB_PATH": os.path.join(DATA_DIR, "media_events.sqlite3"),
+    "NARRATION_INDEX_DB_PATH": os.path.join(DATA_DIR, "narrations.sqlite3"),
+    "MEDIA_WORKER_PROCESSES": "0",
+})
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
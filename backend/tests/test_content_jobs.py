@@ -0,0 +1,50 @@
+"""Content job handlers: progress reporting and lease loss mid-batch"""
+import asyncio
+
+import pytest
+
+from app.services import content_jobs
+from app.services.content_pipeline_service import content_pipeline_service
+from app.services.job_queue_service import JobLeaseLost
+
+
+@pytest.fixture
+def generated(monkeypatch):
+    finished = []
+
+    async def generate(black_card, white_cards, narration_style):
+        await asyncio.sleep(0.01 if black_card == "fast" else 1)
+        finished.append(black_card)
+        return {"black_card": black_card}
+
+    monkeypatch.setattr(content_pipeline_service, "generate_social_media_content", generate)
+    return finished
+
+
+def _payload(*black_cards):
+    return {"combinations": [{"black_card": card, "white_cards": []} for card in black_cards]}
+
+
+def test_batch_job_reports_progress_per_item(generated):
+    updates = []
+
+    async def report_progress(progress, message):
+        updates.append(progress)
+
+    result = asyncio.run(content_jobs.run_batch_job(_payload("fast", "fast"), report_progress))
+    assert result == {"results": [{"black_card": "fast"}] * 2}
+    assert updates == [0.5, 1.0]
+
+
+def test_lost_lease_cancels_the_rest_of_the_batch(generated):
+    async def report_progress(progress, message):
+        raise JobLeaseLost("job")
+
+    async def run():
+        with pytest.raises(JobLeaseLost):
+            await content_jobs.run_batch_job(_payload("fast", "slow", "slow"), report_progress)
+        # Give cancelled siblings the chance to (wrongly) finish
+        await asyncio.sleep(1.2)
+
+    asyncio.run(run())
+    assert generated == ["fast"]
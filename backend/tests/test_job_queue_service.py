@@ -0,0 +1,181 @@
+"""Job queue: claiming, retries, lease ownership and cross-process relay"""
+import asyncio
+import time
+
+import pytest
+
+from app.services.job_queue_service import JobQueueService
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueueService(str(tmp_path / "jobs.sqlite3"))
+    queue.poll_interval = 0.05
+    return queue
+
+
+def _register_noop(queue, kind="test"):
+    async def handler(payload, report_progress):
+        return payload
+
+    queue.register_handler(kind, handler)
+
+
+def test_runs_job_and_reports_progress(queue):
+    updates = []
+
+    async def handler(payload, report_progress):
+        await report_progress(0.5, "halfway")
+        return {"doubled": payload["n"] * 2}
+
+    async def listener(job):
+        updates.append((job["status"], job["progress"]))
+
+    queue.register_handler("double", handler)
+    queue.add_listener(listener)
+
+    async def run():
+        job = await queue.enqueue("double", {"n": 21})
+        await queue.start(1)
+        for _ in range(100):
+            job = await queue.get_job(job["id"])
+            if job["status"] == "succeeded":
+                break
+            await asyncio.sleep(0.02)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(run())
+    assert job["status"] == "succeeded"
+    assert job["result"] == {"doubled": 42}
+    assert job["locked_by"] is None
+    assert ("running", 0.5) in updates
+    assert updates[-1] == ("succeeded", 1.0)
+
+
+def test_idempotency_key_returns_existing_job(queue):
+    _register_noop(queue)
+
+    async def run():
+        first = await queue.enqueue("test", {"a": 1}, idempotency_key="same")
+        second = await queue.enqueue("test", {"a": 2}, idempotency_key="same")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first["id"] == second["id"]
+    assert second["payload"] == {"a": 1}
+
+
+def test_unknown_kind_is_rejected(queue):
+    with pytest.raises(ValueError):
+        asyncio.run(queue.enqueue("missing", {}))
+
+
+def test_failed_job_is_retried_then_failed(queue, monkeypatch):
+    monkeypatch.setattr("app.services.job_queue_service.settings.JOB_RETRY_BASE_DELAY", 0)
+    queue.max_attempts = 2
+    calls = []
+
+    async def handler(payload, report_progress):
+        calls.append(1)
+        raise RuntimeError("boom")
+
+    queue.register_handler("flaky", handler)
+
+    async def run():
+        job = await queue.enqueue("flaky", {})
+        for _ in range(2):
+            await queue._run(queue._claim())
+        return await queue.get_job(job["id"])
+
+    job = asyncio.run(run())
+    assert len(calls) == 2
+    assert job["status"] == "failed"
+    assert job["attempts"] == 2
+    assert job["error"] == "boom"
+    assert queue._claim() is None
+
+
+def test_expired_lease_is_reclaimed_with_a_new_token(queue):
+    _register_noop(queue)
+    queue.lease_seconds = -1  # every lease is already expired
+
+    asyncio.run(queue.enqueue("test", {}))
+    first = queue._claim()
+    second = queue._claim()
+
+    assert second["id"] == first["id"]
+    assert second["attempts"] == 2
+    assert second["locked_by"] != first["locked_by"]
+    # The first worker no longer owns the job
+    assert queue._update(first["id"], first["locked_by"], progress=0.9) is None
+    assert queue._update(second["id"], second["locked_by"], progress=0.9)["progress"] == 0.9
+
+
+def test_expired_lease_on_last_attempt_fails_the_job(queue):
+    _register_noop(queue)
+    queue.lease_seconds = -1
+    queue.max_attempts = 1
+
+    job = asyncio.run(queue.enqueue("test", {}))
+    assert queue._claim()["id"] == job["id"]
+
+    assert queue._claim() is None
+    job = queue._get(job["id"])
+    assert job["status"] == "failed"
+    assert job["error"] == "Worker lost while running the job"
+
+
+def test_heartbeat_keeps_long_job_from_being_reclaimed(queue):
+    queue.lease_seconds = 0.3
+    runs = []
+
+    async def slow(payload, report_progress):
+        runs.append(1)
+        await asyncio.sleep(1.0)
+        return "done"
+
+    queue.register_handler("slow", slow)
+
+    async def run():
+        job = await queue.enqueue("slow", {})
+        await queue.start(2)
+        for _ in range(100):
+            job = await queue.get_job(job["id"])
+            if job["status"] == "succeeded":
+                break
+            await asyncio.sleep(0.05)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(run())
+    assert job["status"] == "succeeded"
+    assert len(runs) == 1
+
+
+def test_watch_relays_updates_made_by_another_process(queue, tmp_path):
+    other = JobQueueService(queue.db_path)  # stands in for run_worker.py
+    _register_noop(queue)
+    _register_noop(other)
+    seen = []
+
+    async def listener(job):
+        seen.append(job["status"])
+
+    queue.add_listener(listener)
+
+    async def run():
+        job = await queue.enqueue("test", {})
+        queue.watch(job)
+        await other._run(other._claim())
+        for _ in range(50):
+            if "succeeded" in seen:
+                break
+            await asyncio.sleep(0.02)
+        # Let the relay notice it has nothing left to watch
+        await asyncio.sleep(queue.poll_interval * 3)
+
+    asyncio.run(run())
+    assert seen[-1] == "succeeded"
+    assert queue.watched == {}
+    assert queue._relay is None
@@ -0,0 +1,131 @@
+"""Local Supabase stand-in: RPC functions, PostgREST filters and storage"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.services.local_supabase import LocalSupabase
+
+VIDEO_ID = "11111111-1111-1111-1111-111111111111"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LocalSupabase(str(tmp_path))
+    store.tables["videos"] = [
+        {"id": VIDEO_ID, "likes_count": 1, "views_count": 10, "comments_count": 0,
+         "created_at": "2026-01-02T00:00:00+00:00"},
+        {"id": "22222222-2222-2222-2222-222222222222", "likes_count": 0, "views_count": 0,
+         "comments_count": 0, "created_at": "2026-01-01T00:00:00+00:00"},
+    ]
+    return store
+
+
+def request(store, method, path, body=None, params=None, headers=None):
+    async def send():
+        async with httpx.AsyncClient(transport=store.transport(), base_url="http://local") as client:
+            content = body if isinstance(body, bytes) else (json.dumps(body) if body is not None else None)
+            return await client.request(method, path, content=content, params=params, headers=headers)
+
+    return asyncio.run(send())
+
+
+def rpc(store, function, args):
+    return request(store, "POST", f"/rest/v1/rpc/{function}", args)
+
+
+def video(store, video_id=VIDEO_ID):
+    return next(v for v in store.tables["videos"] if v["id"] == video_id)
+
+
+def test_toggle_like_likes_then_unlikes(store, tmp_path):
+    liked = rpc(store, "toggle_like", {"p_video_id": VIDEO_ID, "p_user_id": "u1"}).json()
+    assert liked == [{"is_liked": True, "new_count": 2}]
+    assert len(store.tables["likes"]) == 1
+
+    unliked = rpc(store, "toggle_like", {"p_video_id": VIDEO_ID, "p_user_id": "u1"}).json()
+    assert unliked == [{"is_liked": False, "new_count": 1}]
+    assert store.tables["likes"] == []
+
+    # Snapshots are written for both tables
+    saved = json.loads((tmp_path / "tables" / "videos.json").read_text())
+    assert next(v for v in saved if v["id"] == VIDEO_ID)["likes_count"] == 1
+    assert json.loads((tmp_path / "tables" / "likes.json").read_text()) == []
+
+
+def test_toggle_like_is_per_user(store):
+    rpc(store, "toggle_like", {"p_video_id": VIDEO_ID, "p_user_id": "u1"})
+    second = rpc(store, "toggle_like", {"p_video_id": VIDEO_ID, "p_user_id": "u2"}).json()
+    assert second == [{"is_liked": True, "new_count": 3}]
+
+
+def test_toggle_like_on_unknown_video_records_the_like(store):
+    result = rpc(store, "toggle_like", {"p_video_id": "missing", "p_user_id": "u1"}).json()
+    assert result == [{"is_liked": True, "new_count": None}]
+
+
+def test_apply_video_counters_applies_deltas_in_bulk(store):
+    response = rpc(store, "apply_video_counters", {"deltas": [
+        {"id": VIDEO_ID, "likes": -5, "views": 3},
+        {"id": "22222222-2222-2222-2222-222222222222", "likes": 2, "views": 0},
+        {"id": "unknown", "likes": 1, "views": 1},
+    ]})
+
+    assert response.status_code == 204
+    assert video(store)["likes_count"] == 0  # clamped at zero
+    assert video(store)["views_count"] == 13
+    assert video(store, "22222222-2222-2222-2222-222222222222")["likes_count"] == 2
+
+
+def test_increment_comments(store):
+    rpc(store, "increment_comments", {"video_id": VIDEO_ID})
+    assert video(store)["comments_count"] == 1
+
+
+def test_unknown_rpc_is_404(store):
+    assert rpc(store, "nope", {}).status_code == 404
+
+
+def test_select_filters_orders_and_limits(store):
+    rows = request(store, "GET", "/rest/v1/videos", params={
+        "select": "id,likes_count", "likes_count": "gte.0", "order": "created_at.asc", "limit": "1"
+    }).json()
+    assert rows == [{"id": "22222222-2222-2222-2222-222222222222", "likes_count": 0}]
+
+    rows = request(store, "GET", "/rest/v1/videos", params={"id": f"in.({VIDEO_ID})"}).json()
+    assert [row["id"] for row in rows] == [VIDEO_ID]
+
+
+def test_select_embeds_children(store):
+    request(store, "POST", "/rest/v1/comments", [
+        {"video_id": VIDEO_ID, "text": "first", "created_at": "1"},
+        {"video_id": VIDEO_ID, "text": "second", "created_at": "2"},
+    ])
+    rows = request(store, "GET", "/rest/v1/videos", params={
+        "select": "id,comments(text)", "id": f"eq.{VIDEO_ID}",
+        "comments.order": "created_at.desc", "comments.limit": "1"
+    }).json()
+    assert rows == [{"id": VIDEO_ID, "comments": [{"text": "second"}]}]
+
+
+def test_storage_round_trip(store):
+    upload = request(store, "POST", "/storage/v1/object/videos/a.mp4", b"data",
+                     headers={"Content-Type": "video/mp4"})
+    assert upload.status_code == 200
+
+    duplicate = request(store, "POST", "/storage/v1/object/videos/a.mp4", b"other")
+    assert duplicate.status_code == 400
+
+    assert request(store, "GET", "/storage/v1/object/public/videos/a.mp4").content == b"data"
+    assert request(store, "HEAD", "/storage/v1/object/videos/a.mp4").status_code == 200
+
+    listed = request(store, "POST", "/storage/v1/object/list/videos", {"prefix": ""}).json()
+    assert [entry["name"] for entry in listed] == ["a.mp4"]
+
+    assert request(store, "DELETE", "/storage/v1/object/videos/a.mp4").status_code == 200
+    assert request(store, "HEAD", "/storage/v1/object/videos/a.mp4").status_code == 404
+
+
+def test_storage_rejects_keys_outside_the_bucket(store):
+    assert store.object_path("videos", "../secrets.txt") is None
@@ -0,0 +1,81 @@
+"""Pipeline DAG: dependency order, parallel stages, limits and failure handling"""
+import asyncio
+
+import pytest
+
+from app.services.pipeline_dag import PipelineDAG, Stage, StageLimit
+
+
+def test_stages_run_after_their_dependencies_and_share_artifacts():
+    order = []
+
+    def stage(name, value):
+        async def func(artifacts):
+            order.append(name)
+            return value(artifacts)
+        return func
+
+    dag = PipelineDAG([
+        Stage("video", stage("video", lambda a: f"video({a['script']})"), ["script"]),
+        Stage("script", stage("script", lambda a: a["prompt"].upper())),
+        Stage("audio", stage("audio", lambda a: f"audio({a['script']})"), ["script"]),
+        Stage("combine", stage("combine", lambda a: a["video"] + a["audio"]), ["video", "audio"]),
+    ])
+    artifacts, timings = asyncio.run(dag.run({"prompt": "hi"}))
+
+    assert artifacts["combine"] == "video(HI)audio(HI)"
+    assert order[0] == "script" and order[-1] == "combine"
+    assert set(timings) == {"script", "video", "audio", "combine", "total"}
+
+
+def test_independent_stages_overlap():
+    async def wait(artifacts):
+        await asyncio.sleep(0.2)
+
+    dag = PipelineDAG([Stage("a", wait), Stage("b", wait), Stage("c", wait)])
+    _, timings = asyncio.run(dag.run())
+    assert timings["total"]["duration"] < 0.4
+
+
+def test_stage_limit_caps_concurrency():
+    limit = StageLimit(concurrency=1)
+    running, peak = [0], [0]
+
+    async def work(artifacts):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+
+    dag = PipelineDAG([Stage(f"s{i}", work, limit=limit) for i in range(4)])
+    asyncio.run(dag.run())
+    assert peak[0] == 1
+
+
+def test_failure_cancels_the_remaining_stages():
+    cancelled = []
+
+    async def fail(artifacts):
+        raise RuntimeError("provider down")
+
+    async def slow(artifacts):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    dag = PipelineDAG([Stage("fail", fail), Stage("slow", slow)])
+    with pytest.raises(RuntimeError):
+        asyncio.run(dag.run())
+    assert cancelled == ["slow"]
+
+
+def test_unknown_dependencies_and_cycles_are_rejected():
+    async def noop(artifacts):
+        return None
+
+    with pytest.raises(ValueError, match="unknown stage"):
+        PipelineDAG([Stage("a", noop, ["missing"])])
+    with pytest.raises(ValueError, match="cycle"):
+        PipelineDAG([Stage("a", noop, ["b"]), Stage("b", noop, ["a"])])
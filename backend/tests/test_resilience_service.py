@@ -0,0 +1,120 @@
+"""Circuit breakers, timeouts and hedged calls"""
+import asyncio
+
+import pytest
+
+from app.services import resilience_service as resilience_module
+from app.services.resilience_service import CircuitBreaker, CircuitOpenError, ResilienceService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(resilience_module.settings, "CIRCUIT_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(resilience_module.settings, "CIRCUIT_RESET_SECONDS", 60.0)
+    return ResilienceService()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resilience_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+async def _fail():
+    raise RuntimeError("provider down")
+
+
+async def _ok():
+    return "ok"
+
+
+def test_breaker_opens_after_consecutive_failures(service):
+    async def run():
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await service.call("text", _fail)
+        with pytest.raises(CircuitOpenError):
+            await service.call("text", _ok)
+
+    asyncio.run(run())
+    stats = service.breaker("text").get_stats()
+    assert stats["state"] == CircuitBreaker.OPEN
+    assert stats["rejected"] == 1
+    assert not service.available("text")
+
+
+def test_success_resets_the_failure_count(service):
+    async def run():
+        with pytest.raises(RuntimeError):
+            await service.call("text", _fail)
+        await service.call("text", _ok)
+        with pytest.raises(RuntimeError):
+            await service.call("text", _fail)
+
+    asyncio.run(run())
+    assert service.breaker("text").state == CircuitBreaker.CLOSED
+
+
+def test_half_open_probe_closes_or_reopens(service, clock):
+    breaker = service.breaker("image")
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock[0] += 61
+    assert breaker.allow()  # the single half-open probe
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock[0] += 61
+    assert breaker.allow()
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_timeout_counts_as_a_failure(service):
+    async def slow():
+        await asyncio.sleep(1)
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await service.call("tts", slow, timeout=0.01)
+
+    asyncio.run(run())
+    stats = service.breaker("tts").get_stats()
+    assert stats["timeouts"] == 1
+    assert stats["consecutive_failures"] == 1
+
+
+def test_hedge_wins_and_cancels_the_slow_call(service, monkeypatch):
+    monkeypatch.setattr(resilience_module.settings, "HEDGE_MIN_SAMPLES", 1)
+    monkeypatch.setattr(resilience_module.settings, "HEDGE_MIN_DELAY", 0.01)
+    breaker = service.breaker("text")
+    breaker.latencies.append(0.01)
+
+    started = []
+    cancelled = []
+
+    async def call():
+        attempt = len(started)
+        started.append(attempt)
+        try:
+            # First call hangs, the hedge returns immediately
+            await asyncio.sleep(5 if attempt == 0 else 0)
+        except asyncio.CancelledError:
+            cancelled.append(attempt)
+            raise
+        return attempt
+
+    async def run():
+        result = await service.call("text", call, timeout=2, hedge=True)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(run()) == 1
+    assert cancelled == [0]
+    assert breaker.stats["hedged"] == 1
+    assert breaker.stats["hedge_wins"] == 1
@@ -0,0 +1,50 @@
+"""Speculative media: shared jobs, cancellation and the inline fallback"""
+import asyncio
+
+import pytest
+
+from app.services.speculative_media_service import SpeculativeMediaService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = SpeculativeMediaService()
+    service.enabled = True
+    calls = []
+
+    async def generate(black_card_text, white_texts, combo_key=None):
+        calls.append(combo_key)
+        await asyncio.sleep(0.05)
+        return {"combo_key": combo_key}
+
+    monkeypatch.setattr(service, "_generate", generate)
+    service.calls = calls
+    return service
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_job(service):
+    async def run():
+        task = service.start("g", 1, "p", "black", ["white"], combo_key="k")
+        first = asyncio.create_task(service.result("g", 1, "p", "black", ["white"], combo_key="k"))
+        second = asyncio.create_task(service.result("g", 1, "p", "black", ["white"], combo_key="k"))
+        await asyncio.sleep(0)
+        first.cancel()
+        return task, await second
+
+    task, media = asyncio.run(run())
+    assert media == {"combo_key": "k"}
+    assert not task.cancelled()
+    assert service.calls == ["k"]
+
+
+def test_withdrawn_job_falls_back_inline_with_the_combo_key(service):
+    async def run():
+        service.start("g", 1, "p", "black", ["white"], combo_key="k")
+        waiting = asyncio.create_task(service.result("g", 1, "p", "black", ["white"], combo_key="k"))
+        await asyncio.sleep(0)
+        service.cancel_submission("g", 1, "p")
+        return await waiting
+
+    assert asyncio.run(run()) == {"combo_key": "k"}
+    assert service.calls == ["k", "k"]
+    assert service.started[("g", 1)] == 0
@@ -0,0 +1,84 @@
+"""Trending: decayed ordering, id validation and live events across recomputes"""
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services import trending_service as trending_module
+from app.services.trending_service import TrendingService
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+@pytest.fixture
+def service(monkeypatch):
+    now = time.time()
+    rows = [
+        {"id": "old", "views_count": 50, "likes_count": 0, "created_at": _iso(now - 7 * 86400)},
+        {"id": "new", "views_count": 5, "likes_count": 0, "created_at": _iso(now - 60)},
+    ]
+
+    async def select(table, **kwargs):
+        return [dict(row) for row in rows]
+
+    monkeypatch.setattr(trending_module.supabase_http, "select", select)
+    monkeypatch.setattr(trending_module.feed_index_service, "contains", lambda video_id: video_id == "feed")
+    monkeypatch.setattr(trending_module.counter_service, "flushed_through", 0.0)
+
+    service = TrendingService()
+    service.cache_seconds = 0
+    return service
+
+
+def test_recent_interactions_outrank_older_totals(service):
+    asyncio.run(service.recompute())
+    assert [video["id"] for video in service.get_top(10)] == ["new", "old"]
+
+    # A burst on the old video today lifts it back above the new one
+    for _ in range(20):
+        service.record("old", "like")
+    assert [video["id"] for video in service.get_top(10)] == ["old", "new"]
+
+
+def test_unknown_ids_are_rejected(service):
+    asyncio.run(service.recompute())
+    assert not service.record("made-up", "view")
+    assert service.record("feed", "view")  # in the feed, not yet a candidate
+    assert not service.record("new", "unknown-kind")
+    assert service.stats["rejected"] == 1
+    assert "made-up" not in service.scores
+
+
+def test_buffered_events_survive_recomputes_until_flushed(service, monkeypatch):
+    asyncio.run(service.recompute())
+    service._recompute_task = object()  # live events are only kept while recomputing
+    base = service.scores["old"]
+
+    service.record("old", "like", at=time.time() - 10, buffered=True)
+    service.record("old", "view", at=time.time() - 10)
+
+    # Recompute started after both events: only the unflushed one is re-applied
+    asyncio.run(service.recompute())
+    assert service.scores["old"] > base
+    assert len(service._live_events) == 1
+
+    # Once the counter flush covers it, the database counts include it
+    monkeypatch.setattr(trending_module.counter_service, "flushed_through", time.time())
+    asyncio.run(service.recompute())
+    assert service.scores["old"] == base
+    assert len(service._live_events) == 0
+
+
+def test_live_events_are_bounded_while_recomputes_fail(service):
+    service._recompute_task = object()
+    service.max_live_events = 3
+    service._live_events = deque(maxlen=3)
+
+    for _ in range(5):
+        service.record("feed", "view")
+    assert len(service._live_events) == 3
+    assert service.stats["live_dropped"] == 2
@@ -0,0 +1,106 @@
+"""TTLCache: LRU and byte budgets, expiry, and the write-behind disk tier"""
+import asyncio
+import time
+
+import pytest
+
+from app.services import ttl_cache
+from app.services.ttl_cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the memory tier"""
+    now = [1000.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_lru_eviction_keeps_recently_used(clock):
+    cache = TTLCache("lru", max_entries=2, max_bytes=0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats["evictions"] == 1
+
+
+def test_byte_budget_evicts_oldest(clock):
+    cache = TTLCache("bytes", max_entries=0, max_bytes=1000)
+    cache.set("a", "x" * 500)
+    cache.set("b", "y" * 500)
+
+    assert "a" not in cache
+    assert cache.get("b") == "y" * 500
+    assert cache.get_stats()["bytes"] <= 1000
+
+
+def test_entries_expire(clock):
+    cache = TTLCache("ttl", default_ttl=10)
+    cache.set("short", 1)
+    cache.set("forever", 2, ttl=None)
+
+    clock[0] += 11
+    assert cache.get("short") is None
+    assert cache.get("forever") == 2
+    assert cache.stats["expirations"] == 1
+
+
+def test_sweep_drops_expired_entries_without_lookups(clock):
+    cache = TTLCache("sweep", default_ttl=10)
+    for i in range(5):
+        cache.set(f"k{i}", i)
+    cache.set("k0", "overwritten", ttl=100)  # leaves a stale heap item behind
+
+    clock[0] += 11
+    assert cache.sweep() == 4
+    assert len(cache) == 1
+    assert cache.get("k0") == "overwritten"
+
+
+def test_disk_tier_writes_behind_and_reads_off_the_loop(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+
+    async def write():
+        cache = TTLCache("disk", default_ttl=60, disk_path=path)
+        cache.set("kept", {"url": "https://example.com/a.mp4"})
+        cache.set("gone", "x")
+        cache.delete("gone")
+        await cache.flush()
+
+    asyncio.run(write())
+
+    async def read():
+        cache = TTLCache("disk", max_entries=10, default_ttl=60, disk_path=path)
+        # Warmed into memory at startup
+        assert cache.get("kept") == {"url": "https://example.com/a.mp4"}
+        cache._entries.clear()
+        assert cache.get("kept") is None  # get() never touches disk
+        value = await cache.aget("kept")
+        assert cache.stats["disk_hits"] == 1
+        assert await cache.aget("gone") is None
+        return value
+
+    assert asyncio.run(read()) == {"url": "https://example.com/a.mp4"}
+
+
+def test_expired_disk_entries_are_not_loaded(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+
+    async def write():
+        cache = TTLCache("expiring", default_ttl=60, disk_path=path)
+        cache.set("old", 1, ttl=0.01)
+        cache.set("new", 2)
+        await cache.flush()
+
+    asyncio.run(write())
+    time.sleep(0.02)
+
+    cache = TTLCache("expiring", default_ttl=60, disk_path=path)
+    assert "old" not in cache
+    assert cache.get("new") == 2
+    assert asyncio.run(cache.aget("old")) is None
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Narration warm-up
+
+Pre-synthesizes narration audio for the most-played card combinations (by
+number of winning videos) so live games hit the narration index instead of
+calling TTS:
+
+    python warm_narrations.py --top 50
+"""
+import argparse
+import asyncio
+from collections import Counter
+from app.services.supabase_http import supabase_http
+from app.services.gemini_tts_service import gemini_tts_service
+from app.services.narration_index_service import narration_index_service
+
+
+async def most_played(top: int, scan: int):
+    """Count (black, whites) combinations across recent videos"""
+    rows = await supabase_http.select(
+        "videos",
+        columns="black_card_text,white_card_texts",
+        order="created_at.desc",
+        limit=scan
+    )
+    counts = Counter(
+        (row["black_card_text"], tuple(row["white_card_texts"] or []))
+        for row in rows
+    )
+    return counts.most_common(top)
+
+
+async def main(top: int, scan: int, styles: list, concurrency: int):
+    combinations = await most_played(top, scan)
+    print(f"🔥 Warming narrations for {len(combinations)} combinations x {len(styles)} styles")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    warmed = 0
+
+    async def warm(black: str, whites: tuple, style: str):
+        nonlocal warmed
+        async with semaphore:
+            narration = await gemini_tts_service.generate_narrated_script(black, list(whites), style)
+        if narration['audio_url']:
+            warmed += 1
+        else:
+            print(f"⚠️  Failed: {black} / {whites}")
+
+    await asyncio.gather(*(
+        warm(black, whites, style)
+        for (black, whites), _ in combinations
+        for style in styles
+    ))
+
+    print(f"✅ Warmed {warmed} narrations")
+    print(f"📊 Index: {narration_index_service.get_stats()}")
+    await supabase_http.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-synthesize narrations for popular combinations")
+    parser.add_argument("--top", type=int, default=50, help="Number of combinations to warm")
+    parser.add_argument("--scan", type=int, default=1000, help="Number of recent videos to count")
+    parser.add_argument("--styles", default="humorous", help="Comma-separated narration styles")
+    parser.add_argument("--concurrency", type=int, default=2, help="Parallel TTS requests")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.top, args.scan, args.styles.split(","), args.concurrency))
@@ -260,7 +260,7 @@ export const GameRoom: React.FC<GameRoomProps> = ({
                                 {submission.audio_url && (
                                   <div className="absolute bottom-2 left-2 right-2">
                                     <audio controls className="w-full h-8">
-                                      <source src={submission.audio_url} type="audio/wav" />
+                                      <source src={submission.audio_url} />
                                     </audio>
                                   </div>
                                 )}
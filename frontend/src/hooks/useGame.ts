@@ -68,7 +68,7 @@ export const useGame = (socket: Socket | null) => {
       setNotification('Video is ready!');
     });
 
-    socket.on('submission_media_ready', (data: { submission_index: number; image_url: string; audio_url: string }) => {
+    socket.on('submission_media_ready', (data: { submission_index: number; image_url: string; audio_url: string; audio_duration?: number }) => {
       console.log('🖼️ Media ready for submission:', data);
       console.log('📥 Image URL:', data.image_url);
       console.log('📥 Audio URL:', data.audio_url);
@@ -85,7 +85,8 @@ export const useGame = (socket: Socket | null) => {
           idx === data.submission_index ? {
             ...sub,
             image_url: data.image_url,
-            audio_url: data.audio_url
+            audio_url: data.audio_url,
+            audio_duration: data.audio_duration
           } : sub
         );
         
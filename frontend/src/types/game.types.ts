@@ -34,6 +34,7 @@ export interface Submission {
   video_url?: string;
   image_url?: string;
   audio_url?: string;
+  audio_duration?: number;
 }
 
 export interface Round {